@@ -1,9 +1,15 @@
 """
 MigratePro - Dashboard de Migração de Dados
 Aplicação principal Streamlit
+
+Só a autenticação, o tema e a instrumentação são importados na partida.
+O módulo de cada página (e o que ele traz, como o plotly do dashboard) é
+importado quando a página é aberta pela primeira vez; a tela de login não
+carrega nenhum deles.
 """
 
 import streamlit as st
+import importlib
 import os
 import sys
 
@@ -18,9 +24,24 @@ from components.auth import (
     pode_editar,
     pode_administrar
 )
-from components.dashboard import mostrar_dashboard
-from components.crud import formulario_novo_projeto, tabela_projetos
-from components.usuarios import gerenciar_usuarios
+from components.perfil import perfil_ligado, controle_perfil, mostrar_painel_desempenho
+from utils.assets import injetar_tema
+from utils import instrumentacao, metricas, pendencias
+
+
+# Página do menu -> (módulo, função que desenha a página)
+PAGINAS = {
+    "📊 Visão Geral": ('components.dashboard', 'mostrar_dashboard'),
+    "📋 Todos os Projetos": ('components.crud', 'tabela_projetos'),
+    "➕ Novo Projeto": ('components.crud', 'formulario_novo_projeto'),
+    "👥 Usuários": ('components.usuarios', 'gerenciar_usuarios')
+}
+
+
+def carregar_pagina(pagina: str):
+    """Importa (na primeira vez) o módulo da página e retorna a função que a desenha."""
+    modulo, funcao = PAGINAS[pagina]
+    return getattr(importlib.import_module(modulo), funcao)
 
 
 # Configuração da página
@@ -31,202 +52,27 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS Customizado para tema escuro premium
-st.markdown("""
-<style>
-    /* Tema escuro base */
-    .stApp {
-        background: linear-gradient(135deg, #0a192f 0%, #112240 50%, #0a192f 100%);
-    }
-    
-    /* Sidebar */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #0d1b2a 0%, #1b2838 100%);
-        border-right: 1px solid rgba(100, 255, 218, 0.1);
-    }
-    
-    [data-testid="stSidebar"] .stMarkdown {
-        color: #8892b0;
-    }
-    
-    /* Headers */
-    h1, h2, h3 {
-        color: #ccd6f6 !important;
-    }
-    
-    h1 {
-        background: linear-gradient(90deg, #64ffda, #38bdf8);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-    
-    /* Cards e containers */
-    .stExpander {
-        background: rgba(17, 34, 64, 0.8);
-        border: 1px solid rgba(100, 255, 218, 0.1);
-        border-radius: 15px;
-    }
-    
-    .stExpander > div > div > div > div {
-        color: #8892b0;
-    }
-    
-    /* Inputs */
-    .stTextInput > div > div > input,
-    .stTextArea > div > div > textarea,
-    .stSelectbox > div > div > div {
-        background: rgba(17, 34, 64, 0.8) !important;
-        border: 1px solid rgba(100, 255, 218, 0.2) !important;
-        color: #ccd6f6 !important;
-        border-radius: 10px;
-    }
-    
-    .stTextInput > div > div > input:focus,
-    .stTextArea > div > div > textarea:focus {
-        border-color: #64ffda !important;
-        box-shadow: 0 0 10px rgba(100, 255, 218, 0.2);
-    }
-    
-    /* Botões */
-    .stButton > button {
-        background: linear-gradient(135deg, #64ffda 0%, #38bdf8 100%);
-        color: #0a192f;
-        border: none;
-        border-radius: 10px;
-        font-weight: bold;
-        transition: all 0.3s ease;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 10px 30px rgba(100, 255, 218, 0.3);
-    }
-    
-    .stButton > button[kind="secondary"] {
-        background: transparent;
-        border: 2px solid #64ffda;
-        color: #64ffda;
-    }
-    
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {
-        background: rgba(17, 34, 64, 0.5);
-        border-radius: 10px;
-        padding: 5px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        color: #8892b0;
-        border-radius: 8px;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #64ffda 0%, #38bdf8 100%);
-        color: #0a192f;
-    }
-    
-    /* Checkbox */
-    .stCheckbox > label > div {
-        color: #8892b0;
-    }
-    
-    /* Dividers */
-    hr {
-        border-color: rgba(100, 255, 218, 0.1);
-    }
-    
-    /* Mensagens */
-    .stSuccess {
-        background: rgba(100, 255, 218, 0.1);
-        border: 1px solid #64ffda;
-    }
-    
-    .stError {
-        background: rgba(255, 107, 107, 0.1);
-        border: 1px solid #ff6b6b;
-    }
-    
-    .stWarning {
-        background: rgba(255, 217, 61, 0.1);
-        border: 1px solid #ffd93d;
-    }
-    
-    .stInfo {
-        background: rgba(56, 189, 248, 0.1);
-        border: 1px solid #38bdf8;
-    }
-    
-    /* Date input */
-    .stDateInput > div > div > input {
-        background: rgba(17, 34, 64, 0.8) !important;
-        border: 1px solid rgba(100, 255, 218, 0.2) !important;
-        color: #ccd6f6 !important;
-        border-radius: 10px;
-    }
-    
-    /* Multiselect */
-    .stMultiSelect > div > div {
-        background: rgba(17, 34, 64, 0.8) !important;
-        border: 1px solid rgba(100, 255, 218, 0.2) !important;
-        border-radius: 10px;
-    }
-    
-    .stMultiSelect span {
-        background: #64ffda !important;
-        color: #0a192f !important;
-    }
-    
-    /* Forms */
-    [data-testid="stForm"] {
-        background: rgba(17, 34, 64, 0.5);
-        padding: 20px;
-        border-radius: 15px;
-        border: 1px solid rgba(100, 255, 218, 0.1);
-    }
-    
-    /* Plotly charts background */
-    .js-plotly-plot .plotly .bg {
-        fill: transparent !important;
-    }
-    
-    /* Menu navigation styling */
-    .nav-link {
-        display: flex;
-        align-items: center;
-        padding: 12px 20px;
-        margin: 5px 0;
-        border-radius: 10px;
-        color: #8892b0;
-        text-decoration: none;
-        transition: all 0.3s ease;
-        cursor: pointer;
-    }
-    
-    .nav-link:hover {
-        background: rgba(100, 255, 218, 0.1);
-        color: #64ffda;
-    }
-    
-    .nav-link.active {
-        background: linear-gradient(135deg, rgba(100, 255, 218, 0.2) 0%, rgba(56, 189, 248, 0.2) 100%);
-        color: #64ffda;
-        border-left: 3px solid #64ffda;
-    }
-</style>
-""", unsafe_allow_html=True)
+# CSS do tema escuro premium (servido como arquivo estático com hash)
+injetar_tema()
+
+# Endpoint /metrics do Prometheus (uma vez por processo; ver utils/metricas.py)
+metricas.iniciar()
 
 
 def main():
     """Função principal da aplicação."""
     
+    # Abre o coletor de consultas/bytes deste rerun (com spans se o admin ligou o perfil)
+    coletor = instrumentacao.iniciar_rerun(perfil=pode_administrar() and perfil_ligado())
+    
     # Verifica se está autenticado
     if not verificar_autenticacao():
-        mostrar_tela_login()
+        with metricas.cronometro('migratepro_render_segundos', pagina='mostrar_tela_login'):
+            mostrar_tela_login()
         return
     
     # Sidebar com navegação
-    with st.sidebar:
+    with st.sidebar, instrumentacao.span('sidebar'):
         st.markdown("""
             <div style="text-align: center; padding: 20px 0;">
                 <h1 style="font-size: 1.8rem; margin: 0;">🔄 MigratePro</h1>
@@ -238,6 +84,11 @@ def main():
         
         if st.button("🔄 Atualizar Dados", use_container_width=True):
             st.rerun()
+        
+        # Alterações salvas que ainda não chegaram ao banco
+        if pode_editar():
+            from components.crud import mostrar_fila_escritas
+            mostrar_fila_escritas()
             
         st.markdown("---")
         
@@ -256,21 +107,26 @@ def main():
             label_visibility="collapsed"
         )
         
+        if pode_administrar():
+            controle_perfil()
+        
         # Info do usuário no final da sidebar
         mostrar_info_usuario()
     
-    # Conteúdo principal baseado na página selecionada
-    if pagina == "📊 Visão Geral":
-        mostrar_dashboard()
+    # Alterações pendentes da sessão: todas ao trocar de página, senão as de debounce vencido
+    if pagina != st.session_state.get('pagina_atual'):
+        pendencias.gravar_todos()
+    else:
+        pendencias.gravar_todos(vencidos=True)
+    st.session_state['pagina_atual'] = pagina
     
-    elif pagina == "📋 Todos os Projetos":
-        tabela_projetos()
-    
-    elif pagina == "➕ Novo Projeto":
-        formulario_novo_projeto()
+    # Conteúdo principal baseado na página selecionada
+    desenhar = carregar_pagina(pagina)
+    with instrumentacao.span(f"página {pagina}"), metricas.cronometro('migratepro_render_segundos', pagina=desenhar.__name__):
+        desenhar()
     
-    elif pagina == "👥 Usuários":
-        gerenciar_usuarios()
+    st.session_state['ultimo_rerun'] = instrumentacao.resumo_rerun(coletor)
+    mostrar_painel_desempenho(coletor)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,271 @@
+"""
+Substituto em memória do cliente do Supabase para benchmarks e testes de carga.
+
+Implementa o subconjunto do query builder usado em utils/data_async.py
+(select, eq, gt, order, limit, insert, upsert, update, delete, execute e rpc) sobre
+tabelas em memória. Cada requisição pode ter latência, jitter, limite de
+linhas e falhas injetadas, para simular o custo de rede num notebook:
+
+    cliente = ClienteMemoria(
+        {'projetos': projetos, 'usuarios': usuarios},
+        latencia=0.04, jitter=0.01, taxa_erro=0.02
+    )
+    data_async.definir_cliente(cliente)
+
+Como o cliente síncrono real, `execute()` bloqueia; a camada assíncrona o
+roda em threads auxiliares, então requisições concorrentes se sobrepõem.
+"""
+
+import copy
+import random
+import threading
+import time
+from datetime import datetime
+
+
+CHAVES_PADRAO = {'sessoes': 'token'}  # demais tabelas usam 'id'
+
+
+class ErroSimulado(Exception):
+    """Falha injetada; imita o APIError do PostgREST (código + mensagem)."""
+
+    def __init__(self, mensagem: str, code: str = 'SIMULADO'):
+        super().__init__(mensagem)
+        self.message = mensagem
+        self.code = code
+
+
+class _Resposta:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Consulta:
+    def __init__(self, cliente: 'ClienteMemoria', tabela: str):
+        self._cliente = cliente
+        self._tabela = tabela
+        self._operacao = 'select'
+        self._dados = None
+        self._colunas = None
+        self._filtros = []
+        self._ordem = None
+        self._limite = None
+
+    # ---- construção ----
+
+    def select(self, colunas: str = '*'):
+        self._colunas = None if colunas.strip() == '*' else [c.strip() for c in colunas.split(',')]
+        return self
+
+    def insert(self, dados):
+        self._operacao, self._dados = 'insert', dados
+        return self
+
+    def upsert(self, dados):
+        self._operacao, self._dados = 'upsert', dados
+        return self
+
+    def update(self, dados: dict):
+        self._operacao, self._dados = 'update', dados
+        return self
+
+    def delete(self):
+        self._operacao = 'delete'
+        return self
+
+    def eq(self, coluna: str, valor):
+        self._filtros.append((coluna, '==', valor))
+        return self
+
+    def gt(self, coluna: str, valor):
+        self._filtros.append((coluna, '>', valor))
+        return self
+
+    def order(self, coluna: str, desc: bool = False):
+        self._ordem = (coluna, desc)
+        return self
+
+    def limit(self, quantidade: int):
+        self._limite = quantidade
+        return self
+
+    # ---- execução ----
+
+    def _filtrar(self, linhas: list) -> list:
+        def casa(linha, coluna, operador, valor):
+            atual = linha.get(coluna)
+            if operador == '==':
+                return atual == valor
+            return atual is not None and atual > valor
+        return [l for l in linhas if all(casa(l, *f) for f in self._filtros)]
+
+    def _projetar(self, linhas: list) -> list:
+        if self._colunas:
+            return [{c: l.get(c) for c in self._colunas} for l in linhas]
+        return copy.deepcopy(linhas)
+
+    def execute(self):
+        self._cliente._simular_rede(self._tabela, self._operacao)
+        with self._cliente._lock:
+            return _Resposta(getattr(self, f'_executar_{self._operacao}')())
+
+    def _executar_select(self) -> list:
+        linhas = self._filtrar(self._cliente.tabela(self._tabela))
+        if self._ordem:
+            coluna, desc = self._ordem
+            linhas = sorted(linhas, key=lambda l: (l.get(coluna) is not None, l.get(coluna) or ''), reverse=desc)
+        limite = min(filter(None, [self._limite, self._cliente.max_linhas]), default=None)
+        if limite:
+            linhas = linhas[:limite]
+        return self._projetar(linhas)
+
+    def _novas_linhas(self) -> list:
+        dados = self._dados if isinstance(self._dados, list) else [self._dados]
+        return [copy.deepcopy(d) for d in dados]
+
+    def _executar_insert(self) -> list:
+        tabela = self._cliente.tabela(self._tabela)
+        chave = self._cliente.chave(self._tabela)
+        existentes = {l.get(chave) for l in tabela}
+
+        novas = self._novas_linhas()
+        for linha in novas:
+            self._cliente._completar(self._tabela, linha)
+            if linha.get(chave) in existentes:
+                raise ErroSimulado(
+                    f'duplicate key value violates unique constraint "{self._tabela}_pkey"',
+                    code='23505'
+                )
+            existentes.add(linha[chave])
+        tabela.extend(novas)
+        return copy.deepcopy(novas)
+
+    def _executar_upsert(self) -> list:
+        tabela = self._cliente.tabela(self._tabela)
+        chave = self._cliente.chave(self._tabela)
+        por_chave = {l.get(chave): l for l in tabela}
+
+        resultado = []
+        for linha in self._novas_linhas():
+            atual = por_chave.get(linha.get(chave))
+            if atual is not None:
+                atual.update(linha)
+                resultado.append(atual)
+            else:
+                self._cliente._completar(self._tabela, linha)
+                tabela.append(linha)
+                por_chave[linha[chave]] = linha
+                resultado.append(linha)
+        return copy.deepcopy(resultado)
+
+    def _executar_update(self) -> list:
+        alteradas = self._filtrar(self._cliente.tabela(self._tabela))
+        for linha in alteradas:
+            linha.update(copy.deepcopy(self._dados))
+        return copy.deepcopy(alteradas)
+
+    def _executar_delete(self) -> list:
+        tabela = self._cliente.tabela(self._tabela)
+        removidas = self._filtrar(tabela)
+        ids = {id(l) for l in removidas}
+        tabela[:] = [l for l in tabela if id(l) not in ids]
+        return removidas
+
+
+class _Rpc:
+    def __init__(self, cliente: 'ClienteMemoria', nome: str, parametros: dict):
+        self._cliente = cliente
+        self._nome = nome
+        self._parametros = parametros or {}
+
+    def execute(self):
+        self._cliente._simular_rede('rpc', self._nome)
+        funcao = self._cliente.funcoes.get(self._nome)
+        if funcao is None:
+            raise ErroSimulado(f"Could not find the function public.{self._nome}", code='PGRST202')
+        with self._cliente._lock:
+            return _Resposta(funcao(self._cliente, **self._parametros))
+
+
+def _criar_tabela_sessoes(cliente: 'ClienteMemoria'):
+    cliente.tabela('sessoes')
+    return None
+
+
+class ClienteMemoria:
+    """
+    Cliente em memória: tabelas {'projetos': [...], 'usuarios': [...]}.
+
+    latencia/jitter: segundos por requisição (jitter sorteado em ±jitter).
+    max_linhas: limite de linhas por select, como o max-rows do PostgREST.
+    taxa_erro: probabilidade de uma requisição falhar com ErroSimulado.
+    semente: torna jitter e falhas sorteadas reproduzíveis.
+    """
+
+    def __init__(self, tabelas: dict = None, latencia: float = 0.0, jitter: float = 0.0,
+                 max_linhas: int = None, taxa_erro: float = 0.0, semente: int = None):
+        self.tabelas = tabelas if tabelas is not None else {}
+        self.latencia = latencia
+        self.jitter = jitter
+        self.max_linhas = max_linhas
+        self.taxa_erro = taxa_erro
+        self.funcoes = {'create_sessoes_table': _criar_tabela_sessoes}
+        self.requisicoes = {}    # (tabela, operação) -> quantidade
+        self._falhas_agendadas = []  # (tabela, operação, exceção); None casa com qualquer uma
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.RLock()
+
+    # ---- query builder ----
+
+    def table(self, nome: str) -> _Consulta:
+        return _Consulta(self, nome)
+
+    def rpc(self, nome: str, parametros: dict = None) -> _Rpc:
+        return _Rpc(self, nome, parametros)
+
+    # ---- configuração ----
+
+    def tabela(self, nome: str) -> list:
+        """Linhas da tabela (criada vazia se não existir)."""
+        return self.tabelas.setdefault(nome, [])
+
+    def chave(self, tabela: str) -> str:
+        return CHAVES_PADRAO.get(tabela, 'id')
+
+    def falhar(self, vezes: int = 1, tabela: str = None, operacao: str = None, erro: Exception = None) -> None:
+        """Agenda falhas para as próximas requisições que casarem com tabela/operação."""
+        with self._lock:
+            for _ in range(vezes):
+                self._falhas_agendadas.append((tabela, operacao, erro or ErroSimulado("Falha injetada")))
+
+    # ---- simulação ----
+
+    def _simular_rede(self, tabela: str, operacao: str) -> None:
+        with self._lock:
+            self.requisicoes[(tabela, operacao)] = self.requisicoes.get((tabela, operacao), 0) + 1
+            atraso = self.latencia + self._aleatorio.uniform(-self.jitter, self.jitter) if self.jitter else self.latencia
+            erro = self._proxima_falha(tabela, operacao)
+
+        if atraso > 0:
+            time.sleep(atraso)
+        if erro is not None:
+            raise erro
+
+    def _proxima_falha(self, tabela: str, operacao: str):
+        for i, (t, o, erro) in enumerate(self._falhas_agendadas):
+            if t in (None, tabela) and o in (None, operacao):
+                del self._falhas_agendadas[i]
+                return erro
+        if self.taxa_erro and self._aleatorio.random() < self.taxa_erro:
+            return ErroSimulado(f"Falha simulada em {tabela}.{operacao}", code='503')
+        return None
+
+    def _completar(self, tabela: str, linha: dict) -> None:
+        """Preenche o que o banco geraria: id serial e timestamps."""
+        chave = self.chave(tabela)
+        if linha.get(chave) is None and chave == 'id':
+            ids = [l['id'] for l in self.tabela(tabela) if isinstance(l.get('id'), int)]
+            linha['id'] = max(ids, default=0) + 1
+        agora = datetime.now().isoformat()
+        linha.setdefault('created_at', agora)
+        linha.setdefault('updated_at', agora)
@@ -0,0 +1,84 @@
+"""
+Gerador determinístico de projetos e usuários sintéticos para benchmarks.
+
+A mesma semente gera sempre os mesmos registros. As datas são deslocamentos
+fixos a partir de `referencia` (hoje, por padrão), então a distribuição de
+status (em andamento, atrasado, concluído...) também se mantém estável.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from utils.data_manager import calcular_status
+from utils.times import TIME_PADRAO
+
+
+TAMANHOS_PADRAO = [100, 1000, 10000, 100000]
+METODOS = ['Script', 'Manual', 'Manual + Script']
+DIFICULDADES = [
+    '',
+    '',
+    'Encoding do banco legado',
+    'Backup incompleto',
+    'Acesso VPN instável',
+    'Volume de dados acima do previsto',
+    'Cliente atrasou a validação'
+]
+
+
+def gerar_usuarios(n: int, semente: int = 42) -> list:
+    """Gera `n` usuários com níveis 1 a 3 (o primeiro é sempre admin)."""
+    rnd = random.Random(semente)
+    usuarios = []
+    for i in range(1, n + 1):
+        usuarios.append({
+            'id': i,
+            'usuario': f'usuario.{i:05d}',
+            'nome': f'Usuário {i}',
+            'nivel': 3 if i == 1 else rnd.choice([1, 2, 2, 3]),
+            'ativo': rnd.random() > 0.05
+        })
+    return usuarios
+
+
+def gerar_projetos(n: int, semente: int = 42, referencia: date = None, usuarios: list = None, time: str = TIME_PADRAO) -> list:
+    """
+    Gera `n` projetos sintéticos do `time`, do mais recente para o mais
+    antigo (mesma ordem de `carregar_projetos`).
+    """
+    rnd = random.Random(semente)
+    referencia = referencia or date.today()
+    editores = [u['usuario'] for u in (usuarios or gerar_usuarios(8, semente)) if u['nivel'] >= 2]
+    criado_base = datetime.combine(referencia, datetime.min.time())
+
+    projetos = []
+    for i in range(n):
+        dias_estimados = rnd.randint(5, 45)
+        inicio = referencia + timedelta(days=rnd.randint(-365, 30))
+        prazo = inicio + timedelta(days=dias_estimados + rnd.randint(-5, 15))
+
+        projeto = {
+            'id': f"MIG-{inicio.year}-{i + 1:03d}",
+            'nome': f"Migração Cliente {i + 1:06d}",
+            'data_inicio': str(inicio) if rnd.random() > 0.1 else None,
+            'data_prazo': str(prazo),
+            'data_fim': None,
+            'dias_estimados': dias_estimados,
+            'metodo_migracao': rnd.choice(METODOS),
+            'backup_recebido': rnd.random() > 0.3,
+            'dificuldades': rnd.choice(DIFICULDADES),
+            'observacoes': 'Plano de ação e notas da migração. ' * rnd.randint(0, 20),
+            'responsaveis': rnd.sample(editores, k=min(2, len(editores))),
+            'time': time,
+            'created_at': (criado_base - timedelta(minutes=i)).isoformat(),
+            'updated_at': (criado_base - timedelta(minutes=i)).isoformat()
+        }
+
+        # Parte dos projetos já iniciados foi concluída
+        fim = inicio + timedelta(days=dias_estimados + rnd.randint(-8, 12))
+        if projeto['data_inicio'] and fim <= referencia and rnd.random() > 0.3:
+            projeto['data_fim'] = str(fim)
+
+        projeto['status'] = calcular_status(projeto)
+        projetos.append(projeto)
+
+    return projetos
@@ -0,0 +1,213 @@
+"""
+Suíte de benchmarks das camadas de dados, análise e renderização.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.executar
+    python -m benchmarks.executar --tamanhos 100 1000 --saida atual.json
+    python -m benchmarks.executar --base baseline.json --tolerancia 0.25
+    python -m benchmarks.executar --latencia 0.04 --jitter 0.01   # simula rede
+
+Os dados vêm de benchmarks/dados_sinteticos.py e são servidos por um
+cliente em memória, então nenhuma medição depende de rede. As páginas
+completas são renderizadas pelo AppTest do Streamlit. O resultado é gravado
+em JSON; com --base, cada medição é comparada à da linha de base e o
+processo termina com código 1 se alguma ficar mais lenta que a tolerância.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import cache, data_async
+from utils.data_manager import (
+    calcular_status,
+    obter_estatisticas,
+    calcular_carga_time,
+    gerar_id_projeto,
+    carregar_projetos
+)
+from components.charts import (
+    criar_grafico_progresso,
+    criar_grafico_metodos,
+    criar_grafico_dificuldades,
+    criar_grafico_timeline
+)
+from benchmarks.dados_sinteticos import TAMANHOS_PADRAO, gerar_projetos, gerar_usuarios
+from benchmarks.cliente_memoria import ClienteMemoria
+
+
+REPETICOES_PADRAO = 5
+TOLERANCIA_PADRAO = 0.20     # 20% mais lento que a base conta como regressão
+MAX_LINHAS_PAGINA = 1000     # tabela_projetos com 1k linhas já leva ~1 min
+USUARIO_ADMIN = {'id': 1, 'usuario': 'usuario.00001', 'nome': 'Usuário 1', 'nivel': 3}
+
+
+def _medir(funcao, preparar=None, repeticoes: int = REPETICOES_PADRAO) -> dict:
+    """Executa `funcao` várias vezes e retorna mediana e mínimo em segundos."""
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    return {
+        'mediana': statistics.median(tempos),
+        'minimo': min(tempos),
+        'repeticoes': repeticoes
+    }
+
+
+# ============== PÁGINAS (AppTest) ==============
+
+def _script_dashboard():
+    from components.dashboard import mostrar_dashboard
+    mostrar_dashboard()
+
+
+def _script_tabela_projetos():
+    from components.crud import tabela_projetos
+    tabela_projetos()
+
+
+def _renderizar(script):
+    """Retorna uma função que renderiza a página inteira pelo AppTest."""
+    from streamlit.testing.v1 import AppTest
+
+    def renderizar():
+        at = AppTest.from_function(script, default_timeout=900)
+        at.session_state['autenticado'] = True
+        at.session_state['usuario'] = USUARIO_ADMIN
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+
+    return renderizar
+
+
+# ============== SUÍTE ==============
+
+def executar_suite(tamanhos: list, repeticoes: int = REPETICOES_PADRAO, max_linhas_pagina: int = MAX_LINHAS_PAGINA,
+                   latencia: float = 0.0, jitter: float = 0.0) -> dict:
+    """
+    Roda todos os benchmarks para cada tamanho e retorna {nome@tamanho: medição}.
+    `latencia` e `jitter` (segundos) são aplicados a cada requisição ao backend simulado.
+    """
+    resultados = {}
+    usuarios = gerar_usuarios(20)
+
+    for n in tamanhos:
+        projetos = gerar_projetos(n, usuarios=usuarios)
+        data_async.definir_cliente(ClienteMemoria(
+            {'projetos': projetos, 'usuarios': usuarios},
+            latencia=latencia, jitter=jitter, semente=n
+        ))
+
+        def dados_em_cache():
+            # Projetos já lidos; só os derivados (estatísticas, carga) ficam frios
+            cache.limpar()
+            carregar_projetos('dashboard')
+
+        cache.limpar()
+        stats = obter_estatisticas()
+        rep = max(1, repeticoes if n < 100000 else repeticoes // 2)
+
+        casos = {
+            'calcular_status': (lambda: [calcular_status(p) for p in projetos], None),
+            'obter_estatisticas': (obter_estatisticas, dados_em_cache),
+            'calcular_carga_time': (calcular_carga_time, dados_em_cache),
+            'gerar_id_projeto': (gerar_id_projeto, None),
+            'criar_grafico_progresso': (lambda: criar_grafico_progresso(projetos), None),
+            'criar_grafico_metodos': (lambda: criar_grafico_metodos(stats['metodos']), None),
+            'criar_grafico_dificuldades': (lambda: criar_grafico_dificuldades(stats['dificuldades']), None),
+            'criar_grafico_timeline': (lambda: criar_grafico_timeline(projetos), None)
+        }
+        if n <= max_linhas_pagina:
+            casos['pagina_mostrar_dashboard'] = (_renderizar(_script_dashboard), cache.limpar)
+            casos['pagina_tabela_projetos'] = (_renderizar(_script_tabela_projetos), cache.limpar)
+
+        for nome, (funcao, preparar) in casos.items():
+            chave = f"{nome}@{n}"
+            resultados[chave] = _medir(funcao, preparar, rep)
+            print(f"{chave:<40} {resultados[chave]['mediana'] * 1000:>12.2f} ms")
+
+    data_async.definir_cliente(None)
+    cache.limpar()
+    return resultados
+
+
+def comparar(atual: dict, base: dict, tolerancia: float = TOLERANCIA_PADRAO) -> list:
+    """Retorna as medições que ficaram mais lentas que a base além da tolerância."""
+    regressoes = []
+    for chave, medicao in atual.items():
+        referencia = base.get(chave)
+        if not referencia or referencia['mediana'] <= 0:
+            continue
+
+        razao = medicao['mediana'] / referencia['mediana']
+        if razao > 1 + tolerancia:
+            regressoes.append({
+                'benchmark': chave,
+                'base': referencia['mediana'],
+                'atual': medicao['mediana'],
+                'razao': round(razao, 2)
+            })
+    return regressoes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do MigratePro")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO)
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO)
+    parser.add_argument('--max-linhas-pagina', type=int, default=MAX_LINHAS_PAGINA)
+    parser.add_argument('--saida', default='benchmarks/resultados.json')
+    parser.add_argument('--base', help="JSON de uma execução anterior para comparar")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_PADRAO)
+    parser.add_argument('--latencia', type=float, default=0.0, help="segundos por requisição ao backend simulado")
+    parser.add_argument('--jitter', type=float, default=0.0, help="variação (±segundos) da latência")
+    args = parser.parse_args(argv)
+
+    # Fora de `streamlit run` cada chamada de st.* avisa da falta de contexto
+    for nome in list(logging.root.manager.loggerDict):
+        if nome.startswith('streamlit'):
+            logging.getLogger(nome).setLevel(logging.ERROR)
+
+    resultados = executar_suite(args.tamanhos, args.repeticoes, args.max_linhas_pagina, args.latencia, args.jitter)
+    relatorio = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'latencia': args.latencia,
+        'jitter': args.jitter,
+        'resultados': resultados
+    }
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados gravados em {args.saida}")
+
+    if args.base:
+        with open(args.base, encoding='utf-8') as f:
+            base = json.load(f)['resultados']
+
+        regressoes = comparar(resultados, base, args.tolerancia)
+        for r in regressoes:
+            print(f"REGRESSÃO {r['benchmark']}: {r['base'] * 1000:.2f} ms -> {r['atual'] * 1000:.2f} ms ({r['razao']}x)")
+        if regressoes:
+            return 1
+        print("Nenhuma regressão acima da tolerância.")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Orçamentos de idas ao backend por página.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.orcamentos
+
+Renderiza cada página pelo AppTest com dados sintéticos servidos em
+memória, primeiro com o cache frio e depois com ele quente, e termina com
+código 1 se alguma passar do orçamento. As consultas de cada página são
+listadas por chamador, o que aponta N+1 (uma busca por projeto da lista,
+recargas repetidas) assim que aparecem. `verificar_pagina` pode ser usada
+diretamente em testes.
+"""
+
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import cache, data_async, instrumentacao
+from benchmarks.dados_sinteticos import gerar_projetos, gerar_usuarios
+from benchmarks.cliente_memoria import ClienteMemoria
+
+
+# Página -> (consultas com cache frio, consultas com cache quente)
+ORCAMENTOS = {
+    'components.dashboard.mostrar_dashboard': (1, 0),
+    'components.crud.tabela_projetos': (2, 0),           # resumo + diretório de editores
+    'components.crud.formulario_novo_projeto': (2, 0),   # diretório de editores + carga por pessoa
+    'components.usuarios.gerenciar_usuarios': (1, 0)
+}
+LINHAS_PADRAO = 50
+USUARIO_ADMIN = {'id': 1, 'usuario': 'usuario.00001', 'nome': 'Usuário 1', 'nivel': 3}
+
+
+def _script_pagina(caminho: str, maximo: int):
+    import importlib
+    import streamlit as st
+    from utils import instrumentacao
+
+    modulo, funcao = caminho.rsplit('.', 1)
+    pagina = getattr(importlib.import_module(modulo), funcao)
+
+    # A lista é preenchida ao sair do `with`, mesmo se o orçamento estourar
+    with instrumentacao.orcamento(maximo, caminho) as consultas:
+        st.session_state['_consultas_pagina'] = consultas
+        pagina()
+
+
+def verificar_pagina(caminho: str, frio: int, quente: int, usuario: dict = USUARIO_ADMIN) -> list:
+    """
+    Renderiza a página com o cache frio e depois quente. Retorna a lista de
+    falhas (vazia se as duas renderizações ficaram dentro do orçamento).
+    """
+    from streamlit.testing.v1 import AppTest
+
+    falhas = []
+    cache.limpar()
+    for fase, maximo in (('frio', frio), ('quente', quente)):
+        at = AppTest.from_function(_script_pagina, args=(caminho, maximo), default_timeout=120)
+        at.session_state['autenticado'] = True
+        at.session_state['usuario'] = usuario
+        at.run()
+
+        consultas = at.session_state['_consultas_pagina']
+        grupos = instrumentacao.consultas_por_chamador(consultas)
+        print(f"{caminho} [{fase}]: {len(consultas)} consultas (orçamento {maximo})")
+        for (chamador, funcao), g in grupos.items():
+            print(f"    {chamador} -> {funcao}: {g['consultas']} consultas, {g['linhas']} linhas")
+
+        if at.exception:
+            falhas.append(f"{caminho} [{fase}]: {at.exception[0].value}")
+
+    return falhas
+
+
+def main() -> int:
+    for nome in list(logging.root.manager.loggerDict):
+        if nome.startswith('streamlit'):
+            logging.getLogger(nome).setLevel(logging.ERROR)
+
+    usuarios = gerar_usuarios(10)
+    data_async.definir_cliente(ClienteMemoria({
+        'projetos': gerar_projetos(LINHAS_PADRAO, usuarios=usuarios),
+        'usuarios': usuarios
+    }))
+
+    falhas = []
+    for caminho, (frio, quente) in ORCAMENTOS.items():
+        falhas.extend(verificar_pagina(caminho, frio, quente))
+
+    data_async.definir_cliente(None)
+
+    for falha in falhas:
+        print(f"FALHOU {falha}")
+    if falhas:
+        return 1
+    print("Todas as páginas dentro do orçamento.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
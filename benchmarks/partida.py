@@ -0,0 +1,139 @@
+"""
+Tempo de partida: da importação do app até a tela de login e até o
+primeiro dashboard.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.partida
+    python -m benchmarks.partida --repeticoes 5
+
+Cada medição roda num interpretador novo, para que nenhum módulo do app
+esteja importado: o tempo inclui importar app.py, as páginas e as
+dependências que elas trazem, e desenhar a tela pelo AppTest (o import do
+próprio Streamlit fica de fora, é igual para qualquer app). O dashboard é
+servido pelo cliente em memória de benchmarks/cliente_memoria.py.
+
+Além do tempo (mediana das repetições), cada cenário tem uma lista de
+módulos pesados que a renderização não pode importar, que é a garantia que
+não depende da máquina. Só contam os módulos importados pela renderização:
+o próprio AppTest já traz o plotly.graph_objects. O pyarrow fica de fora
+da lista do dashboard porque o st.dataframe do Streamlit o importa. O
+processo termina com código 1 se algum cenário passar do orçamento.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_PROJETO)
+
+
+REPETICOES_PADRAO = 3
+USUARIO_ADMIN = {'id': 1, 'usuario': 'usuario.00001', 'nome': 'Usuário 1', 'nivel': 3}
+LINHAS_PADRAO = 50
+
+# Cenário -> (segundos no máximo, módulos que não podem estar carregados)
+ORCAMENTOS = {
+    'login': (1.0, ('utils.data_manager', 'components.dashboard', 'components.crud', 'plotly.express',
+                    'plotly.graph_objects', 'supabase', 'pyarrow')),
+    'dashboard': (3.0, ('components.usuarios', 'supabase'))
+}
+
+
+def _medir_cenario(cenario: str) -> dict:
+    """Roda no processo filho: desenha a tela do cenário e mede."""
+    import streamlit  # noqa: F401 (fora da medição)
+    from streamlit.testing.v1 import AppTest
+
+    for nome in list(logging.root.manager.loggerDict):
+        if nome.startswith('streamlit'):
+            logging.getLogger(nome).setLevel(logging.ERROR)
+
+    at = AppTest.from_file(os.path.join(RAIZ_PROJETO, 'app.py'), default_timeout=120)
+    if cenario == 'dashboard':
+        from utils import data_async
+        from benchmarks.dados_sinteticos import gerar_projetos, gerar_usuarios
+        from benchmarks.cliente_memoria import ClienteMemoria
+
+        usuarios = gerar_usuarios(10)
+        data_async.definir_cliente(ClienteMemoria({
+            'projetos': gerar_projetos(LINHAS_PADRAO, usuarios=usuarios),
+            'usuarios': usuarios
+        }))
+        at.session_state['autenticado'] = True
+        at.session_state['usuario'] = USUARIO_ADMIN
+
+    ja_importados = set(sys.modules)
+    inicio = time.perf_counter()
+    at.run()
+    segundos = time.perf_counter() - inicio
+
+    return {
+        'segundos': segundos,
+        'modulos': sorted(set(sys.modules) - ja_importados),
+        'erro': at.exception[0].value if at.exception else None
+    }
+
+
+def medir(cenario: str, repeticoes: int = REPETICOES_PADRAO) -> dict:
+    """Mede o cenário em `repeticoes` interpretadores novos. Retorna a mediana e os módulos importados."""
+    execucoes = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.partida', '--cenario', cenario],
+            cwd=RAIZ_PROJETO, capture_output=True, text=True, check=True
+        )
+        execucoes.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+    return {
+        'segundos': statistics.median(e['segundos'] for e in execucoes),
+        'modulos': execucoes[-1]['modulos'],
+        'erro': next((e['erro'] for e in execucoes if e['erro']), None)
+    }
+
+
+def verificar(cenario: str, repeticoes: int = REPETICOES_PADRAO) -> list:
+    """Mede o cenário e retorna a lista de falhas (vazia se ficou dentro do orçamento)."""
+    limite, proibidos = ORCAMENTOS[cenario]
+    resultado = medir(cenario, repeticoes)
+    carregados = [m for m in proibidos if m in resultado['modulos']]
+    print(f"{cenario}: {resultado['segundos'] * 1000:.0f} ms (orçamento {limite * 1000:.0f} ms)")
+
+    falhas = []
+    if resultado['erro']:
+        falhas.append(f"{cenario}: {resultado['erro']}")
+    if resultado['segundos'] > limite:
+        falhas.append(f"{cenario}: {resultado['segundos']:.2f}s acima de {limite:.2f}s")
+    if carregados:
+        falhas.append(f"{cenario}: importou {', '.join(carregados)}")
+    return falhas
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tempo de partida do MigratePro")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO)
+    parser.add_argument('--cenario', choices=list(ORCAMENTOS), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.cenario:
+        print(json.dumps(_medir_cenario(args.cenario)))
+        return 0
+
+    falhas = []
+    for cenario in ORCAMENTOS:
+        falhas.extend(verificar(cenario, args.repeticoes))
+
+    for falha in falhas:
+        print(f"FALHOU {falha}")
+    if falhas:
+        return 1
+    print("Partida dentro do orçamento.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
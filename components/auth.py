@@ -5,7 +5,8 @@ Funciona corretamente com múltiplos usuários no Streamlit Cloud.
 """
 
 import streamlit as st
-from utils.data_manager import autenticar_usuario, carregar_usuarios, get_supabase_client
+from utils import data_async, pendencias, times
+from utils.aquecimento import iniciar_aquecimento, cancelar_aquecimento
 import datetime
 import uuid
 
@@ -17,28 +18,24 @@ SESSION_PARAM_NAME = 'session'
 
 def _criar_sessao(usuario_id: int, usuario: str, senha: str) -> str:
     """Cria uma nova sessão no Supabase e retorna o token."""
-    client = get_supabase_client()
-    if not client:
-        return None
-    
     try:
         token = str(uuid.uuid4())
         expira = (datetime.datetime.now() + datetime.timedelta(days=SESSION_EXPIRY_DAYS)).isoformat()
         
         # Insere ou atualiza sessão
-        client.table('sessoes').upsert({
+        criada = data_async.executar(data_async.criar_sessao({
             'token': token,
             'usuario_id': usuario_id,
             'usuario': usuario,
             'senha': senha,
             'expira_em': expira
-        }).execute()
+        }))
         
-        return token
+        return token if criada else None
     except Exception as e:
         # Se a tabela não existir, cria ela
         try:
-            client.rpc('create_sessoes_table').execute()
+            data_async.executar(data_async.criar_tabela_sessoes())
         except:
             pass
         return None
@@ -49,16 +46,10 @@ def _validar_sessao(token: str) -> dict:
     if not token:
         return None
     
-    client = get_supabase_client()
-    if not client:
-        return None
-    
     try:
-        response = client.table('sessoes').select('*').eq('token', token).execute()
+        sessao = data_async.executar(data_async.buscar_sessao(token))
         
-        if response.data:
-            sessao = response.data[0]
-            
+        if sessao:
             # Verifica se não expirou
             expira = datetime.datetime.fromisoformat(sessao['expira_em'].replace('Z', '+00:00').replace('+00:00', ''))
             if datetime.datetime.now() > expira:
@@ -66,6 +57,7 @@ def _validar_sessao(token: str) -> dict:
                 return None
             
             # Autentica usuário para obter dados atualizados
+            from utils.data_manager import autenticar_usuario
             user_data = autenticar_usuario(sessao['usuario'], sessao['senha'])
             return user_data
     except Exception as e:
@@ -79,12 +71,8 @@ def _remover_sessao(token: str):
     if not token:
         return
     
-    client = get_supabase_client()
-    if not client:
-        return
-    
     try:
-        client.table('sessoes').delete().eq('token', token).execute()
+        data_async.executar(data_async.remover_sessao(token))
     except:
         pass
 
@@ -104,6 +92,7 @@ def verificar_autenticacao():
             st.session_state['autenticado'] = True
             st.session_state['usuario'] = user_data
             st.session_state['session_token'] = token
+            iniciar_aquecimento()
             return True
         else:
             # Token inválido, limpa query params
@@ -145,9 +134,13 @@ def fazer_logout():
     if token:
         _remover_sessao(token)
     
+    # Grava as alterações pendentes enquanto o usuário (autor no histórico) ainda está na sessão
+    pendencias.gravar_todos()
+    cancelar_aquecimento()
     st.session_state['autenticado'] = False
     st.session_state['usuario'] = None
     st.session_state['session_token'] = None
+    st.session_state.pop(times.CHAVE_SESSAO, None)
     st.query_params.clear()
     st.rerun()
 
@@ -155,20 +148,6 @@ def fazer_logout():
 def mostrar_tela_login():
     """Exibe a tela de login."""
     
-    # CSS para estilizar o login
-    st.markdown("""
-        <style>
-        .login-container {
-            max-width: 400px;
-            margin: 100px auto;
-            padding: 40px;
-            background: linear-gradient(135deg, #1e3a5f 0%, #0d1b2a 100%);
-            border-radius: 20px;
-            box-shadow: 0 20px 60px rgba(0, 0, 0, 0.5);
-        }
-        </style>
-    """, unsafe_allow_html=True)
-    
     col1, col2, col3 = st.columns([1, 2, 1])
     
     with col2:
@@ -186,10 +165,13 @@ def mostrar_tela_login():
             
             if submitted:
                 if usuario and senha:
+                    # Importado no envio: desenhar a tela não precisa da camada de dados
+                    from utils.data_manager import autenticar_usuario
                     user_data = autenticar_usuario(usuario, senha)
                     if user_data:
                         st.session_state['autenticado'] = True
                         st.session_state['usuario'] = user_data
+                        iniciar_aquecimento()
                         
                         if manter_conectado:
                             # Cria sessão no Supabase
@@ -217,7 +199,28 @@ def mostrar_info_usuario():
         st.sidebar.markdown("---")
         st.sidebar.markdown(f"👤 **{usuario['nome']}**")
         st.sidebar.markdown(f"🏷️ {nivel_nome.get(usuario['nivel'], 'Desconhecido')}")
+        mostrar_seletor_time()
         
         if st.sidebar.button("🚪 Sair", use_container_width=True, type="primary"):
             fazer_logout()
 
+
+def mostrar_seletor_time():
+    """Mostra o time da sessão; administradores podem trocar de time."""
+    atual = times.time_atual()
+    opcoes = sorted(set(times.listar_times()) | {atual})
+    
+    if not pode_administrar() or len(opcoes) < 2:
+        st.sidebar.markdown(f"🧭 Time {atual}")
+        return
+    
+    escolhido = st.sidebar.selectbox(
+        "🧭 Time",
+        opcoes,
+        index=opcoes.index(atual),
+        key="seletor_time"
+    )
+    if escolhido != atual:
+        times.selecionar_time(escolhido)
+        iniciar_aquecimento()
+        st.rerun()
@@ -4,9 +4,11 @@ Componentes de gráficos usando Plotly.
 
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from utils import instrumentacao
 
 
+@instrumentacao.medir('grafico')
 def criar_grafico_progresso(projetos: list) -> go.Figure:
     """Cria gráfico de barras de progresso dos projetos."""
     
@@ -119,6 +121,7 @@ def criar_grafico_progresso(projetos: list) -> go.Figure:
     return fig
 
 
+@instrumentacao.medir('grafico')
 def criar_grafico_metodos(metodos: dict) -> go.Figure:
     """Cria gráfico de rosca dos métodos de migração."""
     
@@ -173,6 +176,7 @@ def criar_grafico_metodos(metodos: dict) -> go.Figure:
     return fig
 
 
+@instrumentacao.medir('grafico')
 def criar_grafico_dificuldades(dificuldades: dict) -> go.Figure:
     """Cria gráfico de barras horizontais das dificuldades mais comuns."""
     
@@ -243,6 +247,7 @@ def criar_grafico_dificuldades(dificuldades: dict) -> go.Figure:
     return fig
 
 
+@instrumentacao.medir('grafico')
 def criar_grafico_timeline(projetos: list) -> go.Figure:
     """Cria um gráfico de timeline/Gantt dos projetos."""
     
@@ -338,3 +343,177 @@ def criar_grafico_timeline(projetos: list) -> go.Figure:
     )
     
     return fig
+
+
+def _figura_sem_historico() -> go.Figure:
+    fig = go.Figure()
+    fig.add_annotation(
+        text="Sem histórico ainda: a foto diária dos KPIs começa a ser gravada hoje",
+        xref="paper", yref="paper",
+        x=0.5, y=0.5, showarrow=False,
+        font=dict(size=14, color="#8892b0")
+    )
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=350
+    )
+    return fig
+
+
+@instrumentacao.medir('grafico')
+def criar_grafico_tendencia_status(serie: list) -> go.Figure:
+    """Cria gráfico de linhas com a evolução diária dos status e da eficiência."""
+    
+    if not serie:
+        return _figura_sem_historico()
+    
+    dias = [s['dia'] for s in serie]
+    fig = go.Figure()
+    
+    linhas_status = [
+        ('atrasados', 'Atrasados', '#ff6b6b'),
+        ('em_andamento', 'Em Andamento', '#ffd93d'),
+        ('nao_iniciados', 'Não Iniciados', '#8892b0'),
+        ('concluidos', 'Concluídos', '#64ffda')
+    ]
+    for coluna, nome, cor in linhas_status:
+        fig.add_trace(go.Scatter(
+            x=dias, y=[s[coluna] for s in serie],
+            name=nome, mode='lines+markers',
+            line=dict(color=cor, width=2), marker=dict(size=5),
+            hovertemplate=f"<b>{nome}</b>: %{{y:.0f}}<extra></extra>"
+        ))
+    
+    fig.add_trace(go.Scatter(
+        x=dias, y=[s['eficiencia'] for s in serie],
+        customdata=[s['media_dias'] for s in serie],
+        name='Eficiência (%)', mode='lines',
+        line=dict(color='#38bdf8', width=2, dash='dot'),
+        yaxis='y2',
+        hovertemplate="<b>Eficiência</b>: %{y:.1f}%<br>Média de dias: %{customdata:.1f}<extra></extra>"
+    ))
+    
+    fig.update_layout(
+        title=dict(
+            text="Status e Eficiência por Dia",
+            font=dict(size=18, color='#fff')
+        ),
+        xaxis=dict(type='date', showgrid=False, color='#8892b0'),
+        yaxis=dict(title="Projetos", showgrid=True, gridcolor='rgba(255,255,255,0.1)', color='#8892b0', rangemode='tozero'),
+        yaxis2=dict(title="Eficiência (%)", overlaying='y', side='right', showgrid=False, color='#38bdf8', rangemode='tozero'),
+        legend=dict(orientation='h', y=-0.15, font=dict(color='#8892b0')),
+        hovermode='x unified',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=350,
+        margin=dict(l=10, r=10, t=50, b=10)
+    )
+    
+    return fig
+
+
+@instrumentacao.medir('grafico')
+def criar_grafico_tendencia_carga(serie: list) -> go.Figure:
+    """Cria gráfico com o mix diário de métodos de migração e o peso da carga do time."""
+    
+    if not serie:
+        return _figura_sem_historico()
+    
+    dias = [s['dia'] for s in serie]
+    fig = go.Figure()
+    
+    barras_metodo = [
+        ('metodo_script', 'Script', '#64ffda'),
+        ('metodo_manual', 'Manual', '#38bdf8'),
+        ('metodo_manual_script', 'Manual + Script', '#a855f7'),
+        ('metodo_outros', 'Outros', '#8892b0')
+    ]
+    for coluna, nome, cor in barras_metodo:
+        fig.add_trace(go.Bar(
+            x=dias, y=[s[coluna] for s in serie],
+            name=nome, marker=dict(color=cor, opacity=0.8),
+            hovertemplate=f"<b>{nome}</b>: %{{y:.0f}}<extra></extra>"
+        ))
+    
+    fig.add_trace(go.Scatter(
+        x=dias, y=[s['peso_carga'] for s in serie],
+        name='Peso da carga', mode='lines+markers',
+        line=dict(color='#ff6b6b', width=2), marker=dict(size=5),
+        yaxis='y2',
+        hovertemplate="<b>Peso da carga</b>: %{y:.1f}<extra></extra>"
+    ))
+    
+    fig.update_layout(
+        title=dict(
+            text="Métodos e Carga do Time por Dia",
+            font=dict(size=18, color='#fff')
+        ),
+        xaxis=dict(type='date', showgrid=False, color='#8892b0'),
+        yaxis=dict(title="Projetos", showgrid=True, gridcolor='rgba(255,255,255,0.1)', color='#8892b0'),
+        yaxis2=dict(title="Peso", overlaying='y', side='right', showgrid=False, color='#ff6b6b', rangemode='tozero'),
+        legend=dict(orientation='h', y=-0.15, font=dict(color='#8892b0')),
+        hovermode='x unified',
+        barmode='stack',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=350,
+        margin=dict(l=10, r=10, t=50, b=10)
+    )
+    
+    return fig
+
+
+@instrumentacao.medir('grafico')
+def criar_grafico_capacidade(curva: dict) -> go.Figure:
+    """Cria gráfico da carga projetada do time, destacando as janelas de sobrecarga."""
+    
+    pontos = curva['pontos']
+    dias = [dia for dia, _ in pontos] + [curva['fim']]
+    cargas = [carga for _, carga in pontos] + [pontos[-1][1]]
+    limites = curva['limites']
+    
+    fig = go.Figure()
+    
+    for janela in curva['sobrecarga']:
+        fig.add_vrect(
+            x0=janela['inicio'], x1=janela['fim'] + timedelta(days=1),
+            fillcolor='#ff6b6b', opacity=0.15, line_width=0, layer='below'
+        )
+    
+    fig.add_trace(go.Scatter(
+        x=dias, y=cargas,
+        mode='lines', line=dict(color='#64ffda', width=2, shape='hv'),
+        fill='tozeroy', fillcolor='rgba(100, 255, 218, 0.1)',
+        name='Carga projetada',
+        hovertemplate="%{x|%d/%m/%Y}<br><b>Carga</b>: %{y:.1f}<extra></extra>"
+    ))
+    
+    fig.add_hline(
+        y=limites['tranquila'], line=dict(color='#ffd93d', dash='dot', width=1),
+        annotation_text="Corrido", annotation_font_color='#ffd93d'
+    )
+    fig.add_hline(
+        y=limites['corrida'], line=dict(color='#ff6b6b', dash='dot', width=1),
+        annotation_text="Sobrecarga", annotation_font_color='#ff6b6b'
+    )
+    
+    fig.update_layout(
+        title=dict(
+            text="Carga Projetada do Time",
+            font=dict(size=18, color='#fff')
+        ),
+        xaxis=dict(type='date', showgrid=False, color='#8892b0'),
+        yaxis=dict(
+            title="Peso (projetos equivalentes)",
+            showgrid=True, gridcolor='rgba(255,255,255,0.1)', color='#8892b0',
+            range=[0, max(curva['pico'], limites['corrida']) * 1.2]
+        ),
+        showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=350,
+        margin=dict(l=10, r=10, t=50, b=10)
+    )
+    
+    return fig
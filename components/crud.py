@@ -2,22 +2,70 @@
 CRUD de Projetos de Migração.
 """
 
+import uuid
 import streamlit as st
 from datetime import datetime, date
 from utils.data_manager import (
     carregar_projetos,
     criar_projeto,
-    atualizar_projeto,
     excluir_projeto,
     buscar_projeto,
     calcular_dificuldade,
-    carregar_usuarios
+    carregar_usuarios,
+    carregar_textos_projeto,
+    carregar_historico_projeto,
+    descartar_escritas_com_falha,
+    aviso_dados_desatualizados,
+    calcular_carga_pessoas,
+    verificar_alocacao,
+    sugerir_data_inicio,
+    carga_maxima_no_periodo,
+    filtrar_projetos,
+    exportar_projetos,
+    limites_carga
 )
 from components.auth import pode_editar, pode_administrar
+from utils import assets, exportacao, fila_escritas, pendencias, times
 
 
 # Opções padrão
 METODOS_MIGRACAO = ['Script', 'Manual', 'Manual + Script']
+DIAS_ESTIMADOS_PADRAO = 30
+# Novo projeto que passou do limite de carga, aguardando a decisão do usuário
+CHAVE_NOVO_PROJETO_EM_CONFIRMACAO = 'novo_projeto_em_confirmacao'
+# Chave de idempotência do envio atual do formulário de novo projeto; renovada
+# a cada projeto criado, para que recriar o mesmo projeto seja um envio novo
+CHAVE_ENVIO_NOVO_PROJETO = 'chave_envio_novo_projeto'
+
+# Cadência de atualização automática dos fragmentos da página de projetos.
+# Digitar na busca reexecuta só a lista; editar um projeto, só o detalhe dele.
+ATUALIZACAO_LISTA_PROJETOS = "5m"
+ATUALIZACAO_DETALHE_PROJETO = None
+# Enquanto há alterações pendentes, confere o debounce a cada segundo
+VERIFICACAO_PENDENCIAS = "1s"
+# Indicador da fila de escritas na sidebar
+ATUALIZACAO_FILA_ESCRITAS = "5s"
+
+# Histórico de alterações: rótulos dos campos e das operações
+ROTULOS_CAMPOS = {
+    'id': 'ID',
+    'nome': 'Nome',
+    'status': 'Status',
+    'data_inicio': 'Início',
+    'data_prazo': 'Prazo',
+    'data_fim': 'Conclusão',
+    'dias_estimados': 'Estimativa',
+    'metodo_migracao': 'Método',
+    'backup_recebido': 'Backup',
+    'responsaveis': 'Responsáveis',
+    'dificuldades': 'Dificuldades',
+    'observacoes': 'Observações'
+}
+ROTULOS_OPERACOES = {
+    'criar': 'Criação', 'salvar': 'Gravação', 'atualizar': 'Edição', 'excluir': 'Exclusão',
+    'renomear': 'Troca de ID'
+}
+MAX_CARACTERES_HISTORICO = 40  # textos longos aparecem cortados no histórico
 
 
 def formatar_data(data_str: str) -> str:
@@ -31,6 +79,15 @@ def formatar_data(data_str: str) -> str:
         return data_str
 
 
+def editores_do_time(time: str = None) -> list:
+    """Usuários que podem ser responsáveis (nível >= 2: Editores/Admins) no time (o da sessão se None)."""
+    time = time or times.time_atual()
+    return [
+        u['usuario'] for u in carregar_usuarios('diretorio_editores')
+        if u['nivel'] >= 2 and times.time_da_linha(u) == time
+    ]
+
+
 def formulario_novo_projeto():
     """Exibe o formulário para criar novo projeto."""
     
@@ -41,31 +98,45 @@ def formulario_novo_projeto():
     st.markdown("## Novo Projeto de Migração")
     st.markdown("<p style='color: #8892b0;'>Cadastre um novo projeto de migração de dados</p>", unsafe_allow_html=True)
     
+    # Fora do formulário: a data sugerida acompanha a estimativa informada
+    dias_estimados = st.number_input(
+        "Estimativa de Dias",
+        min_value=1,
+        max_value=365,
+        value=DIAS_ESTIMADOS_PADRAO,
+        help="Quantos dias você estima para concluir a migração?",
+        key="dias_novo_projeto"
+    )
+    
     with st.form("form_novo_projeto", clear_on_submit=True):
         col1, col2 = st.columns(2)
         
         with col1:
             nome = st.text_input("Nome do Projeto *", placeholder="Ex: Migração Servidor Alpha")
-            data_inicio = st.date_input("Data de Início", value=date.today(), format="DD/MM/YYYY")
+            sugestao = sugerir_data_inicio(dias_estimados)
+            data_inicio = st.date_input("Data de Início", value=sugestao or date.today(), format="DD/MM/YYYY")
+            if sugestao:
+                st.caption(f"📅 Sugerida pela capacidade do time para {dias_estimados} dias de projeto")
+            else:
+                st.caption("📅 Nenhuma data nos próximos 12 meses mantém a carga do time dentro do limite")
             metodo = st.selectbox("Método de Migração", METODOS_MIGRACAO)
         
         with col2:
             data_prazo = st.date_input("Prazo de Entrega", value=None, format="DD/MM/YYYY")
-            dias_estimados = st.number_input(
-                "Estimativa de Dias",
-                min_value=1,
-                max_value=365,
-                value=30,
-                help="Quantos dias você estima para concluir a migração?"
-            )
             
-            # Carregar usuários para seleção (Apenas nível >= 2 - Editores/Admins)
-            usuarios = carregar_usuarios()
-            editores = [u['usuario'] for u in usuarios if u['nivel'] >= 2]
+            editores = editores_do_time()
+            cargas = {c['usuario']: c for c in calcular_carga_pessoas()}
+            
+            def rotulo_editor(usuario):
+                carga = cargas.get(usuario)
+                if not carga:
+                    return f"{usuario} (livre)"
+                return f"{usuario} (carga {carga['carga']:.1f}{' ⚠️' if carga['sobrecarregado'] else ''})"
             
             responsaveis = st.multiselect(
                 "Responsáveis do Time",
                 options=editores,
+                format_func=rotulo_editor,
                 placeholder="Selecione os membros do time..."
             )
             
@@ -105,9 +176,111 @@ def formulario_novo_projeto():
                     'responsaveis': responsaveis
                 }
                 
-                projeto = criar_projeto(dados)
-                st.success(f"Projeto **{projeto['id']}** criado com sucesso!")
-                st.balloons()
+                # Confere antes de criar: acima do limite, o usuário decide abaixo
+                conferencia = _conferir_carga_novo_projeto(dados)
+                if conferencia['sobrecarregados'] or conferencia['excede']:
+                    st.session_state[CHAVE_NOVO_PROJETO_EM_CONFIRMACAO] = {'dados': dados, 'conferencia': conferencia}
+                else:
+                    st.session_state.pop(CHAVE_NOVO_PROJETO_EM_CONFIRMACAO, None)
+                    _criar_novo_projeto(dados)
+                    st.balloons()
+    
+    confirmar_novo_projeto()
+
+
+def _conferir_carga_novo_projeto(dados: dict) -> dict:
+    """Responsáveis e carga do time no período, como ficariam com o projeto (antes de criá-lo)."""
+    dias = dados['dias_estimados']
+    inicio = date.fromisoformat(dados['data_inicio']) if dados['data_inicio'] else None
+    carga_periodo = carga_maxima_no_periodo(inicio, dias) + calcular_dificuldade(dias)['peso'] if inicio else 0
+    limite = limites_carga()['corrida']
+    excede = carga_periodo > limite
+    return {
+        'sobrecarregados': verificar_alocacao(dados['responsaveis'], dias),
+        'carga_periodo': carga_periodo,
+        'excede': excede,
+        'sugestao': sugerir_data_inicio(dias) if excede else None
+    }
+
+
+def _criar_novo_projeto(dados: dict):
+    chave = st.session_state.setdefault(CHAVE_ENVIO_NOVO_PROJETO, uuid.uuid4().hex)
+    projeto = criar_projeto(dados, chave=chave)
+    st.session_state[CHAVE_ENVIO_NOVO_PROJETO] = uuid.uuid4().hex
+    st.success(f"Projeto **{projeto['id']}** criado com sucesso!")
+
+
+def _decidir_novo_projeto(decisao: str):
+    """Callback dos botões de confirmação: 'assim', 'sugestao' ou 'descartar'."""
+    em_confirmacao = st.session_state.pop(CHAVE_NOVO_PROJETO_EM_CONFIRMACAO, None)
+    if not em_confirmacao or decisao == 'descartar':
+        return
+    dados = em_confirmacao['dados']
+    if decisao == 'sugestao':
+        dados = {**dados, 'data_inicio': str(em_confirmacao['conferencia']['sugestao'])}
+    _criar_novo_projeto(dados)
+
+
+def confirmar_novo_projeto():
+    """Avisos de carga do novo projeto e a decisão: criar assim, com a data sugerida ou descartar."""
+    em_confirmacao = st.session_state.get(CHAVE_NOVO_PROJETO_EM_CONFIRMACAO)
+    if not em_confirmacao:
+        return
+    
+    dados, conferencia = em_confirmacao['dados'], em_confirmacao['conferencia']
+    sugestao = conferencia['sugestao']
+    
+    st.markdown(f"### Confirmar criação de **{dados['nome']}**")
+    if conferencia['sobrecarregados']:
+        nomes = ", ".join(f"{c['usuario']} ({c['carga']:.1f} → {c['carga_prevista']:.1f})" for c in conferencia['sobrecarregados'])
+        st.warning(f"⚠️ Responsáveis acima do limite de carga com este projeto: {nomes}")
+    if conferencia['excede']:
+        alternativa = (
+            f"a primeira data que mantém a carga dentro do limite é {sugestao.strftime('%d/%m/%Y')}"
+            if sugestao else "nenhuma data nos próximos 12 meses mantém a carga dentro do limite"
+        )
+        st.warning(f"📅 Com este projeto a carga do time chega a {conferencia['carga_periodo']:.1f} no período; {alternativa}.")
+    
+    # Callbacks: a decisão é tomada antes do rerun, que já não mostra esta seção
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.button("Criar mesmo assim", key="novo_projeto_criar_assim", use_container_width=True,
+                  on_click=_decidir_novo_projeto, args=('assim',))
+    with col2:
+        if sugestao:
+            st.button(f"Criar com início em {sugestao.strftime('%d/%m/%Y')}", key="novo_projeto_criar_sugestao",
+                      type="primary", use_container_width=True, on_click=_decidir_novo_projeto, args=('sugestao',))
+    with col3:
+        st.button("Descartar", key="novo_projeto_descartar", use_container_width=True,
+                  on_click=_decidir_novo_projeto, args=('descartar',))
+
+
+def mostrar_exportacao(busca: str, status_filtro: str, metodo_filtro: str):
+    """Exporta os projetos com os filtros atuais da lista (gerado sob demanda)."""
+    with st.expander("📥 Exportar projetos filtrados"):
+        col_formato, col_botao = st.columns([3, 1])
+        
+        with col_formato:
+            formato = st.radio("Formato", exportacao.formatos_disponiveis(), horizontal=True, key="formato_exportacao")
+        
+        with col_botao:
+            gerar = st.button("Gerar arquivo", key="gerar_exportacao", use_container_width=True)
+        
+        st.caption(f"O arquivo é gerado em disco e o link de download vale por {assets.VALIDADE_DOWNLOAD // 60} minutos.")
+        if not exportacao.PYARROW_AVAILABLE:
+            st.caption("Instale o pacote pyarrow para exportar em Parquet.")
+        
+        if gerar:
+            with st.spinner("Exportando..."):
+                url, total = exportar_projetos(formato, busca, status_filtro, metodo_filtro)
+            if url:
+                extensao, _ = exportacao.FORMATOS[formato]
+                # Link para o arquivo em static/: o servidor o envia direto do disco
+                st.markdown(
+                    f'<a href="{url}" download="projetos_{date.today().isoformat()}.{extensao}">'
+                    f'⬇️ Baixar {total} projetos ({formato})</a>',
+                    unsafe_allow_html=True
+                )
 
 
 def tabela_projetos():
@@ -116,7 +289,18 @@ def tabela_projetos():
     st.markdown("## Todos os Projetos")
     st.markdown("<p style='color: #8892b0;'>Gerencie cronogramas, integridade de dados e observações qualitativas</p>", unsafe_allow_html=True)
     
-    projetos = carregar_projetos()
+    lista_projetos()
+
+
+@st.fragment(run_every=ATUALIZACAO_LISTA_PROJETOS)
+def lista_projetos():
+    """Exibe os filtros e a lista de projetos (fragmento isolado)."""
+    
+    projetos = carregar_projetos('resumo')
+    
+    aviso = aviso_dados_desatualizados('projetos', 'resumo')
+    if aviso:
+        st.warning(f"⏳ {aviso}")
     
     if not projetos:
         st.info("Nenhum projeto cadastrado ainda. Crie o primeiro projeto!")
@@ -135,29 +319,15 @@ def tabela_projetos():
         metodo_filtro = st.selectbox("Método", ['Todos'] + METODOS_MIGRACAO)
     
     # Aplica filtros
-    projetos_filtrados = projetos.copy()
-    
-    if busca:
-        projetos_filtrados = [
-            p for p in projetos_filtrados 
-            if busca.lower() in p['nome'].lower() or busca.lower() in p['id'].lower()
-        ]
-    
-    if status_filtro != 'Todos':
-        projetos_filtrados = [
-            p for p in projetos_filtrados 
-            if status_filtro in p.get('status', '')
-        ]
-    
-    if metodo_filtro != 'Todos':
-        projetos_filtrados = [
-            p for p in projetos_filtrados 
-            if p.get('metodo_migracao') == metodo_filtro
-        ]
+    projetos_filtrados = list(filtrar_projetos(projetos, busca, status_filtro, metodo_filtro))
     
     st.markdown(f"<p style='color: #8892b0;'>Mostrando {len(projetos_filtrados)} de {len(projetos)} projetos</p>", unsafe_allow_html=True)
     
-    # Lista de projetos
+    mostrar_exportacao(busca, status_filtro, metodo_filtro)
+    
+    # Diretório de editores carregado uma vez para a lista toda (não por projeto)
+    editores = editores_do_time() if pode_editar() else []
+    
     # Lista de projetos
     for projeto in projetos_filtrados:
         dias_est = projeto.get('dias_estimados', 30)
@@ -167,10 +337,11 @@ def tabela_projetos():
         status_proj = projeto.get('status', 'N/D')
         
         with st.expander(f"**{projeto['nome']}** | {dif['nivel']} | {status_proj}", expanded=False):
-            mostrar_detalhes_projeto(projeto)
+            mostrar_detalhes_projeto(projeto, editores)
 
 
-def mostrar_detalhes_projeto(projeto: dict):
+@st.fragment(run_every=ATUALIZACAO_DETALHE_PROJETO)
+def mostrar_detalhes_projeto(projeto: dict, editores: list):
     """Mostra os detalhes de um projeto com opções de edição."""
     
     col1, col2 = st.columns(2)
@@ -249,6 +420,22 @@ def mostrar_detalhes_projeto(projeto: dict):
                 
                 backup = st.checkbox("Backup Recebido", value=projeto.get('backup_recebido', False))
                 
+                # Edição de responsáveis
+                responsaveis_atuais = projeto.get('responsaveis', [])
+                # Garante que é uma lista, o Supabase pode retornar None
+                if not isinstance(responsaveis_atuais, list):
+                    responsaveis_atuais = []
+                
+                # Garante que os responsáveis atuais estejam na lista de opções
+                opcoes = list(set(editores + responsaveis_atuais))
+                
+                responsaveis = st.multiselect(
+                    "Responsáveis",
+                    options=opcoes,
+                    default=responsaveis_atuais,
+                    placeholder="Selecione os responsáveis..."
+                )
+                
                 col_btn1, col_btn2 = st.columns(2)
                 with col_btn1:
                     salvar = st.form_submit_button("Salvar", type="primary", use_container_width=True)
@@ -266,13 +453,14 @@ def mostrar_detalhes_projeto(projeto: dict):
                         'data_fim': str(data_fim) if data_fim else None,
                         'dias_estimados': dias_estimados,
                         'metodo_migracao': metodo,
-                        'backup_recebido': backup
+                        'backup_recebido': backup,
+                        'responsaveis': responsaveis
                     }
-                    atualizar_projeto(projeto['id'], dados)
-                    st.success("Projeto atualizado!")
-                    st.rerun()
+                    if not pendencias.registrar(projeto['id'], dados, projeto):
+                        st.info("Nenhuma alteração para salvar.")
                 
                 if excluir:
+                    pendencias.descartar(projeto['id'])
                     excluir_projeto(projeto['id'])
                     st.success("Projeto excluído!")
                     st.rerun()
@@ -285,62 +473,49 @@ def mostrar_detalhes_projeto(projeto: dict):
             st.markdown(f"**Data Conclusão:** {formatar_data(projeto.get('data_fim'))}")
             st.markdown(f"**Método:** {projeto.get('metodo_migracao', 'N/D')}")
             st.markdown(f"**Backup:** {'Recebido' if projeto.get('backup_recebido') else 'Não recebido'}")
+            responsaveis = projeto.get('responsaveis') or []
+            if responsaveis:
+                st.markdown(f"**Responsáveis:** {', '.join(responsaveis)}")
     
     with col2:
         st.markdown("#### Dificuldades e Observações")
         
-        if pode_editar():
+        # Os textos longos só são buscados quando o usuário abre as notas
+        mostrar_notas = st.toggle("Mostrar notas", key=f"notas_{projeto['id']}")
+        textos = carregar_textos_projeto(projeto['id']) if mostrar_notas else {}
+        
+        if mostrar_notas and pode_editar():
             with st.form(f"form_obs_{projeto['id']}"):
                 dificuldades = st.text_area(
                     "Dificuldades",
-                    value=projeto.get('dificuldades', ''),
+                    value=textos.get('dificuldades', ''),
                     height=100,
                     placeholder="Descreva as dificuldades encontradas..."
                 )
                 
                 observacoes = st.text_area(
                     "Observações",
-                    value=projeto.get('observacoes', ''),
+                    value=textos.get('observacoes', ''),
                     height=100,
                     placeholder="Descreva os problemas encontrados, plano de ação, notas importantes..."
                 )
                 
-                # Edição de responsáveis
-                usuarios = carregar_usuarios()
-                editores = [u['usuario'] for u in usuarios if u['nivel'] >= 2]
-                responsaveis_atuais = projeto.get('responsaveis', [])
-                # Garante que é uma lista, o Supabase pode retornar None
-                if not isinstance(responsaveis_atuais, list):
-                    responsaveis_atuais = []
-                
-                # Garante que os responsáveis atuais estejam na lista de opções
-                opcoes = list(set(editores + responsaveis_atuais))
-                
-                responsaveis = st.multiselect(
-                    "Responsáveis",
-                    options=opcoes,
-                    default=responsaveis_atuais,
-                    placeholder="Selecione os responsáveis..."
-                )
-                
                 col_btn1, col_btn2 = st.columns(2)
                 with col_btn1:
                     if st.form_submit_button("Salvar Notas", type="primary", use_container_width=True):
                         dados = {
                             'dificuldades': dificuldades,
-                            'observacoes': observacoes,
-                            'responsaveis': responsaveis
+                            'observacoes': observacoes
                         }
-                        atualizar_projeto(projeto['id'], dados)
-                        st.success("Notas e responsáveis salvos!")
-                        st.rerun()
-        else:
-            responsaveis = projeto.get('responsaveis', [])
-            if responsaveis:
-                st.markdown(f"**Responsáveis:** {', '.join(responsaveis)}")
-                
-            st.markdown(f"**Dificuldades:** {projeto.get('dificuldades', 'Nenhuma registrada')}")
-            st.markdown(f"**Observações:** {projeto.get('observacoes', 'Sem observações')}")
+                        if not pendencias.registrar(projeto['id'], dados, {**projeto, **textos}):
+                            st.info("Nenhuma alteração para salvar.")
+        elif mostrar_notas:
+            st.markdown(f"**Dificuldades:** {textos.get('dificuldades', 'Nenhuma registrada')}")
+            st.markdown(f"**Observações:** {textos.get('observacoes', 'Sem observações')}")
+    
+    # Alterações dos dois formulários são gravadas juntas
+    if pode_editar() and pendencias.pendentes(projeto['id']):
+        mostrar_pendencias(projeto['id'])
     
     # Análise de performance
     st.markdown("---")
@@ -438,3 +613,133 @@ def mostrar_detalhes_projeto(projeto: dict):
             <strong style="color: {cor_status.get(status, '#8892b0')};">Status: {status}</strong>
         </div>
     """, unsafe_allow_html=True)
+    
+    mostrar_historico_projeto(projeto['id'])
+
+
+def _formatar_valor_historico(campo: str, valor) -> str:
+    if valor is None or valor == '' or valor == []:
+        return '—'
+    if isinstance(valor, bool):
+        return 'Sim' if valor else 'Não'
+    if isinstance(valor, list):
+        valor = ', '.join(map(str, valor))
+    elif campo.startswith('data_'):
+        valor = formatar_data(valor)
+    valor = str(valor)
+    if len(valor) > MAX_CARACTERES_HISTORICO:
+        valor = valor[:MAX_CARACTERES_HISTORICO] + '…'
+    return valor
+
+
+def _descrever_alteracoes(campos: dict) -> str:
+    partes = []
+    for campo, valores in campos.items():
+        rotulo = ROTULOS_CAMPOS.get(campo, campo)
+        # [depois] quando a versão anterior não é conhecida
+        depois = _formatar_valor_historico(campo, valores[-1])
+        if len(valores) == 1:
+            partes.append(f"{rotulo}: {depois}")
+        else:
+            partes.append(f"{rotulo}: {_formatar_valor_historico(campo, valores[0])} → {depois}")
+    return '; '.join(partes)
+
+
+@st.fragment
+def mostrar_historico_projeto(id_projeto: str):
+    """Histórico de alterações do projeto, uma página por vez (só carregado se pedido)."""
+    if not st.toggle("Mostrar histórico", key=f"historico_{id_projeto}"):
+        return
+    
+    # Pilha de cursores das páginas já vistas; o topo é a página atual
+    chave_cursores = f"historico_cursores_{id_projeto}"
+    cursores = st.session_state.setdefault(chave_cursores, [None])
+    entradas, proxima = carregar_historico_projeto(id_projeto, cursores[-1])
+    
+    if entradas is None:
+        return
+    if not entradas:
+        st.caption("Nenhuma alteração registrada.")
+        return
+    
+    st.dataframe(
+        [
+            {
+                'Quando': datetime.fromtimestamp(e['em']).strftime('%d/%m/%Y %H:%M'),
+                'Quem': e['autor'] or '—',
+                'Ação': ROTULOS_OPERACOES.get(e['operacao'], e['operacao']),
+                'Alterações': _descrever_alteracoes(e['campos'])
+            }
+            for e in entradas
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    col_recentes, col_pagina, col_antigas = st.columns([1, 2, 1])
+    with col_recentes:
+        st.button(
+            "← Mais recentes", key=f"historico_recentes_{id_projeto}",
+            on_click=cursores.pop, disabled=len(cursores) == 1, use_container_width=True
+        )
+    with col_pagina:
+        st.caption(f"Página {len(cursores)}")
+    with col_antigas:
+        st.button(
+            "Mais antigas →", key=f"historico_antigas_{id_projeto}",
+            on_click=cursores.append, args=(proxima,), disabled=proxima is None, use_container_width=True
+        )
+
+
+@st.fragment(run_every=VERIFICACAO_PENDENCIAS)
+def mostrar_pendencias(id_projeto: str):
+    """Mostra as alterações pendentes do projeto e as grava ao salvar ou vencer o debounce."""
+    dados = pendencias.pendentes(id_projeto)
+    if not dados:
+        return
+    
+    restante = pendencias.segundos_para_gravar(id_projeto)
+    
+    col_info, col_salvar, col_descartar = st.columns([3, 1, 1])
+    with col_info:
+        st.info(f"✏️ Alterações pendentes ({len(dados)} campos) — gravação automática em {restante:.0f}s")
+    with col_salvar:
+        salvar_agora = st.button("Salvar agora", key=f"salvar_pendentes_{id_projeto}", type="primary", use_container_width=True)
+    with col_descartar:
+        if st.button("Descartar", key=f"descartar_pendentes_{id_projeto}", use_container_width=True):
+            pendencias.descartar(id_projeto)
+            st.rerun()
+    
+    if salvar_agora or restante <= 0:
+        if pendencias.gravar(id_projeto) is not None:
+            st.success("Projeto atualizado!")
+            st.rerun()
+
+
+@st.fragment(run_every=ATUALIZACAO_FILA_ESCRITAS)
+def mostrar_fila_escritas():
+    """Indicador (sidebar) das alterações que ainda não chegaram ao banco."""
+    # Roda sozinho a cada ATUALIZACAO_FILA_ESCRITAS: grava o que vencer o debounce sem rerun
+    pendencias.gravar_todos(vencidos=True)
+    contagem = fila_escritas.contagens()
+    
+    for antigo, novo in fila_escritas.renomeados_recentes():
+        st.info(f"🔀 O ID {antigo} já tinha sido usado por outra sessão; o projeto foi gravado como **{novo}**.")
+    
+    if contagem['pendentes']:
+        st.caption(f"⏳ {contagem['pendentes']} alteração(ões) aguardando envio")
+    
+    if contagem['falhas']:
+        falha = next(e for e in fila_escritas.abertas() if e['estado'] == 'falhou')
+        st.warning(f"⚠️ {contagem['falhas']} alteração(ões) não puderam ser gravadas")
+        st.caption(f"Último erro ({falha['projeto']}): {falha['erro']}")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Tentar de novo", key="fila_tentar", use_container_width=True):
+                fila_escritas.tentar_novamente()
+                st.rerun(scope="fragment")
+        with col2:
+            if st.button("Descartar", key="fila_descartar", use_container_width=True):
+                descartar_escritas_com_falha()
+                st.rerun()
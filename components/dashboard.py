@@ -3,20 +3,87 @@ Componentes do Dashboard principal.
 """
 
 import streamlit as st
-from utils.data_manager import obter_estatisticas, carregar_projetos, calcular_carga_time
+from utils.data_manager import (
+    obter_estatisticas,
+    carregar_projetos,
+    calcular_carga_time,
+    carregar_dados_dashboard,
+    aviso_dados_desatualizados,
+    carregar_tendencias,
+    calcular_capacidade,
+    calcular_carga_pessoas,
+    limites_carga
+)
 from utils.icons import get_svg
+from utils import cache, times
 from components.charts import (
     criar_grafico_progresso,
     criar_grafico_metodos,
     criar_grafico_dificuldades,
-    criar_grafico_timeline
+    criar_grafico_timeline,
+    criar_grafico_tendencia_status,
+    criar_grafico_tendencia_carga,
+    criar_grafico_capacidade
 )
 
 
-def mostrar_carga_time():
-    """Exibe o indicador de carga do time."""
-    carga = calcular_carga_time()
+# Cadência de atualização automática de cada fragmento do dashboard.
+# Cada seção roda isolada: uma interação ou atualização reexecuta só a
+# seção dona dela, sem refazer as consultas e gráficos das demais.
+ATUALIZACAO_CARGA_TIME = "1m"
+ATUALIZACAO_METRICAS = "1m"
+ATUALIZACAO_PROGRESSO = "5m"
+ATUALIZACAO_INSIGHTS = "10m"
+ATUALIZACAO_TIMELINE = "10m"
+ATUALIZACAO_CAPACIDADE = "10m"
+ATUALIZACAO_TENDENCIAS = "1h"  # o histórico ganha uma foto por dia
+
+# Horizontes oferecidos na projeção de capacidade (rótulo -> dias)
+HORIZONTES_CAPACIDADE = {
+    "Próximos 30 dias": 30,
+    "Próximos 90 dias": 90,
+    "Próximos 180 dias": 180
+}
+
+# Períodos oferecidos nos gráficos de tendência (rótulo -> dias)
+PERIODOS_TENDENCIA = {
+    "Últimos 30 dias": 30,
+    "Últimos 90 dias": 90,
+    "Últimos 180 dias": 180,
+    "Último ano": 365
+}
+
+FIGURAS_DASHBOARD = ['progresso', 'metodos', 'dificuldades', 'timeline']
+
+
+def obter_figura(nome: str, time: str = None):
+    """
+    Retorna uma figura do dashboard do time (o da sessão se None),
+    reaproveitando a versão em cache enquanto os projetos dele não mudarem.
+    """
+    time = time or times.time_atual()
+    projetos = carregar_projetos('dashboard', time)
     
+    def construir():
+        if nome == 'progresso':
+            return criar_grafico_progresso(projetos)
+        if nome == 'metodos':
+            return criar_grafico_metodos(obter_estatisticas(time)['metodos'])
+        if nome == 'dificuldades':
+            return criar_grafico_dificuldades(obter_estatisticas(time)['dificuldades'])
+        return criar_grafico_timeline(projetos)
+    
+    return cache.derivado(('figura', nome, time), times.escopo_projetos(time), construir)
+
+
+def preparar_figuras(time: str = None):
+    """Constrói antecipadamente todas as figuras do dashboard do time."""
+    for nome in FIGURAS_DASHBOARD:
+        obter_figura(nome, time)
+
+
+def html_carga_time(carga: dict, icone=get_svg) -> str:
+    """HTML do card de carga do time (`icone` gera as tags dos ícones)."""
     # Define ícone baseado no status
     icon_name = 'activity'
     if carga['status'] == 'Tranquilo':
@@ -26,129 +93,145 @@ def mostrar_carga_time():
     else:
         icon_name = 'zap'
         
-    icon_svg = get_svg(icon_name, carga['cor'], 32)
+    icon_svg = icone(icon_name, carga['cor'], 32)
     
-    st.markdown(f"""
+    return f"""
         <div style="background: linear-gradient(135deg, #1e3a5f 0%, #0d1b2a 100%); 
                     padding: 25px; border-radius: 15px; text-align: center;
                     border: 2px solid {carga['cor']}; margin-bottom: 20px;">
             <p style="color: #8892b0; margin: 0; font-size: 1rem; display: flex; align-items: center; justify-content: center; gap: 8px;">
-                {get_svg('users', '#8892b0', 18)} Carga do Time
+                {icone('users', '#8892b0', 18)} Carga do Time
             </p>
             <h1 style="color: {carga['cor']}; margin: 15px 0; font-size: 2.5rem; display: flex; align-items: center; justify-content: center; gap: 15px;">
                 {icon_svg} {carga['status']}
             </h1>
             <p style="color: {carga['cor']}; margin: 0; font-size: 1rem;">
-                {carga['projetos_ativos']} projetos ativos (Não Iniciados + Em Andamento)
+                {carga['projetos_ativos']} projetos ativos (Não Iniciados, Em Andamento e Atrasados)
             </p>
             <p style="color: #8892b0; margin: 10px 0 0 0; font-size: 0.9rem;">
                 {carga['descricao']}
             </p>
         </div>
-    """, unsafe_allow_html=True)
+    """
 
 
-def mostrar_metricas():
-    """Exibe os cards com métricas resumidas."""
-    stats = obter_estatisticas()
-    
-    col1, col2, col3, col4 = st.columns(4)
+@st.fragment(run_every=ATUALIZACAO_CARGA_TIME)
+def mostrar_carga_time():
+    """Exibe o indicador de carga do time."""
+    st.markdown(html_carga_time(calcular_carga_time()), unsafe_allow_html=True)
+
+
+def html_cartoes_metricas(stats: dict, icone=get_svg) -> list:
+    """HTML dos quatro cards de métricas, na ordem de exibição."""
+    cor_atrasados = "#ff6b6b" if stats['atrasados'] > 0 else "#64ffda"
     
-    with col1:
-        st.markdown(f"""
+    return [
+        f"""
             <div style="background: linear-gradient(135deg, #1e3a5f 0%, #0d1b2a 100%); 
                         padding: 20px; border-radius: 15px; text-align: center;
                         border: 1px solid rgba(100, 255, 218, 0.2);">
                 <p style="color: #8892b0; margin: 0; font-size: 0.9rem; display: flex; align-items: center; justify-content: center; gap: 5px;">
-                    {get_svg('clock', '#8892b0', 16)} Média de Dias
+                    {icone('clock', '#8892b0', 16)} Média de Dias
                 </p>
                 <h2 style="color: #64ffda; margin: 5px 0;">{stats['media_dias']} <small style="font-size: 0.5em;">dias</small></h2>
                 <div style="background: rgba(100, 255, 218, 0.1); border-radius: 8px; padding: 2px 8px; display: inline-block; margin-top: 5px;">
                     <span style="color: #64ffda; font-size: 0.8rem; display: flex; align-items: center; gap: 4px;">
-                        {get_svg('zap', '#64ffda', 12)} Eficiência: {stats.get('eficiencia_media', 0)}%
+                        {icone('zap', '#64ffda', 12)} Eficiência: {stats.get('eficiencia_media', 0)}%
                     </span>
                 </div>
             </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        cor_atrasados = "#ff6b6b" if stats['atrasados'] > 0 else "#64ffda"
-        st.markdown(f"""
+        """,
+        f"""
             <div style="background: linear-gradient(135deg, #1e3a5f 0%, #0d1b2a 100%); 
                         padding: 20px; border-radius: 15px; text-align: center;
                         border: 1px solid rgba(255, 107, 107, 0.2);">
                 <p style="color: #8892b0; margin: 0; font-size: 0.9rem; display: flex; align-items: center; justify-content: center; gap: 5px;">
-                    {get_svg('alert_triangle', '#8892b0', 16)} Projetos Atrasados
+                    {icone('alert_triangle', '#8892b0', 16)} Projetos Atrasados
                 </p>
                 <h2 style="color: {cor_atrasados}; margin: 10px 0;">{stats['atrasados']} <small style="font-size: 0.5em;">projetos</small></h2>
                 <p style="color: {'#ff6b6b' if stats['atrasados'] > 0 else '#64ffda'}; margin: 0; font-size: 0.8rem;">
                     {'Atenção Crítica' if stats['atrasados'] > 0 else 'Tudo em dia'}
                 </p>
             </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"""
+        """,
+        f"""
             <div style="background: linear-gradient(135deg, #1e3a5f 0%, #0d1b2a 100%); 
                         padding: 20px; border-radius: 15px; text-align: center;
                         border: 1px solid rgba(100, 255, 218, 0.2);">
                 <p style="color: #8892b0; margin: 0; font-size: 0.9rem; display: flex; align-items: center; justify-content: center; gap: 5px;">
-                    {get_svg('check_circle', '#8892b0', 16)} Total Concluído
+                    {icone('check_circle', '#8892b0', 16)} Total Concluído
                 </p>
                 <h2 style="color: #64ffda; margin: 10px 0;">{stats['concluidos']}<small style="font-size: 0.5em; color: #8892b0;">/{stats['total']}</small></h2>
                 <p style="color: #38bdf8; margin: 0; font-size: 0.8rem;">{stats['percentual_concluido']}% concluído</p>
             </div>
-        """, unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(f"""
+        """,
+        f"""
             <div style="background: linear-gradient(135deg, #1e3a5f 0%, #0d1b2a 100%); 
                         padding: 20px; border-radius: 15px; text-align: center;
                         border: 1px solid rgba(255, 217, 61, 0.2);">
                 <p style="color: #8892b0; margin: 0; font-size: 0.9rem; display: flex; align-items: center; justify-content: center; gap: 5px;">
-                    {get_svg('refresh_cw', '#8892b0', 16)} Em Andamento
+                    {icone('refresh_cw', '#8892b0', 16)} Em Andamento
                 </p>
                 <h2 style="color: #ffd93d; margin: 10px 0;">{stats['em_andamento']} <small style="font-size: 0.5em;">projetos</small></h2>
                 <p style="color: #ffd93d; margin: 0; font-size: 0.8rem;">ativos agora</p>
             </div>
-        """, unsafe_allow_html=True)
+        """
+    ]
+
+
+@st.fragment(run_every=ATUALIZACAO_METRICAS)
+def mostrar_metricas():
+    """Exibe os cards com métricas resumidas."""
+    stats = obter_estatisticas()
+    
+    for coluna, cartao in zip(st.columns(4), html_cartoes_metricas(stats)):
+        with coluna:
+            st.markdown(cartao, unsafe_allow_html=True)
 
 
+@st.fragment(run_every=ATUALIZACAO_PROGRESSO)
 def mostrar_progresso_projetos():
     """Exibe a seção de progresso dos projetos."""
-    projetos = carregar_projetos()
-    
     st.markdown("### 📈 Progresso da Migração")
     st.markdown("<p style='color: #8892b0;'>Progresso real vs compromissos de prazo</p>", unsafe_allow_html=True)
     
-    fig = criar_grafico_progresso(projetos)
+    fig = obter_figura('progresso')
     st.plotly_chart(fig, key="chart_progresso", config={'displayModeBar': False})
 
 
 def mostrar_insights():
     """Exibe o painel de insights."""
-    stats = obter_estatisticas()
-    
     st.markdown("### 💡 Insights da Migração")
     
     col1, col2 = st.columns(2)
     
     with col1:
-        fig_metodos = criar_grafico_metodos(stats['metodos'])
-        st.plotly_chart(fig_metodos, key="chart_metodos", config={'displayModeBar': False})
+        mostrar_grafico_metodos()
     
     with col2:
-        fig_dificuldades = criar_grafico_dificuldades(stats['dificuldades'])
-        st.plotly_chart(fig_dificuldades, key="chart_dificuldades", config={'displayModeBar': False})
+        mostrar_grafico_dificuldades()
+
+
+@st.fragment(run_every=ATUALIZACAO_INSIGHTS)
+def mostrar_grafico_metodos():
+    """Exibe o gráfico de métodos de migração."""
+    fig_metodos = obter_figura('metodos')
+    st.plotly_chart(fig_metodos, key="chart_metodos", config={'displayModeBar': False})
 
 
+@st.fragment(run_every=ATUALIZACAO_INSIGHTS)
+def mostrar_grafico_dificuldades():
+    """Exibe o gráfico de dificuldades mais comuns."""
+    fig_dificuldades = obter_figura('dificuldades')
+    st.plotly_chart(fig_dificuldades, key="chart_dificuldades", config={'displayModeBar': False})
+
+
+@st.fragment(run_every=ATUALIZACAO_TIMELINE)
 def mostrar_timeline():
     """Exibe o gráfico de timeline."""
-    projetos = carregar_projetos()
-    
     st.markdown("### 📅 Timeline dos Projetos")
     
-    fig = criar_grafico_timeline(projetos)
+    fig = obter_figura('timeline')
     st.plotly_chart(fig, key="chart_timeline", config={'displayModeBar': False})
 
 
@@ -159,6 +242,16 @@ def mostrar_dashboard():
     
     st.markdown("---")
     
+    # Carrega os projetos uma vez; as seções abaixo leem do cache já aquecido
+    dados = carregar_dados_dashboard()
+    
+    for nome, erro in dados['erros'].items():
+        st.error(f"Erro ao carregar {nome}: {erro}")
+    
+    aviso = aviso_dados_desatualizados('projetos', 'dashboard')
+    if aviso:
+        st.warning(f"⏳ {aviso}")
+    
     # Indicador de Carga do Time (NOVO!)
     mostrar_carga_time()
     
@@ -180,3 +273,103 @@ def mostrar_dashboard():
     
     # Timeline
     mostrar_timeline()
+    
+    st.markdown("---")
+    
+    # Capacidade projetada
+    mostrar_capacidade()
+    
+    # Carga por pessoa
+    mostrar_carga_pessoas()
+    
+    st.markdown("---")
+    
+    # Tendências (histórico diário de KPIs)
+    mostrar_tendencias()
+
+
+@st.fragment(run_every=ATUALIZACAO_CAPACIDADE)
+def mostrar_capacidade():
+    """Exibe a carga projetada do time e as janelas de sobrecarga."""
+    col_titulo, col_horizonte = st.columns([3, 1])
+    
+    with col_titulo:
+        st.markdown("### 🗓️ Capacidade do Time")
+        st.markdown("<p style='color: #8892b0;'>Carga somada dos projetos em aberto, dia a dia, pelo prazo de cada um</p>", unsafe_allow_html=True)
+    
+    with col_horizonte:
+        horizonte = st.selectbox("Horizonte", list(HORIZONTES_CAPACIDADE), index=1, key="horizonte_capacidade")
+    
+    dias = HORIZONTES_CAPACIDADE[horizonte]
+    curva = calcular_capacidade(dias)
+    # A figura acompanha a curva: refeita só quando os projetos mudam (ou o dia vira)
+    time = times.time_atual()
+    fig = cache.derivado(
+        ('figura', 'capacidade', dias, curva['inicio'], time),
+        times.escopo_projetos(time),
+        lambda: criar_grafico_capacidade(curva)
+    )
+    st.plotly_chart(fig, key="chart_capacidade", config={'displayModeBar': False})
+    
+    if curva['sobrecarga']:
+        janelas = ", ".join(
+            f"{j['inicio'].strftime('%d/%m')}–{j['fim'].strftime('%d/%m')} (pico {j['pico']:.1f})"
+            for j in curva['sobrecarga']
+        )
+        st.warning(f"⚠️ Sobrecarga prevista: {janelas}")
+    else:
+        st.success("✅ Nenhuma sobrecarga prevista no período.")
+    
+    if curva['sem_datas']:
+        st.caption(f"{curva['sem_datas']} projeto(s) em aberto sem data de início não entram na projeção.")
+
+
+@st.fragment(run_every=ATUALIZACAO_CARGA_TIME)
+def mostrar_carga_pessoas():
+    """Exibe a carga de cada responsável (projetos ativos, peso e próximos prazos)."""
+    st.markdown("### 👥 Carga por Pessoa")
+    st.markdown(f"<p style='color: #8892b0;'>Projetos ativos de cada responsável, com peso pela dificuldade (limite por pessoa: {limites_carga()['pessoa']:.1f})</p>", unsafe_allow_html=True)
+    
+    cargas = calcular_carga_pessoas()
+    if not cargas:
+        st.info("Nenhum projeto com responsáveis definidos.")
+        return
+    
+    st.dataframe(
+        [
+            {
+                '': '⚠️' if c['sobrecarregado'] else '',
+                'Pessoa': c['usuario'],
+                'Ativos': c['projetos_ativos'],
+                'Atrasados': c['atrasados'],
+                'Carga': c['carga'],
+                'Próximos prazos': ', '.join(f"{prazo.strftime('%d/%m')} {nome}" for prazo, nome in c['proximos_prazos'])
+            }
+            for c in cargas
+        ],
+        hide_index=True,
+        use_container_width=True
+    )
+
+
+@st.fragment(run_every=ATUALIZACAO_TENDENCIAS)
+def mostrar_tendencias():
+    """Exibe a evolução dos KPIs a partir das fotos diárias."""
+    col_titulo, col_periodo = st.columns([3, 1])
+    
+    with col_titulo:
+        st.markdown("### 📉 Tendências")
+        st.markdown("<p style='color: #8892b0;'>Evolução diária de status, eficiência, métodos e carga do time</p>", unsafe_allow_html=True)
+    
+    with col_periodo:
+        periodo = st.selectbox("Período", list(PERIODOS_TENDENCIA), key="periodo_tendencias")
+    
+    serie = carregar_tendencias(PERIODOS_TENDENCIA[periodo])
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.plotly_chart(criar_grafico_tendencia_status(serie), key="chart_tendencia_status", config={'displayModeBar': False})
+    
+    with col2:
+        st.plotly_chart(criar_grafico_tendencia_carga(serie), key="chart_tendencia_carga", config={'displayModeBar': False})
@@ -0,0 +1,138 @@
+"""
+Painel de desempenho (apenas Admin).
+
+Mostra os spans do rerun atual — seções da página, chamadas ao
+data_manager e construção de gráficos — com tempo total, tempo próprio,
+consultas, linhas e bytes, as idas ao backend agrupadas por chamador, as
+gravações com os bytes enviados e um histórico dos últimos reruns da sessão.
+"""
+
+import time
+from datetime import datetime
+import streamlit as st
+from utils import instrumentacao
+
+
+HISTORICO_RERUNS = 20   # reruns guardados na sessão
+MAIS_LENTOS = 3         # spans destacados por tempo próprio
+LIMIAR_LENTO = 0.25     # segundos; acima disso o span é destacado sempre
+
+
+def perfil_ligado() -> bool:
+    """Indica se o administrador ligou o painel nesta sessão."""
+    return st.session_state.get('perfil_ativo', False)
+
+
+def controle_perfil():
+    """Chave do painel na sidebar."""
+    st.toggle("⏱️ Perfil de desempenho", key='perfil_ativo')
+
+
+def _tempo_proprio(spans: list) -> dict:
+    """Tempo de cada span descontado o dos spans filhos."""
+    proprio = {s['id']: s['duracao'] for s in spans}
+    for s in spans:
+        if s['pai'] is not None and s['pai'] in proprio:
+            proprio[s['pai']] -= s['duracao']
+    return {id_span: max(0.0, t) for id_span, t in proprio.items()}
+
+
+def _registrar_historico(coletor: dict, duracao: float, mais_lento: str) -> list:
+    historico = st.session_state.setdefault('_perfil_historico', [])
+    resumo = instrumentacao.resumo_rerun(coletor)
+    historico.append({
+        'Horário': datetime.fromtimestamp(coletor['inicio']).strftime('%H:%M:%S'),
+        'Tempo (ms)': round(duracao * 1000, 1),
+        'Consultas': resumo['consultas'],
+        'Linhas': resumo['linhas'],
+        'KB': round(resumo['bytes'] / 1024, 1),
+        'Gravações': resumo['escritas'],
+        'KB enviados': round(resumo['bytes_enviados'] / 1024, 2),
+        'Mais lento': mais_lento
+    })
+    del historico[:-HISTORICO_RERUNS]
+    return historico
+
+
+def mostrar_painel_desempenho(coletor: dict):
+    """Renderiza o painel com os spans do rerun e o histórico da sessão."""
+    if not coletor or not coletor['perfil']:
+        return
+
+    duracao = time.perf_counter() - coletor['inicio_perf']
+    spans = coletor['spans']
+    proprio = _tempo_proprio(spans)
+
+    ranking = sorted(proprio, key=proprio.get, reverse=True)
+    destacados = set(ranking[:MAIS_LENTOS]) | {i for i, t in proprio.items() if t >= LIMIAR_LENTO}
+
+    linhas = []
+    for s in spans:
+        linhas.append({
+            '': '🐢' if s['id'] in destacados else '',
+            'Span': ('· ' * s['nivel']) + s['nome'],
+            'Tipo': s['categoria'],
+            'Início (ms)': round(s['inicio'] * 1000, 1),
+            'Total (ms)': round(s['duracao'] * 1000, 1),
+            'Próprio (ms)': round(proprio[s['id']] * 1000, 1),
+            'Consultas': s['consultas'],
+            'Linhas': s['linhas'],
+            'KB': round(s['bytes'] / 1024, 1),
+            'Retornadas': s['retornadas']
+        })
+
+    mais_lento = spans[ranking[0]]['nome'] if ranking else '-'
+    historico = _registrar_historico(coletor, duracao, mais_lento)
+    resumo = instrumentacao.resumo_rerun(coletor)
+
+    st.markdown("---")
+    with st.expander("⏱️ Desempenho deste rerun", expanded=True):
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Tempo total", f"{duracao * 1000:.0f} ms")
+        col2.metric("Consultas", resumo['consultas'])
+        col3.metric("Linhas", resumo['linhas'])
+        col4.metric("Payload", f"{resumo['bytes'] / 1024:.1f} KB")
+
+        if linhas:
+            st.dataframe(linhas, use_container_width=True, hide_index=True)
+        else:
+            st.info("Nenhum span registrado neste rerun.")
+
+        cheias = [
+            nome for nome, registros in (('spans', spans), ('consultas', coletor['consultas']), ('gravações', coletor.get('escritas', [])))
+            if len(registros) >= instrumentacao.MAX_REGISTROS_POR_RERUN
+        ]
+        if cheias:
+            st.warning(f"⚠️ Limite de {instrumentacao.MAX_REGISTROS_POR_RERUN} registros atingido em {', '.join(cheias)}; os seguintes foram ignorados.")
+
+        grupos = instrumentacao.consultas_por_chamador(coletor['consultas'])
+        if grupos:
+            st.markdown("**Idas ao backend por origem**")
+            st.dataframe([
+                {
+                    'Chamador': chamador,
+                    'Função': funcao,
+                    'Consultas': g['consultas'],
+                    'Linhas': g['linhas'],
+                    'KB': round(g['bytes'] / 1024, 1)
+                }
+                for (chamador, funcao), g in sorted(grupos.items(), key=lambda item: -item[1]['consultas'])
+            ], use_container_width=True, hide_index=True)
+
+        escritas = coletor.get('escritas', [])
+        if escritas:
+            st.markdown("**Gravações** (só os campos alterados são enviados)")
+            st.dataframe([
+                {
+                    'Chamador': e['chamador'],
+                    'Tabela': e['tabela'],
+                    'Operação': e['operacao'],
+                    'Campos': e['campos'],
+                    'Bytes': e['bytes'],
+                    'Ignorada': '✔️' if e['ignorada'] else ''
+                }
+                for e in escritas
+            ], use_container_width=True, hide_index=True)
+
+        st.markdown(f"**Últimos {len(historico)} reruns**")
+        st.dataframe(list(reversed(historico)), use_container_width=True, hide_index=True)
@@ -0,0 +1,149 @@
+"""
+Relatório do dashboard em um único arquivo HTML.
+
+Junta o card de carga do time, os cards de métricas e as quatro figuras do
+dashboard num HTML autossuficiente: ícones em base64 e uma única cópia do
+plotly.js embutida, compartilhada por todos os gráficos. Abre offline e
+pode ser enviado por e-mail ou anexado a um chamado.
+
+Roda sem o Streamlit (`python -m components.relatorio --time "Time Norte"
+--saida x.html`), por exemplo num job agendado. O relatório é de um time;
+as figuras vêm do mesmo cache do dashboard e são serializadas uma vez por
+versão dos projetos do time.
+"""
+
+import argparse
+import html
+import logging
+import os
+import sys
+from datetime import datetime
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plotly.offline import get_plotlyjs
+
+from utils import cache, times
+from utils.data_manager import carregar_dados_dashboard, aviso_dados_desatualizados
+from utils.icons import get_svg_embutido
+from components.dashboard import (
+    FIGURAS_DASHBOARD,
+    obter_figura,
+    html_carga_time,
+    html_cartoes_metricas
+)
+
+
+# Título de cada figura no relatório, na ordem de FIGURAS_DASHBOARD
+TITULOS_FIGURAS = {
+    'progresso': "Progresso da Migração",
+    'metodos': "Métodos de Migração",
+    'dificuldades': "Dificuldades Mais Comuns",
+    'timeline': "Timeline dos Projetos"
+}
+
+ESTILO = """
+    body { background: #0a192f; color: #ccd6f6; font-family: -apple-system, 'Segoe UI', Roboto, sans-serif; margin: 0; padding: 30px; }
+    h1 { color: #64ffda; margin: 0 0 5px 0; }
+    h2 { color: #ccd6f6; margin: 30px 0 10px 0; font-size: 1.3rem; }
+    .gerado { color: #8892b0; margin: 0 0 25px 0; }
+    .aviso { background: rgba(255, 217, 61, 0.1); border: 1px solid #ffd93d; color: #ffd93d; border-radius: 8px; padding: 10px 15px; margin-bottom: 20px; }
+    .metricas { display: grid; grid-template-columns: repeat(4, 1fr); gap: 15px; }
+    .figura { background: rgba(30, 58, 95, 0.3); border-radius: 15px; padding: 10px; }
+"""
+
+
+@lru_cache(maxsize=1)
+def _plotly_js() -> str:
+    """Bundle do plotly.js (lido uma vez por processo)."""
+    return get_plotlyjs()
+
+
+def figura_json(nome: str, time: str) -> str:
+    """JSON da figura do dashboard do time, serializado uma vez por versão dos projetos."""
+    return cache.derivado(
+        ('figura_json', nome, time),
+        times.escopo_projetos(time),
+        lambda: obter_figura(nome, time).to_json()
+    )
+
+
+def _html_figura(nome: str, time: str) -> str:
+    id_div = f"figura-{nome}"
+    # "</" dentro do <script> encerraria a tag antes da hora
+    dados = figura_json(nome, time).replace('</', '<\\/')
+    return f"""
+        <h2>{TITULOS_FIGURAS[nome]}</h2>
+        <div class="figura"><div id="{id_div}"></div></div>
+        <script>
+            (function () {{
+                var fig = {dados};
+                Plotly.newPlot("{id_div}", fig.data, fig.layout, {{displayModeBar: false, responsive: true}});
+            }})();
+        </script>
+    """
+
+
+def gerar_relatorio(time: str = times.TIME_PADRAO) -> str:
+    """
+    Monta o HTML do relatório com os dados atuais do dashboard do time.
+    Levanta RuntimeError se os projetos não puderem ser carregados.
+    """
+    dados = carregar_dados_dashboard(time)
+    if dados['projetos'] is None:
+        raise RuntimeError(f"Não foi possível carregar os projetos: {dados['erros'].get('projetos')}")
+
+    aviso = aviso_dados_desatualizados('projetos', 'dashboard', time)
+    cartoes = html_cartoes_metricas(dados['estatisticas'], icone=get_svg_embutido)
+
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="utf-8">
+    <title>MigratePro - Relatório do Dashboard</title>
+    <style>{ESTILO}</style>
+    <script>{_plotly_js()}</script>
+</head>
+<body>
+    <h1>MigratePro</h1>
+    <p class="gerado">Time {html.escape(time)} · relatório gerado em {datetime.now().strftime('%d/%m/%Y %H:%M')}</p>
+    {f'<div class="aviso">{html.escape(aviso)}</div>' if aviso else ''}
+    {html_carga_time(dados['carga'], icone=get_svg_embutido)}
+    <div class="metricas">{''.join(cartoes)}</div>
+    {''.join(_html_figura(nome, time) for nome in FIGURAS_DASHBOARD)}
+</body>
+</html>
+"""
+
+
+def salvar_relatorio(caminho: str, time: str = times.TIME_PADRAO) -> str:
+    """Gera o relatório do time e grava em `caminho` (UTF-8). Retorna o caminho."""
+    conteudo = gerar_relatorio(time)
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(conteudo)
+    return caminho
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Gera o relatório HTML do dashboard do MigratePro")
+    parser.add_argument('--saida', default='relatorio_dashboard.html')
+    parser.add_argument('--time', default=times.TIME_PADRAO)
+    args = parser.parse_args(argv)
+
+    # Fora de `streamlit run` cada chamada de st.* avisa da falta de contexto
+    for nome in list(logging.root.manager.loggerDict):
+        if nome.startswith('streamlit'):
+            logging.getLogger(nome).setLevel(logging.ERROR)
+
+    try:
+        caminho = salvar_relatorio(args.saida, args.time)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"Relatório gravado em {caminho}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
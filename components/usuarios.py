@@ -5,11 +5,13 @@ CRUD de Usuários (apenas Admin).
 import streamlit as st
 from utils.data_manager import (
     carregar_usuarios,
+    aviso_dados_desatualizados,
     criar_usuario,
     atualizar_usuario,
     excluir_usuario
 )
 from components.auth import pode_administrar
+from utils import times
 
 
 NIVEIS = {
@@ -18,6 +20,9 @@ NIVEIS = {
     3: "Administrador"
 }
 
+# Cadência de atualização automática dos fragmentos de cada aba
+ATUALIZACAO_LISTA_USUARIOS = "5m"
+
 
 def gerenciar_usuarios():
     """Página de gerenciamento de usuários."""
@@ -38,11 +43,16 @@ def gerenciar_usuarios():
         formulario_novo_usuario()
 
 
+@st.fragment(run_every=ATUALIZACAO_LISTA_USUARIOS)
 def listar_usuarios():
     """Lista todos os usuários."""
     
     usuarios = carregar_usuarios()
     
+    aviso = aviso_dados_desatualizados('usuarios', 'lista')
+    if aviso:
+        st.warning(f"⏳ {aviso}")
+    
     # Cabeçalho da tabela
     st.markdown("""
         <div style="display: flex; background: #1e3a5f; padding: 15px; border-radius: 10px 10px 0 0; 
@@ -51,6 +61,7 @@ def listar_usuarios():
             <div style="flex: 2;">Usuário</div>
             <div style="flex: 2;">Nome</div>
             <div style="flex: 1;">Nível</div>
+            <div style="flex: 1;">Time</div>
             <div style="flex: 1;">Status</div>
             <div style="flex: 1;">Ações</div>
         </div>
@@ -61,7 +72,7 @@ def listar_usuarios():
         status = "✅ Ativo" if usuario['ativo'] else "❌ Inativo"
         
         with st.container():
-            col1, col2, col3, col4, col5, col6 = st.columns([1, 2, 2, 1, 1, 1])
+            col1, col2, col3, col4, col_time, col5, col6 = st.columns([1, 2, 2, 1, 1, 1, 1])
             
             with col1:
                 st.markdown(f"**{usuario['id']}**")
@@ -71,13 +82,15 @@ def listar_usuarios():
                 st.markdown(usuario['nome'])
             with col4:
                 st.markdown(nivel_nome)
+            with col_time:
+                st.markdown(times.time_da_linha(usuario))
             with col5:
                 st.markdown(status)
             with col6:
                 if usuario['usuario'] != 'admin':
                     if st.button("✏️", key=f"edit_{usuario['id']}", help="Editar"):
                         st.session_state['editar_usuario'] = usuario['id']
-                        st.rerun()
+                        st.rerun(scope="fragment")
                 else:
                     st.markdown("🔒")
             
@@ -88,6 +101,14 @@ def listar_usuarios():
         editar_usuario_modal(st.session_state['editar_usuario'])
 
 
+def opcoes_de_time(atual: str = None) -> list:
+    """Times configurados, mais o `atual` se ele não estiver entre eles."""
+    opcoes = times.listar_times()
+    if atual and atual not in opcoes:
+        opcoes.append(atual)
+    return opcoes
+
+
 def editar_usuario_modal(id_usuario: int):
     """Modal para editar usuário."""
     
@@ -109,6 +130,8 @@ def editar_usuario_modal(id_usuario: int):
             format_func=lambda x: NIVEIS[x],
             index=usuario['nivel'] - 1
         )
+        opcoes_time = opcoes_de_time(times.time_da_linha(usuario))
+        time = st.selectbox("Time", options=opcoes_time, index=opcoes_time.index(times.time_da_linha(usuario)))
         ativo = st.checkbox("Usuário Ativo", value=usuario['ativo'])
         nova_senha = st.text_input("Nova Senha (deixe em branco para manter)", type="password")
         
@@ -119,31 +142,33 @@ def editar_usuario_modal(id_usuario: int):
                 dados = {
                     'nome': nome,
                     'nivel': nivel,
+                    'time': time,
                     'ativo': ativo
                 }
                 if nova_senha:
                     dados['senha'] = nova_senha
                 
-                atualizar_usuario(id_usuario, dados)
+                atualizar_usuario(id_usuario, dados, atual=usuario)
                 st.session_state['editar_usuario'] = None
                 st.success("✅ Usuário atualizado!")
-                st.rerun()
+                st.rerun(scope="fragment")
         
         with col2:
             if st.form_submit_button("🗑️ Excluir", type="secondary", use_container_width=True):
                 if excluir_usuario(id_usuario):
                     st.session_state['editar_usuario'] = None
                     st.success("🗑️ Usuário excluído!")
-                    st.rerun()
+                    st.rerun(scope="fragment")
                 else:
                     st.error("❌ Não foi possível excluir o usuário.")
         
         with col3:
             if st.form_submit_button("❌ Cancelar", use_container_width=True):
                 st.session_state['editar_usuario'] = None
-                st.rerun()
+                st.rerun(scope="fragment")
 
 
+@st.fragment
 def formulario_novo_usuario():
     """Formulário para criar novo usuário."""
     
@@ -167,6 +192,14 @@ def formulario_novo_usuario():
             help="1: Apenas visualizar | 2: Visualizar e editar | 3: Acesso total"
         )
         
+        opcoes_time = opcoes_de_time()
+        time = st.selectbox(
+            "👥 Time",
+            options=opcoes_time,
+            index=opcoes_time.index(times.time_atual()) if times.time_atual() in opcoes_time else 0,
+            help="Projetos e responsáveis que o usuário vê e pode receber"
+        )
+        
         st.markdown("""
             <div style="background: #1e3a5f; padding: 15px; border-radius: 10px; margin: 10px 0;">
                 <p style="color: #8892b0; margin: 0;"><strong>Níveis de Acesso:</strong></p>
@@ -192,7 +225,8 @@ def formulario_novo_usuario():
                     'usuario': usuario,
                     'senha': senha,
                     'nome': nome,
-                    'nivel': nivel
+                    'nivel': nivel,
+                    'time': time
                 })
                 
                 if resultado:
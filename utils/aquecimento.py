@@ -0,0 +1,73 @@
+"""
+Aquecimento do cache logo após o login.
+
+Enquanto a casca da página é renderizada, projetos, usuários, estatísticas
+e figuras do dashboard são carregados em um pool de threads em segundo
+plano. As cargas passam pelo cache compartilhado (utils/cache.py), então
+seguem as mesmas regras de expiração e invalidação, e uma renderização que
+pedir o mesmo dado no meio do caminho aguarda a carga em andamento.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+from utils.times import time_atual
+
+
+MAX_THREADS_AQUECIMENTO = 4
+CHAVE_SESSAO = '_aquecimento'
+
+_executor = ThreadPoolExecutor(max_workers=MAX_THREADS_AQUECIMENTO, thread_name_prefix='aquecimento')
+
+
+def _aquecer_projetos(cancelado: threading.Event, time: str):
+    """Carrega os projetos do time e tudo o que deriva deles."""
+    from utils.data_manager import carregar_projetos, obter_estatisticas, calcular_carga_time
+    from components.dashboard import FIGURAS_DASHBOARD, obter_figura
+
+    etapas = [
+        lambda: carregar_projetos('dashboard', time),
+        lambda: obter_estatisticas(time),
+        lambda: calcular_carga_time(time)
+    ]
+    etapas += [lambda nome=nome: obter_figura(nome, time) for nome in FIGURAS_DASHBOARD]
+
+    for etapa in etapas:
+        if cancelado.is_set():
+            return
+        etapa()
+
+
+def _aquecer_usuarios(cancelado: threading.Event, time: str):
+    """Carrega a lista de usuários e o diretório de editores."""
+    from utils.data_manager import carregar_usuarios
+
+    for perfil in ['lista', 'diretorio_editores']:
+        if cancelado.is_set():
+            return
+        carregar_usuarios(perfil)
+
+
+TAREFAS_AQUECIMENTO = [_aquecer_projetos, _aquecer_usuarios]
+
+
+def iniciar_aquecimento():
+    """Dispara o aquecimento do cache para a sessão atual (e o time dela)."""
+    cancelar_aquecimento()
+
+    # As threads não enxergam a sessão: o time vai como argumento
+    time = time_atual()
+    cancelado = threading.Event()
+    futuros = [_executor.submit(tarefa, cancelado, time) for tarefa in TAREFAS_AQUECIMENTO]
+    st.session_state[CHAVE_SESSAO] = {'cancelado': cancelado, 'futuros': futuros}
+
+
+def cancelar_aquecimento():
+    """Cancela o aquecimento em andamento da sessão (ex.: no logout)."""
+    estado = st.session_state.pop(CHAVE_SESSAO, None)
+    if not estado:
+        return
+
+    estado['cancelado'].set()
+    for futuro in estado['futuros']:
+        futuro.cancel()
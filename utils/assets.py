@@ -0,0 +1,94 @@
+"""
+Pipeline de arquivos estáticos (CSS do tema e sprite de ícones).
+
+Os arquivos são gravados uma única vez por processo em `static/`, com o hash
+do conteúdo no nome, e servidos pelo Streamlit em `app/static/`
+(`server.enableStaticServing`). Como o nome muda sempre que o conteúdo muda,
+um proxy/CDN na frente do app pode servir `app/static/*` com
+`Cache-Control: public, max-age=31536000, immutable` sem risco de servir
+versões antigas. A cada rerun só trafega a tag que referencia o arquivo.
+
+Exportações grandes também saem daqui: `novo_download` reserva um arquivo em
+`static/downloads/`, que o Streamlit serve direto do disco, sem passar pela
+memória do app.
+"""
+
+import glob
+import hashlib
+import os
+import secrets
+import time
+import streamlit as st
+
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTA_FONTES = os.path.join(RAIZ_PROJETO, 'assets')
+PASTA_STATIC = os.path.join(RAIZ_PROJETO, 'static')
+URL_STATIC = 'app/static'
+PASTA_DOWNLOADS = os.path.join(PASTA_STATIC, 'downloads')
+# Downloads gerados ficam acessíveis a quem tiver o link (nome aleatório) até vencer
+VALIDADE_DOWNLOAD = 3600  # segundos
+
+
+def _hash_conteudo(conteudo: bytes) -> str:
+    """Retorna os 12 primeiros caracteres do SHA256 do conteúdo."""
+    return hashlib.sha256(conteudo).hexdigest()[:12]
+
+
+def publicar(nome: str, extensao: str, conteudo: bytes) -> str:
+    """
+    Grava o conteúdo em static/<nome>.<hash>.<extensao> (se ainda não existir)
+    e retorna a URL relativa para referenciá-lo na página.
+    Versões anteriores do mesmo arquivo são removidas.
+    """
+    nome_arquivo = f"{nome}.{_hash_conteudo(conteudo)}.{extensao}"
+    caminho = os.path.join(PASTA_STATIC, nome_arquivo)
+
+    if not os.path.exists(caminho):
+        os.makedirs(PASTA_STATIC, exist_ok=True)
+
+        # Escrita atômica para não servir arquivo pela metade
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'wb') as f:
+            f.write(conteudo)
+        os.replace(temporario, caminho)
+
+        for antigo in glob.glob(os.path.join(PASTA_STATIC, f"{nome}.*.{extensao}")):
+            if antigo != caminho:
+                try:
+                    os.remove(antigo)
+                except OSError:
+                    pass
+
+    return f"{URL_STATIC}/{nome_arquivo}"
+
+
+def novo_download(extensao: str) -> tuple:
+    """
+    Reserva um arquivo com nome imprevisível em static/downloads/ e retorna
+    (caminho, url). Downloads vencidos são removidos antes.
+    """
+    os.makedirs(PASTA_DOWNLOADS, exist_ok=True)
+
+    vencimento = time.time() - VALIDADE_DOWNLOAD
+    for antigo in glob.glob(os.path.join(PASTA_DOWNLOADS, '*')):
+        try:
+            if os.path.getmtime(antigo) < vencimento:
+                os.remove(antigo)
+        except OSError:
+            pass
+
+    nome_arquivo = f"{secrets.token_urlsafe(24)}.{extensao}"
+    return os.path.join(PASTA_DOWNLOADS, nome_arquivo), f"{URL_STATIC}/downloads/{nome_arquivo}"
+
+
+@st.cache_resource(show_spinner=False)
+def url_tema_css() -> str:
+    """Publica o CSS do tema (uma vez por processo) e retorna sua URL."""
+    with open(os.path.join(PASTA_FONTES, 'theme.css'), 'rb') as f:
+        return publicar('theme', 'css', f.read())
+
+
+def injetar_tema():
+    """Referencia o CSS do tema na página (poucos bytes por rerun)."""
+    st.markdown(f'<link rel="stylesheet" href="{url_tema_css()}">', unsafe_allow_html=True)
@@ -0,0 +1,270 @@
+"""
+Cache em memória dos dados lidos do Supabase, compartilhado entre sessões.
+
+Regras de invalidação:
+- dados de origem (projetos, usuários) expiram após TTL_PADRAO segundos;
+- toda escrita invalida o escopo afetado, incrementando sua versão, ou
+  aplica a linha gravada direto nas entradas em memória (`remendar`);
+- valores derivados (estatísticas, carga, figuras) ficam guardados junto
+  com a versão do escopo de origem e são recalculados quando ela muda.
+
+Leitura "stale-while-revalidate": uma entrada expirada é devolvida na hora
+e recarregada em segundo plano. Quando é preciso esperar uma carga (não há
+entrada ou houve escrita), a espera é limitada a um prazo; se a carga
+falhar ou estourar o prazo, o último valor bom é devolvido e `situacao()`
+informa a idade dele para a interface avisar que os dados estão
+desatualizados. Sem último valor bom (a primeira carga), não há o que
+servir no lugar: a espera continua até PRAZO_PRIMEIRA_CARGA.
+
+O cache guarda no máximo MAX_ENTRADAS entradas. Passado o limite, saem
+primeiro os derivados de versões que já mudaram (nunca mais seriam
+servidos) e depois as entradas usadas há mais tempo (LRU). Chaves que se
+renovam sozinhas (por dia, por figura, por projeto aberto) não acumulam.
+"""
+
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from utils import metricas
+
+
+TTL_PADRAO = 60  # segundos
+PRAZO_PADRAO = 5  # segundos esperando uma carga antes de usar o último valor bom
+PRAZO_PRIMEIRA_CARGA = 30  # segundos esperando uma carga sem último valor bom (acima do prazo das consultas)
+MAX_CARGAS_SIMULTANEAS = 8
+MAX_ENTRADAS = 2000  # entradas em memória antes de descartar as menos usadas
+
+_lock = threading.RLock()
+_entradas = OrderedDict()  # chave -> {'valor', 'versao', 'escopo', 'carregado_em'[, 'derivado']}, da menos à mais usada
+_epocas = {}       # escopo -> contador de invalidações (escritas)
+_versoes = {}      # escopo -> versão dos dados (invalidações + recargas + remendos)
+_remendos = {}     # escopo -> contador de remendos (descarta cargas que começaram antes)
+_carregando = {}   # chave -> Future da carga em andamento
+_falhas = {}       # chave -> mensagem da última carga que falhou (limpa no próximo sucesso)
+
+_executor = ThreadPoolExecutor(max_workers=MAX_CARGAS_SIMULTANEAS, thread_name_prefix='cache')
+
+
+def versao(escopo: str) -> int:
+    """Retorna a versão atual dos dados de um escopo."""
+    with _lock:
+        return _versoes.get(escopo, 0)
+
+
+def invalidar(escopo: str) -> None:
+    """Invalida os dados de um escopo e tudo o que foi derivado deles."""
+    with _lock:
+        _epocas[escopo] = _epocas.get(escopo, 0) + 1
+        _versoes[escopo] = _versoes.get(escopo, 0) + 1
+
+
+def limpar() -> None:
+    """Remove todas as entradas do cache."""
+    with _lock:
+        _entradas.clear()
+        _falhas.clear()
+        for escopo in list(_versoes):
+            invalidar(escopo)
+
+
+def _guardar(chave, entrada: dict) -> None:
+    """Grava a entrada como a mais recente e respeita MAX_ENTRADAS."""
+    _entradas[chave] = entrada
+    _entradas.move_to_end(chave)
+    if len(_entradas) > MAX_ENTRADAS:
+        # Derivados de uma versão que já mudou não voltam a valer
+        for antiga in [c for c, e in _entradas.items()
+                       if e.get('derivado') and e['versao'] != _versoes.get(e['escopo'], 0)]:
+            del _entradas[antiga]
+        while len(_entradas) > MAX_ENTRADAS:
+            antiga, _ = _entradas.popitem(last=False)
+            _falhas.pop(antiga, None)
+
+
+def _tipo(chave) -> str:
+    """Rótulo da chave nas métricas (o primeiro elemento de uma tupla)."""
+    return str(chave[0] if isinstance(chave, tuple) and chave else chave)
+
+
+def _valida(entrada: dict, referencia: int, ttl) -> bool:
+    if entrada is None or entrada['versao'] != referencia:
+        return False
+    return ttl is None or time.monotonic() - entrada['carregado_em'] < ttl
+
+
+def obter(chave, carregar, escopo: str, ttl=TTL_PADRAO, prazo: float = PRAZO_PADRAO):
+    """
+    Retorna o valor em cache para a chave ou executa `carregar()`.
+
+    - entrada válida: devolvida direto;
+    - entrada expirada (sem escrita desde a carga): devolvida na hora,
+      com uma recarga disparada em segundo plano;
+    - sem entrada, ou invalidada por escrita: espera a carga até `prazo`
+      segundos. Se ela falhar ou atrasar, devolve o último valor bom que
+      houver; sem nenhum, continua esperando até PRAZO_PRIMEIRA_CARGA e
+      propaga a exceção da carga (ou TimeoutError, se nem assim terminar).
+
+    Uma carga por chave de cada vez: quem chega durante uma carga espera a
+    mesma (ex.: o aquecimento após o login) em vez de repetir a consulta.
+    """
+    with _lock:
+        entrada = _entradas.get(chave)
+        epoca = _epocas.get(escopo, 0)
+        if _valida(entrada, epoca, ttl):
+            _entradas.move_to_end(chave)
+            metricas.contar('migratepro_cache_total', tipo=_tipo(chave), resultado='acerto')
+            return entrada['valor']
+
+        if entrada is not None and entrada['versao'] == epoca:
+            # Expirou por tempo: serve o que tem e revalida fora do rerun
+            _iniciar_carga(chave, carregar, escopo, contextvars.Context())
+            metricas.contar('migratepro_cache_total', tipo=_tipo(chave), resultado='obsoleto')
+            return entrada['valor']
+
+        futuro = _iniciar_carga(chave, carregar, escopo, contextvars.copy_context())
+
+    try:
+        try:
+            valor = futuro.result(timeout=prazo)
+        except TimeoutError:
+            with _lock:
+                tem_valor = _entradas.get(chave) is not None
+            if futuro.done() or tem_valor:
+                raise
+            # Nada para servir no lugar: a tela espera a carga em andamento
+            try:
+                valor = futuro.result(timeout=max(PRAZO_PRIMEIRA_CARGA - prazo, 0))
+            except TimeoutError:
+                if futuro.done():
+                    raise
+                raise TimeoutError(
+                    f"A carga de {_tipo(chave)} não terminou em {PRAZO_PRIMEIRA_CARGA}s"
+                ) from None
+        metricas.contar('migratepro_cache_total', tipo=_tipo(chave), resultado='espera')
+        return valor
+    except Exception:
+        with _lock:
+            entrada = _entradas.get(chave)
+            resultado = 'falha' if entrada is None else 'ultimo_bom'
+        metricas.contar('migratepro_cache_total', tipo=_tipo(chave), resultado=resultado)
+        if entrada is None:
+            raise
+        return entrada['valor']
+
+
+def _iniciar_carga(chave, carregar, escopo: str, contexto: contextvars.Context) -> Future:
+    """Dispara a carga da chave no pool (ou reaproveita a que já está rodando)."""
+    futuro = _carregando.get(chave)
+    if futuro is None:
+        futuro = Future()
+        _carregando[chave] = futuro
+        _executor.submit(
+            contexto.run, _carregar, chave, carregar, escopo, futuro,
+            _epocas.get(escopo, 0), _remendos.get(escopo, 0)
+        )
+    return futuro
+
+
+def _carregar(chave, carregar, escopo: str, futuro: Future, epoca_inicial: int, remendos_inicial: int) -> None:
+    try:
+        valor = carregar()
+    except BaseException as e:
+        with _lock:
+            _falhas[chave] = str(e) or type(e).__name__
+            if _carregando.get(chave) is futuro:
+                _carregando.pop(chave)
+        futuro.set_exception(e)
+        return
+
+    with _lock:
+        # Se houve escrita durante a carga, o valor já nasce invalidado
+        if _epocas.get(escopo, 0) == epoca_inicial and _remendos.get(escopo, 0) == remendos_inicial:
+            _guardar(chave, {
+                'valor': valor,
+                'versao': epoca_inicial,
+                'escopo': escopo,
+                'carregado_em': time.monotonic()
+            })
+            # Dados recarregados: derivados precisam ser recalculados
+            _versoes[escopo] = _versoes.get(escopo, 0) + 1
+        _falhas.pop(chave, None)
+        if _carregando.get(chave) is futuro:
+            _carregando.pop(chave)
+    futuro.set_result(valor)
+
+
+def situacao(chave) -> dict:
+    """
+    Estado do valor que `obter` devolve para a chave:
+    {'idade': segundos desde a carga (None sem valor),
+     'erro': mensagem da última carga que falhou (None se a última deu certo),
+     'desatualizado': True quando o valor servido é de antes de uma falha}.
+    """
+    with _lock:
+        entrada = _entradas.get(chave)
+        erro = _falhas.get(chave)
+        idade = time.monotonic() - entrada['carregado_em'] if entrada else None
+        return {'idade': idade, 'erro': erro, 'desatualizado': entrada is not None and erro is not None}
+
+
+def remendar(escopo: str, aplicar, derivados: dict = None) -> bool:
+    """
+    Atualiza em memória as entradas válidas de um escopo sem recarregá-las.
+
+    `aplicar(chave, valor)` retorna o novo valor (sem alterar o antigo, que
+    pode estar em uso por outra sessão) ou o mesmo objeto se nada mudou.
+    Se algo mudou, os derivados são recalculados a partir da memória na
+    próxima leitura, exceto os de `derivados` ({chave: atualizar(valor)}):
+    esses, se estavam em dia, são atualizados aqui mesmo (incrementalmente)
+    e continuam válidos. Retorna True se alguma entrada mudou.
+    """
+    with _lock:
+        epoca = _epocas.get(escopo, 0)
+        alterou = False
+        for chave, entrada in _entradas.items():
+            if entrada['escopo'] != escopo or entrada.get('derivado') or entrada['versao'] != epoca:
+                continue
+            novo = aplicar(chave, entrada['valor'])
+            if novo is not entrada['valor']:
+                entrada['valor'] = novo
+                alterou = True
+
+        if alterou:
+            versao_anterior = _versoes.get(escopo, 0)
+            _remendos[escopo] = _remendos.get(escopo, 0) + 1
+            _versoes[escopo] = versao_anterior + 1
+            for chave, atualizar in (derivados or {}).items():
+                entrada = _entradas.get(chave)
+                if _valida(entrada, versao_anterior, None):
+                    _guardar(chave, {
+                        **entrada,
+                        'valor': atualizar(entrada['valor']),
+                        'versao': _versoes[escopo]
+                    })
+        return alterou
+
+
+def derivado(chave, escopo: str, calcular):
+    """
+    Retorna um valor calculado a partir dos dados de um escopo.
+    É recalculado apenas quando a versão do escopo muda.
+    """
+    with _lock:
+        entrada = _entradas.get(chave)
+        if _valida(entrada, _versoes.get(escopo, 0), None):
+            _entradas.move_to_end(chave)
+            return entrada['valor']
+        versao_atual = _versoes.get(escopo, 0)
+
+    valor = calcular()
+    with _lock:
+        _guardar(chave, {
+            'valor': valor,
+            'versao': versao_atual,
+            'escopo': escopo,
+            'derivado': True,
+            'carregado_em': time.monotonic()
+        })
+    return valor
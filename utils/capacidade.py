@@ -0,0 +1,148 @@
+"""
+Curva de carga do time ao longo do tempo (varredura de intervalos).
+
+Cada projeto ocupa o time de `inicio` a `fim` (inclusive) com um peso
+(o da dificuldade). Em vez de somar os projetos dia a dia, cada intervalo
+vira dois eventos: +peso no início e -peso no dia seguinte ao fim.
+Ordenados os eventos (O(n log n)), uma passada acumula a carga e devolve
+só os pontos onde ela muda; o resto do cálculo é proporcional ao número de
+mudanças, não ao tamanho do horizonte.
+
+Para sugerir datas, `ArvoreCarga` guarda a mesma carga numa árvore de
+segmentos por dia: somar um intervalo e consultar o máximo de um período
+custam O(log dias), e a busca pelo primeiro encaixe salta direto para
+depois do último dia que bloqueia a janela.
+"""
+
+from datetime import date, timedelta
+
+
+def curva_de_carga(intervalos, inicio: date, fim: date) -> list:
+    """
+    Carga somada dos `intervalos` ((inicio, fim, peso)) entre `inicio` e
+    `fim`. Retorna os pontos de mudança [(dia, carga)], começando em
+    `inicio`: a carga de um ponto vale até a véspera do ponto seguinte.
+    """
+    eventos = []
+    for comeco, termino, peso in intervalos:
+        comeco, termino = max(comeco, inicio), min(termino, fim)
+        if comeco > termino:
+            continue
+        eventos.append((comeco, peso))
+        eventos.append((termino + timedelta(days=1), -peso))
+    eventos.sort(key=lambda e: e[0])
+
+    pontos = [(inicio, 0.0)]
+    carga = 0.0
+    for dia, delta in eventos:
+        if dia > fim:
+            break
+        carga += delta
+        if pontos[-1][0] == dia:
+            pontos[-1] = (dia, round(carga, 2))
+        else:
+            pontos.append((dia, round(carga, 2)))
+
+    # Remove pontos que não mudam a carga (ex.: um projeto termina e outro começa)
+    compactos = [pontos[0]]
+    for ponto in pontos[1:]:
+        if ponto[1] != compactos[-1][1]:
+            compactos.append(ponto)
+    return compactos
+
+
+def janelas_acima(pontos: list, fim: date, limite: float) -> list:
+    """
+    Períodos em que a carga fica acima de `limite`:
+    [{'inicio', 'fim', 'pico'}], com `fim` inclusive.
+    """
+    janelas = []
+    for i, (dia, carga) in enumerate(pontos):
+        ultimo_dia = pontos[i + 1][0] - timedelta(days=1) if i + 1 < len(pontos) else fim
+        if carga <= limite:
+            continue
+        if janelas and janelas[-1]['fim'] + timedelta(days=1) == dia:
+            janelas[-1]['fim'] = ultimo_dia
+            janelas[-1]['pico'] = max(janelas[-1]['pico'], carga)
+        else:
+            janelas.append({'inicio': dia, 'fim': ultimo_dia, 'pico': carga})
+    return janelas
+
+
+class ArvoreCarga:
+    """
+    Árvore de segmentos sobre os dias [0, tamanho): soma de carga em
+    intervalos e máximo de intervalos, ambos O(log tamanho). A soma de um
+    nó vale para o nó inteiro e não é empurrada para os filhos, então as
+    consultas não alteram a árvore (pode ser lida por várias sessões).
+    """
+
+    def __init__(self, tamanho: int):
+        self.tamanho = tamanho
+        self._maximo = [0.0] * (4 * tamanho)   # máximo do nó, já com a soma do próprio nó
+        self._soma = [0.0] * (4 * tamanho)     # carga somada ao nó inteiro
+
+    def somar(self, inicio: int, fim: int, valor: float) -> None:
+        """Soma `valor` à carga dos dias de `inicio` a `fim` (inclusive)."""
+        inicio, fim = max(inicio, 0), min(fim, self.tamanho - 1)
+        if inicio <= fim:
+            self._somar(1, 0, self.tamanho - 1, inicio, fim, valor)
+
+    def _somar(self, no, esq, dir, inicio, fim, valor):
+        if fim < esq or dir < inicio:
+            return
+        if inicio <= esq and dir <= fim:
+            self._soma[no] += valor
+            self._maximo[no] += valor
+            return
+        meio = (esq + dir) // 2
+        self._somar(2 * no, esq, meio, inicio, fim, valor)
+        self._somar(2 * no + 1, meio + 1, dir, inicio, fim, valor)
+        self._maximo[no] = max(self._maximo[2 * no], self._maximo[2 * no + 1]) + self._soma[no]
+
+    def maximo(self, inicio: int, fim: int) -> float:
+        """Maior carga entre os dias `inicio` e `fim` (inclusive)."""
+        return self._maximo_em(1, 0, self.tamanho - 1, max(inicio, 0), min(fim, self.tamanho - 1))
+
+    def _maximo_em(self, no, esq, dir, inicio, fim):
+        if fim < esq or dir < inicio:
+            return float('-inf')
+        if inicio <= esq and dir <= fim:
+            return self._maximo[no]
+        meio = (esq + dir) // 2
+        return max(
+            self._maximo_em(2 * no, esq, meio, inicio, fim),
+            self._maximo_em(2 * no + 1, meio + 1, dir, inicio, fim)
+        ) + self._soma[no]
+
+    def ultimo_acima(self, inicio: int, fim: int, limite: float) -> int:
+        """Último dia entre `inicio` e `fim` com carga acima de `limite` (-1 se nenhum)."""
+        return self._ultimo(1, 0, self.tamanho - 1, inicio, fim, limite, 0.0)
+
+    def _ultimo(self, no, esq, dir, inicio, fim, limite, acima):
+        # `acima`: soma dos ancestrais, que vale para todo o nó
+        if fim < esq or dir < inicio or self._maximo[no] + acima <= limite:
+            return -1
+        if esq == dir:
+            return esq
+        acima += self._soma[no]
+        meio = (esq + dir) // 2
+        dia = self._ultimo(2 * no + 1, meio + 1, dir, inicio, fim, limite, acima)
+        if dia == -1:
+            dia = self._ultimo(2 * no, esq, meio, inicio, fim, limite, acima)
+        return dia
+
+    def primeiro_encaixe(self, duracao: int, peso: float, limite: float, a_partir: int = 0) -> int:
+        """
+        Primeiro dia a partir de `a_partir` em que um projeto de `duracao`
+        dias e `peso` cabe sem a carga passar de `limite` em nenhum dia.
+        Retorna -1 se não couber dentro da árvore.
+        """
+        inicio = max(a_partir, 0)
+        while inicio + duracao <= self.tamanho:
+            # Tolerância para somas de pesos fracionários (1.2 + 1.5...)
+            bloqueio = self.ultimo_acima(inicio, inicio + duracao - 1, limite - peso + 1e-9)
+            if bloqueio == -1:
+                return inicio
+            inicio = bloqueio + 1
+        return -1
@@ -0,0 +1,424 @@
+"""
+Camada de dados assíncrona (asyncio) para projetos, usuários, sessões e estatísticas.
+
+Usa o cliente assíncrono do Supabase quando disponível (um por event loop,
+reaproveitando a conexão HTTP); com o cliente síncrono, cada consulta roda
+em uma thread auxiliar para não bloquear o loop. O número de requisições
+simultâneas é limitado por MAX_REQUISICOES_SIMULTANEAS, então jobs em lote
+(importações, reconciliação) podem disparar centenas de corrotinas com
+`asyncio.gather` a partir de uma única thread.
+
+Um disjuntor protege o backend: depois de LIMITE_FALHAS_SEGUIDAS falhas
+seguidas (erros de rede/servidor ou prazos estourados), as requisições
+falham na hora com BackendIndisponivel durante PAUSA_DISJUNTOR segundos;
+passada a pausa, uma única requisição de teste decide se o circuito fecha.
+
+As funções daqui propagam exceções; as versões síncronas em
+utils/data_manager.py são wrappers finos que chamam `executar()` e tratam
+os erros para a interface.
+
+O pacote supabase (e o httpx por baixo dele) só é importado quando o
+primeiro cliente é criado, não na importação deste módulo: a tela de login
+é desenhada sem ele.
+"""
+
+import asyncio
+import contextvars
+import importlib.util
+import inspect
+import threading
+import time
+import streamlit as st
+from utils import instrumentacao, metricas
+
+SUPABASE_AVAILABLE = importlib.util.find_spec('supabase') is not None
+
+
+MAX_REQUISICOES_SIMULTANEAS = 50
+LIMITE_FALHAS_SEGUIDAS = 5
+PAUSA_DISJUNTOR = 30  # segundos com o circuito aberto antes de testar de novo
+
+# Códigos de erro que indicam problema na requisição, não no backend
+# (classes 22/23/42 do Postgres e erros do PostgREST): não abrem o circuito
+PREFIXOS_ERRO_CLIENTE = ('22', '23', '42', 'PGRST')
+
+_clientes = {}    # event loop -> cliente
+_cliente_fixo = None  # cliente injetado (benchmarks, testes de carga)
+_semaforos = {}   # event loop -> asyncio.Semaphore
+_loop_dedicado = None
+_lock_loop = threading.Lock()
+_disjuntor = {'falhas': 0, 'aberto_ate': 0.0, 'testando': False}
+_lock_disjuntor = threading.Lock()
+
+
+class BackendIndisponivel(Exception):
+    """O disjuntor está aberto: o backend falhou seguidamente e está em pausa."""
+
+
+# ============== INFRAESTRUTURA ==============
+
+def _credenciais():
+    """Retorna (url, key) do Supabase ou None se não configurado."""
+    try:
+        return st.secrets["supabase"]["url"], st.secrets["supabase"]["key"]
+    except Exception:
+        return None
+
+
+def definir_cliente(cliente) -> None:
+    """
+    Substitui o cliente do Supabase usado por toda a camada de dados
+    (ex.: um cliente em memória nos benchmarks). None restaura o padrão.
+    """
+    global _cliente_fixo
+    _cliente_fixo = cliente
+    _clientes.clear()
+
+
+async def obter_cliente():
+    """Retorna o cliente do event loop atual (criado uma única vez) ou None."""
+    if _cliente_fixo is not None:
+        return _cliente_fixo
+
+    loop = asyncio.get_running_loop()
+    if loop in _clientes:
+        return _clientes[loop]
+
+    cliente = None
+    credenciais = _credenciais()
+    if credenciais and SUPABASE_AVAILABLE:
+        try:
+            import supabase
+            # Versões antigas do pacote só têm o cliente síncrono
+            if hasattr(supabase, 'acreate_client'):
+                cliente = await supabase.acreate_client(*credenciais)
+            else:
+                cliente = supabase.create_client(*credenciais)
+        except Exception:
+            cliente = None
+
+    _clientes[loop] = cliente
+    return cliente
+
+
+def _semaforo() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    if loop not in _semaforos:
+        _semaforos[loop] = asyncio.Semaphore(MAX_REQUISICOES_SIMULTANEAS)
+    return _semaforos[loop]
+
+
+# ============== DISJUNTOR ==============
+
+def _liberar_requisicao() -> None:
+    """Deixa a requisição seguir ou levanta BackendIndisponivel se o circuito está aberto."""
+    with _lock_disjuntor:
+        if _disjuntor['falhas'] < LIMITE_FALHAS_SEGUIDAS:
+            return
+        restante = _disjuntor['aberto_ate'] - time.monotonic()
+        if restante > 0 or _disjuntor['testando']:
+            raise BackendIndisponivel(
+                f"Backend indisponível após {_disjuntor['falhas']} falhas seguidas; "
+                f"nova tentativa em {max(restante, 0):.0f}s"
+            )
+        # Pausa vencida: esta requisição testa o backend (meio aberto)
+        _disjuntor['testando'] = True
+
+
+def _registrar_resultado(sucesso: bool) -> None:
+    with _lock_disjuntor:
+        _disjuntor['testando'] = False
+        if sucesso:
+            _disjuntor['falhas'] = 0
+            return
+        _disjuntor['falhas'] += 1
+        if _disjuntor['falhas'] >= LIMITE_FALHAS_SEGUIDAS:
+            _disjuntor['aberto_ate'] = time.monotonic() + PAUSA_DISJUNTOR
+
+
+def _falha_do_backend(erro: BaseException) -> bool:
+    codigo = str(getattr(erro, 'code', '') or '')
+    return not codigo.startswith(PREFIXOS_ERRO_CLIENTE)
+
+
+def estado_disjuntor() -> dict:
+    """{'aberto': bool, 'falhas': falhas seguidas, 'reabre_em': segundos até o próximo teste}."""
+    with _lock_disjuntor:
+        restante = max(0.0, _disjuntor['aberto_ate'] - time.monotonic())
+        aberto = _disjuntor['falhas'] >= LIMITE_FALHAS_SEGUIDAS
+        return {'aberto': aberto, 'falhas': _disjuntor['falhas'], 'reabre_em': restante if aberto else 0.0}
+
+
+metricas.medidor('migratepro_disjuntor_aberto', lambda: estado_disjuntor()['aberto'])
+
+
+# ============== EXECUÇÃO ==============
+
+async def _executar(consulta, tabela: str, operacao: str, colunas: str = ''):
+    """Executa uma consulta do query builder, assíncrono ou síncrono."""
+    try:
+        _liberar_requisicao()
+    except BackendIndisponivel:
+        metricas.contar('migratepro_backend_erros_total', tabela=tabela, operacao=operacao, tipo='disjuntor')
+        raise
+    try:
+        async with _semaforo():
+            inicio = time.perf_counter()
+            if inspect.iscoroutinefunction(consulta.execute):
+                response = await consulta.execute()
+            else:
+                response = await asyncio.to_thread(consulta.execute)
+    except asyncio.CancelledError:
+        # Cancelada por prazo estourado: conta como lentidão do backend
+        _registrar_resultado(False)
+        metricas.contar('migratepro_backend_erros_total', tabela=tabela, operacao=operacao, tipo='prazo')
+        raise
+    except Exception as e:
+        do_backend = _falha_do_backend(e)
+        _registrar_resultado(not do_backend)
+        metricas.contar('migratepro_backend_erros_total', tabela=tabela, operacao=operacao,
+                        tipo='backend' if do_backend else 'cliente')
+        raise
+    duracao = time.perf_counter() - inicio
+    _registrar_resultado(True)
+    metricas.observar('migratepro_backend_segundos', duracao, tabela=tabela, operacao=operacao)
+
+    if instrumentacao.ativo():
+        instrumentacao.registrar_consulta(tabela, operacao, colunas, response.data, duracao)
+    return response
+
+
+async def _no_contexto(contexto: contextvars.Context, corrotina):
+    """Roda a corrotina numa task criada dentro do contexto de quem chamou."""
+    return await contexto.run(asyncio.ensure_future, corrotina)
+
+
+def _obter_loop_dedicado() -> asyncio.AbstractEventLoop:
+    """Event loop em thread própria usado pelos wrappers síncronos."""
+    global _loop_dedicado
+    with _lock_loop:
+        if _loop_dedicado is None:
+            _loop_dedicado = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop_dedicado.run_forever,
+                name='data-async',
+                daemon=True
+            ).start()
+        return _loop_dedicado
+
+
+def executar(corrotina, timeout: float = None):
+    """
+    Executa uma corrotina no event loop dedicado e aguarda o resultado.
+    Ponte usada pela API síncrona; o cliente e suas conexões são
+    reaproveitados entre chamadas. Se o tempo esgotar, a corrotina é cancelada.
+    """
+    futuro = asyncio.run_coroutine_threadsafe(
+        _no_contexto(contextvars.copy_context(), corrotina),
+        _obter_loop_dedicado()
+    )
+    try:
+        return futuro.result(timeout)
+    except TimeoutError:
+        if futuro.done():
+            raise
+        futuro.cancel()
+        raise TimeoutError(f"O backend não respondeu em {timeout:g}s") from None
+
+
+def agendar(corrotina):
+    """
+    Dispara uma corrotina no event loop dedicado sem esperar o resultado
+    (confirmações em segundo plano). Roda fora do contexto de quem chamou,
+    então não entra na instrumentação do rerun.
+    """
+    return asyncio.run_coroutine_threadsafe(corrotina, _obter_loop_dedicado())
+
+
+# ============== PROJETOS ==============
+
+# As leituras por time usam os índices (time, created_at) e (time, id),
+# ver utils/times.py
+
+async def carregar_projetos(colunas: str = '*', time: str = None) -> list:
+    """Carrega os projetos de um time (todos se None), apenas as colunas pedidas."""
+    client = await obter_cliente()
+    if not client:
+        return []
+    consulta = client.table('projetos').select(colunas)
+    if time is not None:
+        consulta = consulta.eq('time', time)
+    response = await _executar(consulta.order('created_at', desc=True), 'projetos', 'select', colunas)
+    return response.data or []
+
+
+async def carregar_pagina_projetos(colunas: str = '*', apos_id: str = None, limite: int = 1000, time: str = None) -> list:
+    """
+    Uma página de projetos (de um time, ou de todos se None) em ordem de ID,
+    começando depois de `apos_id` (paginação por chave: cada página custa o
+    mesmo, por mais longe que esteja).
+    """
+    client = await obter_cliente()
+    if not client:
+        return []
+    consulta = client.table('projetos').select(colunas)
+    if time is not None:
+        consulta = consulta.eq('time', time)
+    if apos_id is not None:
+        consulta = consulta.gt('id', apos_id)
+    response = await _executar(consulta.order('id').limit(limite), 'projetos', 'select', colunas)
+    return response.data or []
+
+
+async def buscar_projeto(id_projeto: str, colunas: str = '*'):
+    """Busca um projeto pelo ID."""
+    client = await obter_cliente()
+    if not client:
+        return None
+    response = await _executar(client.table('projetos').select(colunas).eq('id', id_projeto), 'projetos', 'select', colunas)
+    return response.data[0] if response.data else None
+
+
+async def inserir_projeto(projeto: dict):
+    """Insere um novo projeto e retorna a linha gravada."""
+    client = await obter_cliente()
+    if not client:
+        return None
+    response = await _executar(client.table('projetos').insert(projeto), 'projetos', 'insert')
+    return response.data[0] if response.data else None
+
+
+async def salvar_projeto(dados: dict):
+    """Insere ou atualiza um projeto (upsert) e retorna a linha gravada."""
+    client = await obter_cliente()
+    if not client:
+        return None
+    response = await _executar(client.table('projetos').upsert(dados), 'projetos', 'upsert')
+    return response.data[0] if response.data else None
+
+
+async def atualizar_projeto(id_projeto: str, dados: dict):
+    """Atualiza as colunas informadas de um projeto e retorna a linha gravada."""
+    client = await obter_cliente()
+    if not client:
+        return None
+    response = await _executar(client.table('projetos').update(dados).eq('id', id_projeto), 'projetos', 'update')
+    return response.data[0] if response.data else None
+
+
+async def excluir_projeto(id_projeto: str) -> bool:
+    """Exclui um projeto."""
+    client = await obter_cliente()
+    if not client:
+        return False
+    await _executar(client.table('projetos').delete().eq('id', id_projeto), 'projetos', 'delete')
+    return True
+
+
+# ============== USUÁRIOS ==============
+
+async def carregar_usuarios(colunas: str = '*') -> list:
+    """Carrega todos os usuários (apenas as colunas pedidas)."""
+    client = await obter_cliente()
+    if not client:
+        return []
+    response = await _executar(client.table('usuarios').select(colunas), 'usuarios', 'select', colunas)
+    return response.data or []
+
+
+async def buscar_usuario(id_usuario: int, colunas: str = '*'):
+    """Busca um usuário pelo ID."""
+    client = await obter_cliente()
+    if not client:
+        return None
+    response = await _executar(client.table('usuarios').select(colunas).eq('id', id_usuario), 'usuarios', 'select', colunas)
+    return response.data[0] if response.data else None
+
+
+async def buscar_usuario_por_login(usuario: str, colunas: str = '*'):
+    """Busca um usuário pelo nome de usuário."""
+    client = await obter_cliente()
+    if not client:
+        return None
+    response = await _executar(client.table('usuarios').select(colunas).eq('usuario', usuario), 'usuarios', 'select', colunas)
+    return response.data[0] if response.data else None
+
+
+async def autenticar_usuario(usuario: str, senha_hash: str, colunas: str = 'id,usuario,nome,nivel,time'):
+    """Retorna o registro do usuário ativo com essas credenciais ou None."""
+    client = await obter_cliente()
+    if not client:
+        return None
+    response = await _executar(
+        client.table('usuarios').select(colunas).eq('usuario', usuario).eq('senha', senha_hash).eq('ativo', True),
+        'usuarios', 'select', colunas
+    )
+    return response.data[0] if response.data else None
+
+
+async def inserir_usuario(usuario: dict):
+    """Insere um usuário e retorna o registro criado."""
+    client = await obter_cliente()
+    if not client:
+        return None
+    response = await _executar(client.table('usuarios').insert(usuario), 'usuarios', 'insert')
+    return response.data[0] if response.data else None
+
+
+async def atualizar_usuario(id_usuario: int, dados: dict) -> None:
+    """Atualiza as colunas informadas de um usuário."""
+    client = await obter_cliente()
+    if client:
+        await _executar(client.table('usuarios').update(dados).eq('id', id_usuario), 'usuarios', 'update')
+
+
+async def excluir_usuario(id_usuario: int) -> bool:
+    """Exclui um usuário."""
+    client = await obter_cliente()
+    if not client:
+        return False
+    await _executar(client.table('usuarios').delete().eq('id', id_usuario), 'usuarios', 'delete')
+    return True
+
+
+# ============== SESSÕES ==============
+
+async def criar_sessao(sessao: dict) -> bool:
+    """Grava (upsert) uma sessão de login."""
+    client = await obter_cliente()
+    if not client:
+        return False
+    await _executar(client.table('sessoes').upsert(sessao), 'sessoes', 'upsert')
+    return True
+
+
+async def criar_tabela_sessoes() -> None:
+    """Pede ao banco para criar a tabela de sessões (RPC)."""
+    client = await obter_cliente()
+    if client:
+        await _executar(client.rpc('create_sessoes_table'), 'sessoes', 'rpc')
+
+
+async def buscar_sessao(token: str, colunas: str = 'usuario,senha,expira_em'):
+    """Busca uma sessão pelo token."""
+    client = await obter_cliente()
+    if not client:
+        return None
+    response = await _executar(client.table('sessoes').select(colunas).eq('token', token), 'sessoes', 'select', colunas)
+    return response.data[0] if response.data else None
+
+
+async def remover_sessao(token: str) -> None:
+    """Remove uma sessão pelo token."""
+    client = await obter_cliente()
+    if client:
+        await _executar(client.table('sessoes').delete().eq('token', token), 'sessoes', 'delete')
+
+
+# ============== ESTATÍSTICAS ==============
+
+async def obter_estatisticas() -> dict:
+    """Retorna estatísticas gerais dos projetos."""
+    from utils.data_manager import PERFIS_PROJETO, calcular_estatisticas
+
+    return calcular_estatisticas(await carregar_projetos(PERFIS_PROJETO['dashboard']))
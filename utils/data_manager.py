@@ -4,16 +4,17 @@ Integração com Supabase para persistência na nuvem.
 """
 
 import hashlib
-from datetime import datetime, date
-from typing import Optional
+import os
+from datetime import datetime, date, timedelta
+from typing import TYPE_CHECKING, Optional
 import streamlit as st
+from utils import assets, cache, capacidade, data_async, exportacao, fila_escritas, historico_kpis, historico_projetos, indice_responsaveis, instrumentacao, metricas, times
 
-# Tenta importar supabase, senão usa fallback JSON
-try:
-    from supabase import create_client, Client
-    SUPABASE_AVAILABLE = True
-except ImportError:
-    SUPABASE_AVAILABLE = False
+# O supabase só é importado quando um cliente é criado (ver utils/data_async.py)
+SUPABASE_AVAILABLE = data_async.SUPABASE_AVAILABLE
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 def get_supabase_client() -> Optional['Client']:
@@ -22,6 +23,7 @@ def get_supabase_client() -> Optional['Client']:
         return None
     
     try:
+        from supabase import create_client
         url = st.secrets["supabase"]["url"]
         key = st.secrets["supabase"]["key"]
         return create_client(url, key)
@@ -36,36 +38,384 @@ def usar_supabase() -> bool:
 
 # ============== PROJETOS ==============
 
-def carregar_projetos() -> list:
-    """Carrega todos os projetos."""
-    client = get_supabase_client()
-    if client:
+# Colunas lidas por cada visão. Os textos longos (dificuldades, observações)
+# só trafegam quando a visão precisa deles; o detalhe de um projeto os
+# carrega sob demanda com o perfil 'textos'.
+PERFIS_PROJETO = {
+    'dashboard': 'id,nome,status,data_inicio,data_prazo,data_fim,dias_estimados,metodo_migracao,dificuldades,responsaveis',
+    'resumo': 'id,nome,status,data_inicio,data_prazo,data_fim,dias_estimados,metodo_migracao,backup_recebido,responsaveis',
+    'textos': 'id,dificuldades,observacoes',
+    'ids': 'id',
+    'status': 'id,data_inicio,data_prazo,data_fim',
+    'detalhe': '*'
+}
+
+# Colunas das quais o status é calculado
+CAMPOS_STATUS = ('data_inicio', 'data_prazo', 'data_fim')
+
+# Limite (segundos) de uma consulta de leitura; depois disso ela é cancelada.
+# Quem está na tela espera menos (cache.PRAZO_PADRAO) e recebe o último valor bom.
+PRAZO_LEITURA = 20
+
+
+def _buscar_projetos(perfil: str = 'detalhe', time: str = None) -> list:
+    """Busca os projetos de um time (todos se None) direto no Supabase (sem cache)."""
+    return data_async.executar(data_async.carregar_projetos(PERFIS_PROJETO[perfil], time), timeout=PRAZO_LEITURA)
+
+
+def _projetos_em_cache(perfil: str, time: str) -> list:
+    """Lista de projetos do time no perfil pelo cache (propaga exceções)."""
+    return cache.obter(
+        ('projetos', perfil, time),
+        lambda: _com_escritas_na_fila(_buscar_projetos(perfil, time), perfil, time),
+        escopo=times.escopo_projetos(time)
+    )
+
+
+@instrumentacao.medir('dados')
+def carregar_projetos(perfil: str = 'detalhe', time: str = None) -> list:
+    """
+    Carrega os projetos do time (o da sessão se None) com as colunas do
+    perfil de leitura (cache compartilhado, ver utils/cache.py).
+    """
+    try:
+        return _projetos_em_cache(perfil, time or times.time_atual())
+    except Exception as e:
+        metricas.registrar_erro('carregar_projetos', e)
+        st.error(f"Erro ao carregar projetos: {e}")
+        return []
+
+
+def filtrar_projetos(projetos, busca: str = '', status: str = 'Todos', metodo: str = 'Todos'):
+    """Filtros da lista de projetos (busca por nome/ID, status, método), como gerador."""
+    busca = busca.lower()
+    for p in projetos:
+        if busca and busca not in p['nome'].lower() and busca not in p['id'].lower():
+            continue
+        if status != 'Todos' and status not in p.get('status', ''):
+            continue
+        if metodo != 'Todos' and p.get('metodo_migracao') != metodo:
+            continue
+        yield p
+
+
+def iterar_projetos(colunas: str = '*', tamanho_pagina: int = None, time: str = None):
+    """
+    Gera os projetos de um time (todos se None) direto do banco, página a
+    página em ordem de ID (sem cache). Só uma página fica em memória por
+    vez. Propaga exceções.
+    """
+    tamanho_pagina = tamanho_pagina or exportacao.LINHAS_POR_BLOCO
+    apos = None
+    while True:
+        pagina = data_async.executar(
+            data_async.carregar_pagina_projetos(colunas, apos, tamanho_pagina, time),
+            timeout=PRAZO_LEITURA
+        )
+        if not pagina:
+            return
+        yield from pagina
+        apos = pagina[-1]['id']
+
+
+@instrumentacao.medir('dados')
+def exportar_projetos(formato: str, busca: str = '', status: str = 'Todos', metodo: str = 'Todos', time: str = None):
+    """
+    Exporta os projetos do time que passam nos filtros da lista no formato pedido
+    (ver utils/exportacao.py). Lê o banco em páginas e grava direto num
+    arquivo de download em disco (ver assets.novo_download), sem limite de
+    linhas. Retorna (url do arquivo, quantidade) ou (None, 0) em caso de erro.
+    Escritas ainda na fila local não entram.
+    """
+    caminho, url = assets.novo_download(exportacao.FORMATOS[formato][0])
+    # Só aparece no endereço final quando estiver completo
+    temporario = f"{caminho}.tmp"
+    try:
+        colunas = ','.join(exportacao.COLUNAS_EXPORTACAO)
+        projetos = iterar_projetos(colunas, time=time or times.time_atual())
+        with open(temporario, 'wb') as arquivo:
+            total = exportacao.exportar(filtrar_projetos(projetos, busca, status, metodo), formato, arquivo)
+        os.replace(temporario, caminho)
+        return url, total
+    except Exception as e:
+        metricas.registrar_erro('exportar_projetos', e)
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        st.error(f"Erro ao exportar projetos: {e}")
+        return None, 0
+
+
+@instrumentacao.medir('dados')
+def carregar_textos_projeto(id_projeto: str, time: str = None) -> dict:
+    """Carrega sob demanda as dificuldades e observações de um projeto do time."""
+    try:
+        textos = cache.obter(
+            ('projeto_textos', id_projeto),
+            lambda: data_async.executar(data_async.buscar_projeto(id_projeto, PERFIS_PROJETO['textos']), timeout=PRAZO_LEITURA),
+            escopo=times.escopo_projetos(time or times.time_atual())
+        )
+        return textos or {}
+    except Exception as e:
+        metricas.registrar_erro('carregar_textos_projeto', e)
+        st.error(f"Erro ao carregar notas do projeto: {e}")
+        return {}
+
+
+@instrumentacao.medir('dados')
+def carregar_historico_projeto(id_projeto: str, antes_de: int = None) -> tuple:
+    """
+    Uma página do histórico de alterações do projeto (ver
+    historico_projetos.ler_pagina). Em caso de erro, retorna (None, None).
+    """
+    try:
+        return historico_projetos.ler_pagina(id_projeto, antes_de)
+    except Exception as e:
+        metricas.registrar_erro('carregar_historico_projeto', e)
+        st.error(f"Erro ao carregar histórico do projeto: {e}")
+        return None, None
+
+
+def _remendar_cache(id_projeto: str, linha: Optional[dict], time: str, completa: bool = False) -> None:
+    """
+    Aplica uma linha gravada nas listas de projetos do time em cache, em
+    todos os perfis, sem recarregá-las (linha None = projeto excluído). Uma linha
+    parcial só troca as colunas presentes; uma linha completa que ainda não
+    está na lista entra no topo (mais recente). Estatísticas, carga e
+    figuras são recalculadas da memória na próxima leitura; o índice de
+    responsáveis é atualizado só no projeto alterado.
+    """
+    def aplicar(chave, valor):
+        if not isinstance(chave, tuple) or len(chave) < 2:
+            return valor
+        tipo, perfil = chave[:2]
+        
+        if tipo == 'projeto_textos':
+            if perfil != id_projeto or valor is None:
+                return valor
+            if linha is None:
+                return None
+            textos = {**valor, **{c: linha[c] for c in ('dificuldades', 'observacoes') if c in linha}}
+            return valor if textos == valor else textos
+        
+        if tipo != 'projetos' or perfil not in PERFIS_PROJETO:
+            return valor
+        return _aplicar_linha(valor, perfil, id_projeto, linha, completa)
+    
+    def atualizar_indice(indice):
+        anterior = indice_responsaveis.linha(indice, id_projeto)
+        linhas = _aplicar_linha([anterior] if anterior else [], 'dashboard', id_projeto, linha, completa)
+        return indice_responsaveis.aplicar(indice, id_projeto, linhas[0] if linhas else None)
+    
+    cache.remendar(
+        times.escopo_projetos(time), aplicar,
+        derivados={(CHAVE_INDICE_RESPONSAVEIS, time): atualizar_indice}
+    )
+
+
+def _aplicar_linha(projetos: list, perfil: str, id_projeto: str, linha: Optional[dict], completa: bool = False) -> list:
+    """
+    Retorna a lista com a linha aplicada (nas colunas do perfil), ou a
+    mesma lista se nada mudou. A lista recebida não é alterada.
+    """
+    colunas = PERFIS_PROJETO[perfil]
+    campos = dict(linha or {})
+    if colunas != '*':
+        campos = {c: v for c, v in campos.items() if c in colunas.split(',')}
+    
+    novos, alterou, encontrado = [], False, False
+    for projeto in projetos:
+        if projeto.get('id') != id_projeto:
+            novos.append(projeto)
+            continue
+        encontrado = True
+        if linha is None:
+            alterou = True
+            continue
+        atualizado = {**projeto, **campos}
+        if 'status' in atualizado and any(c in campos for c in CAMPOS_STATUS):
+            atualizado['status'] = calcular_status(atualizado)
+        alterou = alterou or atualizado != projeto
+        novos.append(atualizado if atualizado != projeto else projeto)
+    
+    if not encontrado and linha is not None and completa:
+        novos.insert(0, campos)
+        alterou = True
+    
+    return novos if alterou else projetos
+
+
+def _com_escritas_na_fila(projetos: list, perfil: str, time: str) -> list:
+    """
+    Reaplica sobre uma leitura do banco as escritas do time que ainda estão
+    na fila, para que uma recarga não desfaça na tela o que o editor acabou
+    de salvar.
+    """
+    for escrita in fila_escritas.abertas():
+        if times.time_da_linha(escrita['dados']) != time:
+            continue
+        linha = None if escrita['operacao'] == 'excluir' else {'id': escrita['projeto'], **escrita['dados']}
+        completa = escrita['operacao'] in ('inserir', 'salvar')
+        projetos = _aplicar_linha(projetos, perfil, escrita['projeto'], linha, completa)
+    return projetos
+
+
+def confirmar_escrita(id_projeto: str, time: str = None) -> None:
+    """
+    Relê o projeto em segundo plano e corrige o cache do time se o servidor
+    divergir. Chamada pela fila depois que uma escrita do projeto é concluída.
+    """
+    time = time or times.TIME_PADRAO
+    
+    async def confirmar():
         try:
-            response = client.table('projetos').select('*').order('created_at', desc=True).execute()
-            return response.data or []
+            linha = await data_async.buscar_projeto(id_projeto)
         except Exception as e:
-            st.error(f"Erro ao carregar projetos: {e}")
-            return []
-    return []
+            metricas.registrar_erro('confirmar_escrita', e)
+            # Sem como confirmar: a próxima leitura do time busca tudo de novo
+            cache.invalidar(times.escopo_projetos(time))
+            return
+        # Escritas ainda na fila seriam desfeitas na tela; a última confirma
+        if any(e['projeto'] == id_projeto for e in fila_escritas.abertas()):
+            return
+        _remendar_cache(id_projeto, linha, time, completa=True)
+    
+    data_async.agendar(confirmar())
+
+
+# ============== GRAVAÇÃO (FILA DE ESCRITAS) ==============
+# As funções públicas enfileiram a escrita (utils/fila_escritas.py), aplicam
+# o resultado esperado no cache e retornam na hora. As funções abaixo são as
+# que a fila chama para enviar cada escrita; elas propagam exceções para que
+# a fila repita com backoff, e aplicam no cache a linha devolvida pelo banco.
+# Toda escrita leva em `dados` o time do projeto, que diz qual cache remendar,
+# e entra no histórico de alterações do projeto (utils/historico_projetos.py).
 
+TENTATIVAS_ID_LIVRE = 5  # IDs tentados quando o gerado já foi usado por outra sessão
 
-def salvar_projeto(projeto: dict) -> None:
-    """Salva ou atualiza um projeto."""
-    client = get_supabase_client()
-    if client:
+
+def _enviar_insercao(id_projeto: str, projeto: dict) -> Optional[str]:
+    """
+    Insere o projeto. Se o ID já foi usado por outra sessão (os IDs são
+    gerados no cliente), grava com o próximo ID livre e passa para ele as
+    escritas na fila, o histórico e o cache. Retorna o novo ID nesse caso.
+    """
+    time = times.time_da_linha(projeto)
+    id_original = id_projeto
+    for _ in range(TENTATIVAS_ID_LIVRE):
         try:
-            # Remove campos que não devem ser atualizados
-            dados = {k: v for k, v in projeto.items() if k != 'created_at'}
-            dados['updated_at'] = datetime.now().isoformat()
-            
-            client.table('projetos').upsert(dados).execute()
+            gravado = data_async.executar(data_async.inserir_projeto({**projeto, 'id': id_projeto}))
+            break
         except Exception as e:
-            st.error(f"Erro ao salvar projeto: {e}")
+            if getattr(e, 'code', None) != '23505':
+                raise
+            # Uma tentativa anterior pode ter chegado ao banco sem resposta
+            existente = data_async.executar(data_async.buscar_projeto(id_projeto))
+            if existente and existente.get('nome') == projeto.get('nome'):
+                gravado = existente
+                break
+            id_projeto = _proximo_id(_buscar_projetos('ids') + _insercoes_na_fila())
+    else:
+        raise RuntimeError(f"Não foi possível encontrar um ID livre para o projeto {id_original}")
+    
+    if id_projeto != id_original:
+        fila_escritas.renomear_projeto(id_original, id_projeto)
+        historico_projetos.renomear(id_original, id_projeto)
+        historico_projetos.registrar(id_projeto, 'renomear', {'id': [id_original, id_projeto]})
+        _remendar_cache(id_original, None, time)
+    _remendar_cache(id_projeto, gravado or {**projeto, 'id': id_projeto}, time, completa=True)
+    return id_projeto if id_projeto != id_original else None
+
+
+def _enviar_upsert(id_projeto: str, dados: dict) -> None:
+    gravado = data_async.executar(data_async.salvar_projeto(dados))
+    _remendar_cache(id_projeto, gravado or dados, times.time_da_linha(dados), completa=gravado is not None)
 
 
+def _enviar_atualizacao(id_projeto: str, dados: dict) -> None:
+    # O time só endereça o cache; não faz parte da atualização
+    alteracoes = {c: v for c, v in dados.items() if c != 'time'}
+    if any(c in dados for c in CAMPOS_STATUS):
+        atual = {}
+        if not all(c in dados for c in CAMPOS_STATUS):
+            atual = data_async.executar(data_async.buscar_projeto(id_projeto, PERFIS_PROJETO['status'])) or {}
+        alteracoes['status'] = calcular_status({**atual, **dados})
+    
+    gravado = data_async.executar(data_async.atualizar_projeto(id_projeto, alteracoes))
+    _remendar_cache(id_projeto, gravado or {'id': id_projeto, **alteracoes}, times.time_da_linha(dados))
+
+
+def _enviar_exclusao(id_projeto: str, dados: dict) -> None:
+    data_async.executar(data_async.excluir_projeto(id_projeto))
+    _remendar_cache(id_projeto, None, times.time_da_linha(dados))
+
+
+OPERACOES_FILA = {
+    'inserir': _enviar_insercao,
+    'salvar': _enviar_upsert,
+    'atualizar': _enviar_atualizacao,
+    'excluir': _enviar_exclusao
+}
+
+
+def _registrar_historico(id_projeto: str, operacao: str, campos: dict) -> None:
+    """Acrescenta a escrita ao histórico do projeto, com o usuário logado como autor."""
+    autor = (st.session_state.get('usuario') or {}).get('usuario')
+    historico_projetos.registrar(id_projeto, operacao, campos, autor)
+
+
+def descartar_escritas_com_falha() -> None:
+    """Descarta as escritas que esgotaram as tentativas e volta a ler o banco (só nos times afetados)."""
+    afetados = {times.time_da_linha(e['dados']) for e in fila_escritas.abertas() if e['estado'] == 'falhou'}
+    if fila_escritas.descartar_falhas():
+        for time in afetados:
+            cache.invalidar(times.escopo_projetos(time))
+
+
+@instrumentacao.medir('dados')
+def salvar_projeto(projeto: dict) -> Optional[dict]:
+    """Salva ou atualiza um projeto (via fila). Retorna a linha como ficará."""
+    try:
+        # Remove campos que não devem ser atualizados
+        dados = {k: v for k, v in projeto.items() if k != 'created_at'}
+        dados['id'] = fila_escritas.id_atual(dados['id'])
+        dados['updated_at'] = datetime.now().isoformat()
+        dados.setdefault('time', times.time_atual())
+        
+        instrumentacao.registrar_escrita('projetos', 'upsert', dados)
+        fila_escritas.enfileirar('salvar', dados['id'], dados)
+        _registrar_historico(dados['id'], 'salvar', historico_projetos.diferencas(
+            None, {c: v for c, v in dados.items() if c not in ('id', 'time', 'updated_at')}
+        ))
+        _remendar_cache(dados['id'], dados, dados['time'], completa=True)
+        return dados
+    except Exception as e:
+        metricas.registrar_erro('salvar_projeto', e)
+        st.error(f"Erro ao salvar projeto: {e}")
+    return None
+
+
+def _insercoes_na_fila() -> list:
+    return [{'id': e['projeto']} for e in fila_escritas.abertas() if e['operacao'] == 'inserir']
+
+
+@instrumentacao.medir('dados')
 def gerar_id_projeto() -> str:
     """Gera um ID único para o projeto no formato MIG-YYYY-XXX."""
-    projetos = carregar_projetos()
+    # Lê direto do banco: um cache defasado poderia repetir IDs. Inserções
+    # ainda na fila também contam; sem banco, vale o que está em cache.
+    # Os IDs são únicos entre todos os times, então esta leitura não filtra.
+    # Outra sessão ainda pode gerar o mesmo ID: o envio troca para um livre.
+    try:
+        projetos = _buscar_projetos('ids')
+    except Exception as e:
+        metricas.registrar_erro('gerar_id_projeto', e)
+        st.warning(f"Banco indisponível, gerando ID a partir do cache: {e}")
+        projetos = carregar_projetos('resumo')
+    return _proximo_id(projetos + _insercoes_na_fila())
+
+
+def _proximo_id(projetos: list) -> str:
+    """Próximo ID MIG-YYYY-XXX depois do maior do ano atual entre `projetos`."""
     ano = datetime.now().year
     
     # Encontra o maior número do ano atual
@@ -82,8 +432,18 @@ def gerar_id_projeto() -> str:
     return f"{prefixo}{str(max_num + 1).zfill(3)}"
 
 
-def criar_projeto(dados: dict) -> dict:
-    """Cria um novo projeto."""
+@instrumentacao.medir('dados')
+def criar_projeto(dados: dict, chave: str = None) -> dict:
+    """
+    Cria um novo projeto (no time da sessão, se `dados` não informar).
+    `chave` identifica o envio do formulário (um por submissão, gerado por
+    quem chama): repetir a mesma chave devolve o projeto já criado em vez de
+    criar outro.
+    """
+    anterior = fila_escritas.buscar(chave) if chave else None
+    if anterior:
+        return anterior['dados']
+    
     novo_projeto = {
         'id': gerar_id_projeto(),
         'nome': dados['nome'],
@@ -96,62 +456,109 @@ def criar_projeto(dados: dict) -> dict:
         'dificuldades': dados.get('dificuldades', ''),
         'observacoes': dados.get('observacoes', ''),
         'status': calcular_status(dados),
-        'responsaveis': dados.get('responsaveis', [])
+        'responsaveis': dados.get('responsaveis', []),
+        'time': dados.get('time') or times.time_atual()
     }
     
-    client = get_supabase_client()
-    if client:
-        try:
-            client.table('projetos').insert(novo_projeto).execute()
-        except Exception as e:
-            st.error(f"Erro ao criar projeto: {e}")
+    try:
+        instrumentacao.registrar_escrita('projetos', 'insert', novo_projeto)
+        fila_escritas.enfileirar('inserir', novo_projeto['id'], novo_projeto, chave)
+        _registrar_historico(novo_projeto['id'], 'criar', historico_projetos.diferencas(
+            None, {c: v for c, v in novo_projeto.items() if c not in ('id', 'time') and not _vazio(v)}
+        ))
+        linha = {**novo_projeto, 'created_at': datetime.now().isoformat()}
+        _remendar_cache(novo_projeto['id'], linha, novo_projeto['time'], completa=True)
+    except Exception as e:
+        metricas.registrar_erro('criar_projeto', e)
+        st.error(f"Erro ao criar projeto: {e}")
     
     return novo_projeto
 
 
-def atualizar_projeto(id_projeto: str, dados: dict) -> Optional[dict]:
-    """Atualiza um projeto existente."""
-    client = get_supabase_client()
-    if client:
-        try:
-            # Busca projeto atual
-            response = client.table('projetos').select('*').eq('id', id_projeto).execute()
-            if response.data:
-                projeto = response.data[0]
-                projeto.update(dados)
-                projeto['status'] = calcular_status(projeto)
-                projeto['updated_at'] = datetime.now().isoformat()
-                
-                client.table('projetos').update(projeto).eq('id', id_projeto).execute()
-                return projeto
-        except Exception as e:
-            st.error(f"Erro ao atualizar projeto: {e}")
+def _vazio(valor) -> bool:
+    return valor is None or valor == '' or valor == []
+
+
+def calcular_alteracoes(atual: dict, dados: dict) -> dict:
+    """
+    Campos de `dados` com valor diferente do de `atual` (a versão carregada).
+    Vazios (None, '' e []) são equivalentes entre si.
+    """
+    return {
+        campo: valor for campo, valor in dados.items()
+        if not (_vazio(valor) and _vazio(atual.get(campo))) and valor != atual.get(campo)
+    }
+
+
+@instrumentacao.medir('dados')
+def atualizar_projeto(id_projeto: str, dados: dict, time: str = None, atual: dict = None,
+                      chave: str = None) -> Optional[dict]:
+    """
+    Atualiza só as colunas informadas de um projeto do time (atualização
+    parcial, via fila). Com `atual` (a versão carregada), só as colunas que
+    mudaram são enviadas, e uma gravação sem mudanças nem entra na fila.
+    Se alguma data mudou, o status é recalculado no envio; as datas que não
+    vieram são lidas do banco apenas quando necessário. A alteração entra no
+    histórico do projeto (com os valores anteriores, se `atual` foi dado).
+    `chave` torna a gravação idempotente: repetida, não entra de novo na fila.
+    Retorna os campos como ficarão.
+    """
+    try:
+        # Uma tela aberta antes da troca de ID ainda usa o antigo
+        id_projeto = fila_escritas.id_atual(id_projeto)
+        if atual is not None:
+            dados = calcular_alteracoes(atual, dados)
+        if not dados:
+            instrumentacao.registrar_escrita('projetos', 'update', {})
+            return {'id': id_projeto}
+        
+        time = time or times.time_atual()
+        alteracoes = {**dados, 'updated_at': datetime.now().isoformat()}
+        linha = {'id': id_projeto, **alteracoes}
+        if chave and fila_escritas.buscar(chave):
+            return linha
+        instrumentacao.registrar_escrita('projetos', 'update', alteracoes)
+        fila_escritas.enfileirar('atualizar', id_projeto, {**alteracoes, 'time': time}, chave)
+        
+        campos = dict(dados)
+        if atual is not None and any(c in dados for c in CAMPOS_STATUS):
+            campos['status'] = calcular_status({**atual, **dados})
+        _registrar_historico(id_projeto, 'atualizar', historico_projetos.diferencas(atual, campos))
+        
+        # O status recalculado já vale na tela (a carga do time filtra por ele)
+        _remendar_cache(id_projeto, {**linha, **({'status': campos['status']} if 'status' in campos else {})}, time)
+        return linha
+    except Exception as e:
+        metricas.registrar_erro('atualizar_projeto', e)
+        st.error(f"Erro ao atualizar projeto: {e}")
     
     return None
 
 
-def excluir_projeto(id_projeto: str) -> bool:
-    """Exclui um projeto."""
-    client = get_supabase_client()
-    if client:
-        try:
-            client.table('projetos').delete().eq('id', id_projeto).execute()
-            return True
-        except Exception as e:
-            st.error(f"Erro ao excluir projeto: {e}")
+@instrumentacao.medir('dados')
+def excluir_projeto(id_projeto: str, time: str = None) -> bool:
+    """Exclui um projeto do time (via fila, depois das escritas anteriores dele)."""
+    try:
+        time = time or times.time_atual()
+        id_projeto = fila_escritas.id_atual(id_projeto)
+        fila_escritas.enfileirar('excluir', id_projeto, {'time': time})
+        _registrar_historico(id_projeto, 'excluir', {})
+        _remendar_cache(id_projeto, None, time)
+        return True
+    except Exception as e:
+        metricas.registrar_erro('excluir_projeto', e)
+        st.error(f"Erro ao excluir projeto: {e}")
     return False
 
 
+@instrumentacao.medir('dados')
 def buscar_projeto(id_projeto: str) -> Optional[dict]:
     """Busca um projeto pelo ID."""
-    client = get_supabase_client()
-    if client:
-        try:
-            response = client.table('projetos').select('*').eq('id', id_projeto).execute()
-            if response.data:
-                return response.data[0]
-        except Exception as e:
-            st.error(f"Erro ao buscar projeto: {e}")
+    try:
+        return data_async.executar(data_async.buscar_projeto(id_projeto))
+    except Exception as e:
+        metricas.registrar_erro('buscar_projeto', e)
+        st.error(f"Erro ao buscar projeto: {e}")
     return None
 
 
@@ -211,36 +618,71 @@ def calcular_status(projeto: dict) -> str:
     return 'Em Andamento'
 
 
+# Peso de cada nível de dificuldade na carga do time (um projeto difícil
+# ocupa o time como 1.5 projetos)
+PESOS_DIFICULDADE = {'Tranquila': 1, 'Moderada': 1.2, 'Difícil': 1.5}
+# Limites da carga somada, em múltiplos dos projetos simultâneos que o time
+# comporta (tamanho / pessoas por projeto: 2 no time padrão de 4 pessoas)
+FATOR_CARGA_TRANQUILA = 1    # até aqui: Tranquilo
+FATOR_CARGA_CORRIDA = 1.5    # até aqui: Corrido; acima: Muito Corrido
+# Projetos que ocupam o time: os mesmos na carga atual, na projeção de
+# capacidade e na carga por pessoa (um atrasado continua em andamento)
+STATUS_ATIVOS = ('Não Iniciado', 'Em Andamento', 'Atrasado')
+
+
 def calcular_dificuldade(dias_estimados: int) -> dict:
     """
     Calcula o nível de dificuldade baseado nos dias estimados.
-    Retorna dict com nome e cor.
+    Retorna dict com nome, cor e peso na carga do time.
     """
     if dias_estimados <= 15:
-        return {'nivel': 'Tranquila', 'cor': '#64ffda'}
+        nivel, cor = 'Tranquila', '#64ffda'
     elif dias_estimados <= 24:
-        return {'nivel': 'Moderada', 'cor': '#ffd93d'}
+        nivel, cor = 'Moderada', '#ffd93d'
     else:
-        return {'nivel': 'Difícil', 'cor': '#ff6b6b'}
+        nivel, cor = 'Difícil', '#ff6b6b'
+    return {'nivel': nivel, 'cor': cor, 'peso': PESOS_DIFICULDADE[nivel]}
+
+
+def limites_carga(time: str = None) -> dict:
+    """
+    Limites de carga do time (o da sessão se None), pela configuração dele
+    (utils/times.py): 'tranquila' e 'corrida' para a carga somada do time,
+    'pessoa' para a carga de cada responsável.
+    """
+    config = times.configuracao(time or times.time_atual())
+    simultaneos = config['tamanho'] / config['pessoas_por_projeto']
+    corrida = simultaneos * FATOR_CARGA_CORRIDA
+    return {
+        'tranquila': simultaneos * FATOR_CARGA_TRANQUILA,
+        'corrida': corrida,
+        # O limite Corrido do time dividido entre as pessoas
+        'pessoa': corrida * config['pessoas_por_projeto'] / config['tamanho']
+    }
 
 
-def calcular_carga_time() -> dict:
+@instrumentacao.medir('dados')
+def calcular_carga_time(time: str = None) -> dict:
     """
-    Calcula a carga de trabalho do time.
-    - Time: 4 pessoas
-    - 2 pessoas por projeto
-    - Capacidade: 2 projetos simultâneos
+    Calcula a carga de trabalho do time (o da sessão se None).
+    - Capacidade: tamanho / pessoas por projeto projetos simultâneos
+      (time padrão: 4 pessoas, 2 por projeto, 2 projetos)
     - Projetos difíceis (25+ dias) contam como 1.5 projetos
     
     Retorna dict com status, cor e descrição.
     """
-    projetos = carregar_projetos()
-    
-    # Filtra projetos ativos (Não Iniciados + Em Andamento)
-    projetos_ativos = [
-        p for p in projetos 
-        if p.get('status') in ['Não Iniciado', 'Em Andamento']
-    ]
+    time = time or times.time_atual()
+    projetos = carregar_projetos('dashboard', time)
+    return cache.derivado(
+        ('carga_time', time),
+        times.escopo_projetos(time),
+        lambda: _calcular_carga_time(projetos, limites_carga(time))
+    )
+
+
+def _calcular_carga_time(projetos: list, limites: dict) -> dict:
+    """Calcula a carga do time a partir da lista de projetos e dos limites do time."""
+    projetos_ativos = [p for p in projetos if p.get('status') in STATUS_ATIVOS]
     
     # Calcula peso baseado na dificuldade
     # Projetos difíceis contam como 1.5
@@ -264,8 +706,8 @@ def calcular_carga_time() -> dict:
     qtd_projetos = len(projetos_ativos)
     
     # Define carga baseado no peso total
-    # 2 projetos difíceis = 3 de peso = Corrido
-    if peso_total <= 2:
+    # No time padrão, 2 projetos difíceis = 3 de peso = Corrido
+    if peso_total <= limites['tranquila']:
         return {
             'status': 'Tranquilo',
             'cor': '#64ffda',
@@ -276,7 +718,7 @@ def calcular_carga_time() -> dict:
             'peso_total': round(peso_total, 1),
             'descricao': 'Time com folga para novos projetos'
         }
-    elif peso_total <= 3:
+    elif peso_total <= limites['corrida']:
         return {
             'status': 'Corrido',
             'cor': '#ffd93d',
@@ -300,6 +742,200 @@ def calcular_carga_time() -> dict:
         }
 
 
+# ============== CAPACIDADE ==============
+
+HORIZONTE_CAPACIDADE = 90  # dias projetados a partir de hoje
+
+
+def _data(valor) -> Optional[date]:
+    if isinstance(valor, date):
+        return valor
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        return None
+
+
+def intervalos_de_carga(projetos: list, hoje: date) -> list:
+    """
+    Converte os projetos ativos (STATUS_ATIVOS) em intervalos (inicio, fim,
+    peso). Sem prazo, o fim é estimado por `dias_estimados`; um projeto
+    atrasado continua ocupando o time pelo menos até hoje. Projetos sem data
+    de início ficam de fora.
+    """
+    intervalos = []
+    for p in projetos:
+        inicio = _data(p.get('data_inicio'))
+        if p.get('status') not in STATUS_ATIVOS or inicio is None:
+            continue
+        dias = p.get('dias_estimados') or 30
+        fim = _data(p.get('data_prazo')) or inicio + timedelta(days=dias - 1)
+        intervalos.append((inicio, max(fim, hoje), calcular_dificuldade(dias)['peso']))
+    return intervalos
+
+
+@instrumentacao.medir('dados')
+def calcular_capacidade(horizonte: int = HORIZONTE_CAPACIDADE, time: str = None) -> dict:
+    """
+    Projeta a carga do time dia a dia pelos próximos `horizonte` dias.
+    Recalculada só quando os projetos do time mudam (ou o dia vira).
+    """
+    time = time or times.time_atual()
+    projetos = carregar_projetos('dashboard', time)
+    hoje = date.today()
+    return cache.derivado(
+        ('capacidade', horizonte, hoje, time),
+        times.escopo_projetos(time),
+        lambda: _calcular_capacidade(projetos, hoje, horizonte, limites_carga(time))
+    )
+
+
+def _calcular_capacidade(projetos: list, hoje: date, horizonte: int, limites: dict) -> dict:
+    """
+    Retorna dict com 'inicio', 'fim', 'pontos' (mudanças de carga
+    [(dia, carga)]), 'pico', 'sobrecarga' (janelas acima do limite
+    Corrido), 'limites' e 'sem_datas' (projetos ativos sem data de início).
+    """
+    fim = hoje + timedelta(days=horizonte - 1)
+    pontos = capacidade.curva_de_carga(intervalos_de_carga(projetos, hoje), hoje, fim)
+    
+    return {
+        'inicio': hoje,
+        'fim': fim,
+        'pontos': pontos,
+        'pico': max(carga for _, carga in pontos),
+        'sobrecarga': capacidade.janelas_acima(pontos, fim, limites['corrida']),
+        'limites': {'tranquila': limites['tranquila'], 'corrida': limites['corrida']},
+        'sem_datas': sum(1 for p in projetos if p.get('status') in STATUS_ATIVOS and not p.get('data_inicio'))
+    }
+
+
+# ============== SUGESTÃO DE DATA DE INÍCIO ==============
+
+HORIZONTE_SUGESTAO = 365  # dias à frente em que se procura uma data de início
+# Dias cobertos pela árvore: o horizonte mais o projeto mais longo que o
+# formulário aceita (365 dias), para a janela do último início caber
+DIAS_ARVORE_CARGA = HORIZONTE_SUGESTAO + 365
+
+
+def _arvore_de_carga(time: str) -> tuple:
+    """(hoje, árvore de segmentos da carga diária do time a partir de hoje), por versão dos dados."""
+    projetos = carregar_projetos('dashboard', time)
+    hoje = date.today()
+    
+    def montar():
+        arvore = capacidade.ArvoreCarga(DIAS_ARVORE_CARGA)
+        for inicio, fim, peso in intervalos_de_carga(projetos, hoje):
+            arvore.somar((inicio - hoje).days, (fim - hoje).days, peso)
+        return arvore
+    
+    return hoje, cache.derivado(('arvore_carga', hoje, time), times.escopo_projetos(time), montar)
+
+
+def sugerir_data_inicio(dias_estimados: int, limite: float = None, time: str = None) -> Optional[date]:
+    """
+    Primeira data a partir de hoje em que um novo projeto de
+    `dias_estimados` dias (com o peso da sua dificuldade) cabe sem a carga
+    projetada do time passar de `limite` (o Corrido do time, se None) em
+    nenhum dia. None se não houver nos próximos HORIZONTE_SUGESTAO dias.
+    """
+    time = time or times.time_atual()
+    limite = limites_carga(time)['corrida'] if limite is None else limite
+    hoje, arvore = _arvore_de_carga(time)
+    peso = calcular_dificuldade(dias_estimados)['peso']
+    dia = arvore.primeiro_encaixe(dias_estimados, peso, limite)
+    if dia == -1 or dia > HORIZONTE_SUGESTAO:
+        return None
+    return hoje + timedelta(days=dia)
+
+
+def carga_maxima_no_periodo(inicio: date, dias: int, time: str = None) -> float:
+    """Maior carga projetada do time entre `inicio` e os `dias` seguintes."""
+    hoje, arvore = _arvore_de_carga(time or times.time_atual())
+    primeiro = max((inicio - hoje).days, 0)
+    # Período todo além da árvore: nada projetado ali
+    return max(arvore.maximo(primeiro, primeiro + dias - 1), 0.0)
+
+
+# ============== CARGA POR PESSOA ==============
+
+PROXIMOS_PRAZOS = 3  # prazos listados por pessoa
+CHAVE_INDICE_RESPONSAVEIS = 'indice_responsaveis'
+
+
+def obter_indice_responsaveis(time: str = None) -> dict:
+    """Índice responsável -> projetos do time (utils/indice_responsaveis.py), por versão dos dados."""
+    time = time or times.time_atual()
+    projetos = carregar_projetos('dashboard', time)
+    return cache.derivado(
+        (CHAVE_INDICE_RESPONSAVEIS, time),
+        times.escopo_projetos(time),
+        lambda: indice_responsaveis.construir(projetos)
+    )
+
+
+def carga_da_pessoa(indice: dict, usuario: str, hoje: date, limite: float) -> dict:
+    """
+    Carga de um responsável: projetos ativos, atrasados, peso somado pela
+    dificuldade, próximos prazos [(data, nome)] e se passa de `limite`
+    (o limite por pessoa do time).
+    """
+    ativos = [p for p in indice_responsaveis.projetos_de(indice, usuario) if p.get('status') in STATUS_ATIVOS]
+    carga = sum(calcular_dificuldade(p.get('dias_estimados') or 30)['peso'] for p in ativos)
+    
+    prazos = []
+    for p in ativos:
+        prazo = _data(p.get('data_prazo'))
+        if prazo and prazo >= hoje:
+            prazos.append((prazo, p['nome']))
+    
+    return {
+        'usuario': usuario,
+        'projetos_ativos': len(ativos),
+        'atrasados': sum(1 for p in ativos if p.get('status') == 'Atrasado'),
+        'carga': round(carga, 1),
+        'proximos_prazos': sorted(prazos)[:PROXIMOS_PRAZOS],
+        'sobrecarregado': carga > limite
+    }
+
+
+@instrumentacao.medir('dados')
+def calcular_carga_pessoas(time: str = None) -> list:
+    """Carga de cada responsável nos projetos do time, da maior para a menor."""
+    time = time or times.time_atual()
+    indice = obter_indice_responsaveis(time)
+    hoje = date.today()
+    limite = limites_carga(time)['pessoa']
+    return cache.derivado(
+        ('carga_pessoas', hoje, time),
+        times.escopo_projetos(time),
+        lambda: sorted(
+            (carga_da_pessoa(indice, usuario, hoje, limite) for usuario in indice_responsaveis.pessoas(indice)),
+            key=lambda c: (-c['carga'], c['usuario'])
+        )
+    )
+
+
+def verificar_alocacao(responsaveis: list, dias_estimados: int, time: str = None) -> list:
+    """
+    Responsáveis que passariam do limite por pessoa do time recebendo um
+    novo projeto de `dias_estimados` dias. Cada item traz a carga da pessoa
+    e 'carga_prevista' (com o novo projeto).
+    """
+    time = time or times.time_atual()
+    indice = obter_indice_responsaveis(time)
+    hoje = date.today()
+    peso = calcular_dificuldade(dias_estimados)['peso']
+    limite = limites_carga(time)['pessoa']
+    
+    sobrecarregados = []
+    for usuario in responsaveis:
+        carga = carga_da_pessoa(indice, usuario, hoje, limite)
+        if carga['carga'] + peso > limite:
+            sobrecarregados.append({**carga, 'carga_prevista': round(carga['carga'] + peso, 1)})
+    return sobrecarregados
+
+
 
 # ============== USUÁRIOS ==============
 
@@ -308,137 +944,156 @@ def _hash_senha(senha: str) -> str:
     return hashlib.sha256(senha.encode()).hexdigest()
 
 
-def carregar_usuarios() -> list:
-    """Carrega todos os usuários."""
-    client = get_supabase_client()
-    if client:
-        try:
-            response = client.table('usuarios').select('*').execute()
-            return response.data or []
-        except Exception as e:
-            st.error(f"Erro ao carregar usuários: {e}")
-            return []
-    return []
+# Colunas lidas por cada visão de usuários (o hash da senha nunca é listado)
+PERFIS_USUARIO = {
+    'lista': 'id,usuario,nome,nivel,ativo,time',
+    'diretorio_editores': 'usuario,nivel,time'
+}
+
+
+def _buscar_usuarios(perfil: str = 'lista') -> list:
+    """Busca todos os usuários direto no Supabase (sem cache)."""
+    return data_async.executar(data_async.carregar_usuarios(PERFIS_USUARIO[perfil]), timeout=PRAZO_LEITURA)
+
+
+@instrumentacao.medir('dados')
+def carregar_usuarios(perfil: str = 'lista') -> list:
+    """
+    Carrega todos os usuários com as colunas do perfil de leitura
+    (cache compartilhado, ver utils/cache.py).
+    """
+    try:
+        return cache.obter(('usuarios', perfil), lambda: _buscar_usuarios(perfil), escopo='usuarios')
+    except Exception as e:
+        metricas.registrar_erro('carregar_usuarios', e)
+        st.error(f"Erro ao carregar usuários: {e}")
+        return []
 
 
+@instrumentacao.medir('dados')
 def autenticar_usuario(usuario: str, senha: str) -> Optional[dict]:
     """Autentica um usuário e retorna seus dados se válido."""
-    client = get_supabase_client()
-    
-    if not client:
-        return None
-    
     try:
         senha_hash = _hash_senha(senha)
-        response = client.table('usuarios').select('*').eq('usuario', usuario).eq('senha', senha_hash).eq('ativo', True).execute()
+        u = data_async.executar(data_async.autenticar_usuario(usuario, senha_hash))
         
-        if response.data:
-            u = response.data[0]
+        if u:
             return {
                 'id': u['id'],
                 'usuario': u['usuario'],
                 'nome': u['nome'],
-                'nivel': u['nivel']
+                'nivel': u['nivel'],
+                'time': times.time_da_linha(u)
             }
-    except Exception:
-        pass
+    except Exception as e:
+        metricas.registrar_erro('autenticar_usuario', e)
     
     return None
 
 
+@instrumentacao.medir('dados')
 def criar_usuario(dados: dict) -> Optional[dict]:
     """Cria um novo usuário."""
-    client = get_supabase_client()
-    if client:
-        try:
-            # Verifica se usuário já existe
-            response = client.table('usuarios').select('id').eq('usuario', dados['usuario']).execute()
-            if response.data:
-                return None  # Usuário já existe
-            
-            novo_usuario = {
-                'usuario': dados['usuario'],
-                'senha': _hash_senha(dados['senha']),
-                'nome': dados['nome'],
-                'nivel': dados.get('nivel', 1),
-                'ativo': True
-            }
-            
-            response = client.table('usuarios').insert(novo_usuario).execute()
-            if response.data:
-                return response.data[0]
-        except Exception as e:
-            st.error(f"Erro ao criar usuário: {e}")
+    try:
+        # Verifica se usuário já existe
+        if data_async.executar(data_async.buscar_usuario_por_login(dados['usuario'], 'id')):
+            return None  # Usuário já existe
+        
+        novo_usuario = {
+            'usuario': dados['usuario'],
+            'senha': _hash_senha(dados['senha']),
+            'nome': dados['nome'],
+            'nivel': dados.get('nivel', 1),
+            'time': dados.get('time') or times.TIME_PADRAO,
+            'ativo': True
+        }
+        
+        criado = data_async.executar(data_async.inserir_usuario(novo_usuario))
+        cache.invalidar('usuarios')
+        return criado
+    except Exception as e:
+        metricas.registrar_erro('criar_usuario', e)
+        st.error(f"Erro ao criar usuário: {e}")
     
     return None
 
 
-def atualizar_usuario(id_usuario: int, dados: dict) -> Optional[dict]:
-    """Atualiza um usuário existente."""
-    client = get_supabase_client()
-    if client:
-        try:
-            # Busca usuário atual
-            response = client.table('usuarios').select('*').eq('id', id_usuario).execute()
-            if response.data:
-                usuario = response.data[0]
-                
-                # Não permite alterar o nome de usuário 'luis.silva'
-                if usuario['usuario'] == 'luis.silva' and dados.get('usuario') != 'luis.silva':
-                    return None
-                
-                usuario['nome'] = dados.get('nome', usuario['nome'])
-                usuario['nivel'] = dados.get('nivel', usuario['nivel'])
-                usuario['ativo'] = dados.get('ativo', usuario['ativo'])
-                
-                # Se senha foi fornecida, atualiza
-                if dados.get('senha'):
-                    usuario['senha'] = _hash_senha(dados['senha'])
-                
-                client.table('usuarios').update(usuario).eq('id', id_usuario).execute()
-                return usuario
-        except Exception as e:
-            st.error(f"Erro ao atualizar usuário: {e}")
+@instrumentacao.medir('dados')
+def atualizar_usuario(id_usuario: int, dados: dict, atual: dict = None) -> Optional[dict]:
+    """
+    Atualiza um usuário existente, enviando só os campos que mudaram em
+    relação a `atual` (a versão carregada; lida do banco se None). Sem
+    mudanças, nada é enviado.
+    """
+    try:
+        # Busca usuário atual
+        usuario = atual or data_async.executar(data_async.buscar_usuario(id_usuario, PERFIS_USUARIO['lista']))
+        if usuario:
+            # Não permite alterar o nome de usuário 'luis.silva'
+            if usuario['usuario'] == 'luis.silva' and dados.get('usuario') != 'luis.silva':
+                return None
+            
+            alteracoes = calcular_alteracoes(usuario, {c: dados[c] for c in ('nome', 'nivel', 'ativo', 'time') if c in dados})
+            
+            # Se senha foi fornecida, atualiza
+            if dados.get('senha'):
+                alteracoes['senha'] = _hash_senha(dados['senha'])
+            
+            instrumentacao.registrar_escrita('usuarios', 'update', alteracoes)
+            if not alteracoes:
+                return dict(usuario)
+            
+            data_async.executar(data_async.atualizar_usuario(id_usuario, alteracoes))
+            cache.invalidar('usuarios')
+            return {**usuario, **{c: v for c, v in alteracoes.items() if c != 'senha'}}
+    except Exception as e:
+        metricas.registrar_erro('atualizar_usuario', e)
+        st.error(f"Erro ao atualizar usuário: {e}")
     
     return None
 
 
+@instrumentacao.medir('dados')
 def excluir_usuario(id_usuario: int) -> bool:
     """Exclui um usuário (não permite excluir admin luis.silva)."""
-    client = get_supabase_client()
-    if client:
-        try:
-            # Verifica se é o admin principal
-            response = client.table('usuarios').select('usuario').eq('id', id_usuario).execute()
-            if response.data and response.data[0]['usuario'] == 'luis.silva':
-                return False  # Não pode excluir admin principal
-            
-            client.table('usuarios').delete().eq('id', id_usuario).execute()
+    try:
+        # Verifica se é o admin principal
+        usuario = data_async.executar(data_async.buscar_usuario(id_usuario, 'usuario'))
+        if usuario and usuario['usuario'] == 'luis.silva':
+            return False  # Não pode excluir admin principal
+        
+        if data_async.executar(data_async.excluir_usuario(id_usuario)):
+            cache.invalidar('usuarios')
             return True
-        except Exception as e:
-            st.error(f"Erro ao excluir usuário: {e}")
+    except Exception as e:
+        metricas.registrar_erro('excluir_usuario', e)
+        st.error(f"Erro ao excluir usuário: {e}")
     return False
 
 
+@instrumentacao.medir('dados')
 def buscar_usuario(id_usuario: int) -> Optional[dict]:
     """Busca um usuário pelo ID."""
-    client = get_supabase_client()
-    if client:
-        try:
-            response = client.table('usuarios').select('*').eq('id', id_usuario).execute()
-            if response.data:
-                return response.data[0]
-        except Exception as e:
-            st.error(f"Erro ao buscar usuário: {e}")
+    try:
+        return data_async.executar(data_async.buscar_usuario(id_usuario))
+    except Exception as e:
+        metricas.registrar_erro('buscar_usuario', e)
+        st.error(f"Erro ao buscar usuário: {e}")
     return None
 
 
 # ============== ESTATÍSTICAS ==============
 
-def obter_estatisticas() -> dict:
-    """Retorna estatísticas gerais dos projetos."""
-    projetos = carregar_projetos()
-    
+@instrumentacao.medir('dados')
+def obter_estatisticas(time: str = None) -> dict:
+    """Retorna estatísticas gerais dos projetos do time."""
+    time = time or times.time_atual()
+    projetos = carregar_projetos('dashboard', time)
+    return cache.derivado(('estatisticas', time), times.escopo_projetos(time), lambda: calcular_estatisticas(projetos))
+
+
+def calcular_estatisticas(projetos: list) -> dict:
+    """Calcula as estatísticas a partir da lista de projetos."""
     total = len(projetos)
     concluidos = len([p for p in projetos if 'Concluído' in p.get('status', '')])
     atrasados = len([p for p in projetos if p.get('status') == 'Atrasado'])
@@ -500,3 +1155,94 @@ def obter_estatisticas() -> dict:
         'dificuldades': dict(sorted(dificuldades.items(), key=lambda x: x[1], reverse=True)[:5])
     }
 
+
+# ============== DADOS DESATUALIZADOS ==============
+
+def _formatar_idade(segundos: float) -> str:
+    if segundos < 60:
+        return f"{segundos:.0f} s"
+    if segundos < 3600:
+        return f"{segundos / 60:.0f} min"
+    return f"{segundos / 3600:.1f} h"
+
+
+def aviso_dados_desatualizados(tipo: str, perfil: str, time: str = None) -> Optional[str]:
+    """
+    Mensagem para a interface quando a leitura de `tipo` ('projetos' ou
+    'usuarios') no perfil devolveu o último valor bom por falha do backend.
+    Projetos são os do time (o da sessão se None). Retorna None se os dados
+    estão em dia.
+    """
+    chave = ('projetos', perfil, time or times.time_atual()) if tipo == 'projetos' else (tipo, perfil)
+    situacao = cache.situacao(chave)
+    if not situacao['desatualizado']:
+        return None
+
+    disjuntor = data_async.estado_disjuntor()
+    if disjuntor['aberto']:
+        motivo = f"backend em pausa após falhas seguidas, nova tentativa em {disjuntor['reabre_em']:.0f} s"
+    else:
+        motivo = situacao['erro']
+    return f"Mostrando dados de {_formatar_idade(situacao['idade'])} atrás: não foi possível atualizar ({motivo})."
+
+
+# ============== DASHBOARD ==============
+
+@instrumentacao.medir('dados')
+def carregar_dados_dashboard(time: str = None) -> dict:
+    """
+    Busca os dados do dashboard do time (o da sessão se None) e retorna um
+    pacote consolidado.
+
+    A única leitura do backend é a lista de projetos (pelo cache, com o
+    prazo dele); carga do time e estatísticas são derivadas dos projetos em
+    memória. O dashboard não exibe usuários, então eles não são lidos aqui.
+    Na primeira carga do dia, grava a foto diária dos KPIs.
+    Retorna dict com 'projetos', 'estatisticas', 'carga' e 'erros'.
+    """
+    time = time or times.time_atual()
+    erros = {}
+    try:
+        projetos = _projetos_em_cache('dashboard', time)
+    except Exception as e:
+        metricas.registrar_erro('carregar_dados_dashboard', e)
+        erros['projetos'] = str(e)
+        projetos = None
+    
+    estatisticas = obter_estatisticas(time) if projetos is not None else None
+    carga = calcular_carga_time(time) if projetos is not None else None
+    
+    # Só fotografa dados em dia (não o último valor bom de um backend fora do ar)
+    if projetos is not None and not cache.situacao(('projetos', 'dashboard', time))['desatualizado']:
+        registrar_kpis_do_dia(estatisticas, carga, time)
+    
+    return {
+        'projetos': projetos,
+        'estatisticas': estatisticas,
+        'carga': carga,
+        'erros': erros
+    }
+
+
+# ============== HISTÓRICO DE KPIs ==============
+
+def registrar_kpis_do_dia(estatisticas: dict, carga: dict, time: str) -> None:
+    """Grava a foto de hoje do time no histórico de KPIs, se ainda não houver."""
+    hoje = date.today()
+    try:
+        if not historico_kpis.registrado(time, hoje):
+            historico_kpis.registrar(time, hoje, historico_kpis.montar_linha(estatisticas, carga))
+    except Exception as e:
+        metricas.registrar_erro('registrar_kpis_do_dia', e)
+        st.warning(f"Não foi possível gravar o histórico de KPIs: {e}")
+
+
+def carregar_tendencias(dias: int, time: str = None) -> list:
+    """Fotos diárias de KPIs do time nos últimos `dias` dias (inclusive hoje), em ordem de data."""
+    fim = date.today()
+    try:
+        return historico_kpis.ler_intervalo(time or times.time_atual(), fim - timedelta(days=dias - 1), fim)
+    except Exception as e:
+        metricas.registrar_erro('carregar_tendencias', e)
+        st.error(f"Erro ao carregar histórico de KPIs: {e}")
+        return []
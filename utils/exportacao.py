@@ -0,0 +1,139 @@
+"""
+Exportação de projetos em fluxo: CSV, JSON Lines e Parquet.
+
+Os escritores recebem um iterável de projetos (normalmente o gerador
+paginado de `data_manager.iterar_projetos`, já filtrado) e gravam num
+arquivo binário bloco a bloco, com LINHAS_POR_BLOCO linhas por vez.
+Nenhum deles guarda a lista inteira: a memória usada é a de um bloco,
+seja qual for o total exportado. O arquivo pronto fica em disco e é
+servido de lá (ver `assets.novo_download`), então não há limite de linhas.
+
+CSV e JSON Lines usam só a biblioteca padrão; Parquet precisa do pyarrow
+e só é oferecido quando ele está instalado (um row group por bloco). O
+pyarrow (e o numpy que ele traz) só é importado ao gerar um Parquet.
+"""
+
+import codecs
+import csv
+import importlib.util
+import io
+import json
+from datetime import date
+from itertools import islice
+
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+
+LINHAS_POR_BLOCO = 1000
+
+# Colunas exportadas, na ordem do arquivo
+COLUNAS_EXPORTACAO = (
+    'id', 'nome', 'status', 'data_inicio', 'data_prazo', 'data_fim',
+    'dias_estimados', 'metodo_migracao', 'backup_recebido', 'responsaveis',
+    'dificuldades', 'observacoes', 'created_at', 'updated_at'
+)
+COLUNAS_DATA = ('data_inicio', 'data_prazo', 'data_fim')
+
+# Formato -> (extensão, MIME)
+FORMATOS = {
+    'CSV': ('csv', 'text/csv'),
+    'JSON Lines': ('jsonl', 'application/x-ndjson'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet')
+}
+
+
+def formatos_disponiveis() -> list:
+    """Formatos que podem ser gerados neste ambiente."""
+    return [f for f in FORMATOS if f != 'Parquet' or PYARROW_AVAILABLE]
+
+
+def _em_blocos(projetos, tamanho: int = LINHAS_POR_BLOCO):
+    iterador = iter(projetos)
+    while True:
+        bloco = list(islice(iterador, tamanho))
+        if not bloco:
+            return
+        yield bloco
+
+
+def escrever_csv(projetos, destino) -> int:
+    """CSV em UTF-8 com BOM (abre com acentos no Excel); responsáveis separados por vírgula."""
+    texto = codecs.getwriter('utf-8')(destino)
+    destino.write(codecs.BOM_UTF8)
+    escritor = csv.writer(texto)
+    escritor.writerow(COLUNAS_EXPORTACAO)
+
+    total = 0
+    for bloco in _em_blocos(projetos):
+        for p in bloco:
+            linha = [p.get(c) for c in COLUNAS_EXPORTACAO]
+            linha[COLUNAS_EXPORTACAO.index('responsaveis')] = ', '.join(p.get('responsaveis') or [])
+            escritor.writerow(['' if v is None else v for v in linha])
+        total += len(bloco)
+    return total
+
+
+def escrever_jsonl(projetos, destino) -> int:
+    """Um objeto JSON por linha, com as colunas de COLUNAS_EXPORTACAO."""
+    total = 0
+    for bloco in _em_blocos(projetos):
+        texto = ''.join(
+            json.dumps({c: p.get(c) for c in COLUNAS_EXPORTACAO}, ensure_ascii=False, default=str) + '\n'
+            for p in bloco
+        )
+        destino.write(texto.encode('utf-8'))
+        total += len(bloco)
+    return total
+
+
+def _esquema_parquet():
+    import pyarrow as pa
+
+    tipos = {
+        'dias_estimados': pa.int32(),
+        'backup_recebido': pa.bool_(),
+        'responsaveis': pa.list_(pa.string()),
+        **{c: pa.date32() for c in COLUNAS_DATA}
+    }
+    return pa.schema([(c, tipos.get(c, pa.string())) for c in COLUNAS_EXPORTACAO])
+
+
+def _para_data(valor):
+    if not valor or isinstance(valor, date):
+        return valor or None
+    try:
+        return date.fromisoformat(str(valor)[:10])
+    except ValueError:
+        return None
+
+
+def escrever_parquet(projetos, destino) -> int:
+    """Parquet com esquema fixo (datas como date32), um row group por bloco."""
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Exportação em Parquet requer o pacote pyarrow")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    esquema = _esquema_parquet()
+    total = 0
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for bloco in _em_blocos(projetos):
+            linhas = [
+                {c: (_para_data(p.get(c)) if c in COLUNAS_DATA else p.get(c)) for c in COLUNAS_EXPORTACAO}
+                for p in bloco
+            ]
+            escritor.write_table(pa.Table.from_pylist(linhas, schema=esquema))
+            total += len(bloco)
+    return total
+
+
+ESCRITORES = {
+    'CSV': escrever_csv,
+    'JSON Lines': escrever_jsonl,
+    'Parquet': escrever_parquet
+}
+
+
+def exportar(projetos, formato: str, destino: io.IOBase) -> int:
+    """Grava os projetos no formato pedido em `destino` (binário). Retorna quantos foram gravados."""
+    return ESCRITORES[formato](projetos, destino)
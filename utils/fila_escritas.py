@@ -0,0 +1,279 @@
+"""
+Fila durável de escritas de projetos (SQLite local).
+
+As escritas de projetos (inserir, salvar, atualizar, excluir) não esperam o
+Supabase: são gravadas em `ARQUIVO_FILA` e devolvidas na hora para a
+interface, que já mostra o resultado pelo cache. Uma thread em segundo
+plano envia a fila ao backend:
+
+- cada escrita tem uma chave de idempotência (por padrão, derivada da
+  operação e do conteúdo); reenfileirar a mesma chave não duplica nada, e
+  uma inserção repetida que já tinha chegado ao banco é reconhecida como
+  concluída;
+- se o ID de uma inserção já foi usado por outra sessão, a inserção é
+  gravada com um novo ID e as escritas seguintes do projeto passam a usá-lo
+  (`renomear_projeto`);
+- as escritas de um mesmo projeto são enviadas em ordem: a próxima só sai
+  depois que a anterior for concluída (ou descartada);
+- falhas são repetidas com espera exponencial (BACKOFF_INICIAL dobrando até
+  BACKOFF_MAXIMO); depois de MAX_TENTATIVAS a escrita fica como falha até
+  alguém pedir nova tentativa ou descartá-la.
+
+Como o arquivo sobrevive a reinícios, o que ficou pendente é reenviado
+assim que o app volta.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import hashlib
+import time
+from contextlib import contextmanager
+
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_FILA = os.path.join(RAIZ_PROJETO, 'dados_locais', 'fila_escritas.sqlite3')
+
+BACKOFF_INICIAL = 1     # segundos
+BACKOFF_MAXIMO = 300    # segundos
+MAX_TENTATIVAS = 8
+RETENCAO_CONCLUIDAS = 24 * 3600  # chaves concluídas guardadas para idempotência
+AVISO_RENOMEACAO = 600  # segundos em que um projeto renomeado aparece no aviso da sidebar
+
+_lock = threading.RLock()
+_acordar = threading.Condition(_lock)
+_trabalhador = None
+_abertas = []           # espelho em memória das escritas pendentes/falhas, em ordem
+_renomeados = {}        # ID antigo -> (ID novo, quando) dos projetos regravados com outro ID
+
+
+# ============== ARMAZENAMENTO ==============
+
+@contextmanager
+def _transacao():
+    """Conexão com commit ao final (rollback em erro), sempre fechada."""
+    conexao = _conectar()
+    try:
+        with conexao:
+            yield conexao
+    finally:
+        conexao.close()
+
+
+def _conectar() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(ARQUIVO_FILA), exist_ok=True)
+    conexao = sqlite3.connect(ARQUIVO_FILA, timeout=30)
+    conexao.row_factory = sqlite3.Row
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("""
+        CREATE TABLE IF NOT EXISTS escritas (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            chave TEXT UNIQUE NOT NULL,
+            projeto TEXT NOT NULL,
+            operacao TEXT NOT NULL,
+            dados TEXT NOT NULL,
+            estado TEXT NOT NULL DEFAULT 'pendente',
+            tentativas INTEGER NOT NULL DEFAULT 0,
+            proxima_tentativa REAL NOT NULL DEFAULT 0,
+            erro TEXT,
+            criado_em REAL NOT NULL,
+            concluido_em REAL
+        )
+    """)
+    return conexao
+
+
+def _atualizar_espelho(conexao: sqlite3.Connection) -> None:
+    global _abertas
+    linhas = conexao.execute(
+        "SELECT * FROM escritas WHERE estado IN ('pendente', 'falhou') ORDER BY seq"
+    ).fetchall()
+    _abertas = [
+        {**dict(l), 'dados': json.loads(l['dados'])}
+        for l in linhas
+    ]
+
+
+# ============== API ==============
+
+def chave_padrao(operacao: str, id_projeto: str, dados: dict) -> str:
+    """Chave de idempotência derivada da operação e do conteúdo da escrita."""
+    conteudo = json.dumps([operacao, id_projeto, dados], sort_keys=True, default=str)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def enfileirar(operacao: str, id_projeto: str, dados: dict, chave: str = None) -> str:
+    """
+    Grava uma escrita na fila e retorna sua chave de idempotência.
+    Uma chave já conhecida (pendente ou concluída) é ignorada. Sem `chave`,
+    vale a derivada do conteúdo: a mesma escrita enviada duas vezes entra
+    uma vez só.
+    """
+    with _lock:
+        id_projeto = id_atual(id_projeto)
+        if 'id' in dados:
+            dados = {**dados, 'id': id_projeto}
+        chave = chave or chave_padrao(operacao, id_projeto, dados)
+        with _transacao() as conexao:
+            conexao.execute(
+                "INSERT OR IGNORE INTO escritas (chave, projeto, operacao, dados, criado_em) VALUES (?, ?, ?, ?, ?)",
+                (chave, id_projeto, operacao, json.dumps(dados, default=str), time.time())
+            )
+            _atualizar_espelho(conexao)
+        _garantir_trabalhador()
+        _acordar.notify_all()
+    return chave
+
+
+def buscar(chave: str):
+    """A escrita com a chave (pendente, falha ou concluída), ou None."""
+    with _transacao() as conexao:
+        linha = conexao.execute("SELECT * FROM escritas WHERE chave = ?", (chave,)).fetchone()
+    return {**dict(linha), 'dados': json.loads(linha['dados'])} if linha else None
+
+
+def renomear_projeto(antigo: str, novo: str) -> None:
+    """
+    Passa para o ID `novo` as escritas abertas do projeto `antigo` (inclusive
+    a inserção) e as que ainda forem enfileiradas com o ID antigo.
+    """
+    with _lock:
+        _renomeados[antigo] = (novo, time.time())
+        with _transacao() as conexao:
+            for linha in conexao.execute(
+                "SELECT chave, dados FROM escritas WHERE projeto = ? AND estado IN ('pendente', 'falhou')", (antigo,)
+            ).fetchall():
+                dados = json.loads(linha['dados'])
+                if 'id' in dados:
+                    dados['id'] = novo
+                conexao.execute(
+                    "UPDATE escritas SET projeto = ?, dados = ? WHERE chave = ?",
+                    (novo, json.dumps(dados, default=str), linha['chave'])
+                )
+            _atualizar_espelho(conexao)
+        _acordar.notify_all()
+
+
+def id_atual(id_projeto: str) -> str:
+    """O ID com que o projeto foi gravado (o próprio, se não precisou trocar)."""
+    with _lock:
+        return _renomeados.get(id_projeto, (id_projeto,))[0]
+
+
+def renomeados_recentes() -> list:
+    """[(ID antigo, ID novo)] dos projetos regravados com outro ID nos últimos AVISO_RENOMEACAO segundos."""
+    limite = time.time() - AVISO_RENOMEACAO
+    with _lock:
+        return [(antigo, novo) for antigo, (novo, em) in _renomeados.items() if em >= limite]
+
+
+def abertas() -> list:
+    """Escritas pendentes e falhas, na ordem em que foram feitas."""
+    with _lock:
+        _garantir_trabalhador()
+        return list(_abertas)
+
+
+def contagens() -> dict:
+    """{'pendentes': n, 'falhas': n} das escritas ainda não concluídas."""
+    itens = abertas()
+    falhas = sum(1 for e in itens if e['estado'] == 'falhou')
+    return {'pendentes': len(itens) - falhas, 'falhas': falhas}
+
+
+def tentar_novamente() -> None:
+    """Devolve as escritas com falha para a fila, zerando as tentativas."""
+    with _lock:
+        with _transacao() as conexao:
+            conexao.execute(
+                "UPDATE escritas SET estado = 'pendente', tentativas = 0, proxima_tentativa = 0 WHERE estado = 'falhou'"
+            )
+            _atualizar_espelho(conexao)
+        _acordar.notify_all()
+
+
+def descartar_falhas() -> list:
+    """Remove as escritas com falha e retorna os projetos afetados."""
+    with _lock:
+        with _transacao() as conexao:
+            projetos = [l['projeto'] for l in conexao.execute("SELECT DISTINCT projeto FROM escritas WHERE estado = 'falhou'")]
+            conexao.execute("DELETE FROM escritas WHERE estado = 'falhou'")
+            _atualizar_espelho(conexao)
+        _acordar.notify_all()
+    return projetos
+
+
+# ============== ENVIO ==============
+
+def _garantir_trabalhador() -> None:
+    """Sobe a thread de envio (uma por processo); na primeira vez, carrega o espelho."""
+    global _trabalhador
+    if _trabalhador is not None and _trabalhador.is_alive():
+        return
+    with _transacao() as conexao:
+        _atualizar_espelho(conexao)
+    _trabalhador = threading.Thread(target=_enviar_para_sempre, name='fila-escritas', daemon=True)
+    _trabalhador.start()
+
+
+def _proximas(agora: float):
+    """Primeira escrita aberta de cada projeto; separa as que já podem sair."""
+    primeiras, vistos = [], set()
+    for escrita in _abertas:
+        if escrita['projeto'] in vistos:
+            continue
+        vistos.add(escrita['projeto'])
+        primeiras.append(escrita)
+
+    prontas = [e for e in primeiras if e['estado'] == 'pendente' and e['proxima_tentativa'] <= agora]
+    esperas = [e['proxima_tentativa'] for e in primeiras if e['estado'] == 'pendente' and e['proxima_tentativa'] > agora]
+    return prontas, (min(esperas) - agora if esperas else None)
+
+
+def _enviar_para_sempre() -> None:
+    while True:
+        with _lock:
+            prontas, espera = _proximas(time.time())
+            if not prontas:
+                _acordar.wait(espera)
+                continue
+
+        for escrita in prontas:
+            _enviar(escrita)
+
+
+def _enviar(escrita: dict) -> None:
+    """Aplica uma escrita no backend e registra o resultado na fila."""
+    from utils.data_manager import OPERACOES_FILA, confirmar_escrita
+
+    try:
+        # A inserção devolve o ID com que o projeto foi gravado, se precisou trocar
+        id_projeto = OPERACOES_FILA[escrita['operacao']](escrita['projeto'], escrita['dados']) or escrita['projeto']
+    except Exception as e:
+        tentativas = escrita['tentativas'] + 1
+        estado = 'falhou' if tentativas >= MAX_TENTATIVAS else 'pendente'
+        espera = min(BACKOFF_MAXIMO, BACKOFF_INICIAL * 2 ** (tentativas - 1))
+        with _lock:
+            with _transacao() as conexao:
+                conexao.execute(
+                    "UPDATE escritas SET estado = ?, tentativas = ?, proxima_tentativa = ?, erro = ? WHERE chave = ?",
+                    (estado, tentativas, time.time() + espera, str(e), escrita['chave'])
+                )
+                _atualizar_espelho(conexao)
+        return
+
+    with _lock:
+        with _transacao() as conexao:
+            agora = time.time()
+            conexao.execute(
+                "UPDATE escritas SET estado = 'concluida', concluido_em = ?, erro = NULL WHERE chave = ?",
+                (agora, escrita['chave'])
+            )
+            conexao.execute(
+                "DELETE FROM escritas WHERE estado = 'concluida' AND concluido_em < ?",
+                (agora - RETENCAO_CONCLUIDAS,)
+            )
+            _atualizar_espelho(conexao)
+
+    confirmar_escrita(id_projeto, escrita['dados'].get('time'))
@@ -0,0 +1,148 @@
+"""
+Histórico diário de KPIs do dashboard (SQLite local).
+
+O dashboard só sabe o "agora"; o status de cada dia não fica guardado nos
+projetos. Este módulo grava, uma vez por dia e por time, uma foto dos
+indicadores: contagens por status, peso da carga do time, média de dias,
+eficiência e quantidade de projetos por método de migração.
+
+Cada dia de um time é uma linha de largura fixa (uma coluna por indicador)
+numa tabela ordenada por time e data (`WITHOUT ROWID`, chave = time, dia).
+Ler um intervalo é uma varredura contígua da chave: custa O(dias) e não
+depende da quantidade de projetos nem de times.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+from utils.times import TIME_PADRAO
+
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_HISTORICO = os.path.join(RAIZ_PROJETO, 'dados_locais', 'kpis_diarios.sqlite3')
+
+# Métodos com coluna própria; os demais somam em 'metodo_outros'
+COLUNAS_METODO = {
+    'Script': 'metodo_script',
+    'Manual': 'metodo_manual',
+    'Manual + Script': 'metodo_manual_script'
+}
+
+# Colunas gravadas por dia (além de 'dia'), na ordem da tabela, com o tipo
+COLUNAS_KPI = {
+    'total': 'INTEGER',
+    'concluidos': 'INTEGER',
+    'em_andamento': 'INTEGER',
+    'atrasados': 'INTEGER',
+    'nao_iniciados': 'INTEGER',
+    'peso_carga': 'REAL',
+    'media_dias': 'REAL',
+    'eficiencia': 'REAL',
+    **{coluna: 'INTEGER' for coluna in COLUNAS_METODO.values()},
+    'metodo_outros': 'INTEGER'
+}
+
+_lock = threading.Lock()
+_dias_gravados = set()   # (time, dia) já confirmados no arquivo (evita abrir o banco a cada rerun)
+
+
+@contextmanager
+def _transacao():
+    """Conexão com commit ao final (rollback em erro), sempre fechada."""
+    conexao = _conectar()
+    try:
+        with conexao:
+            yield conexao
+    finally:
+        conexao.close()
+
+
+def _conectar() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(ARQUIVO_HISTORICO), exist_ok=True)
+    conexao = sqlite3.connect(ARQUIVO_HISTORICO, timeout=30)
+    conexao.row_factory = sqlite3.Row
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute(f"""
+        CREATE TABLE IF NOT EXISTS kpis_por_time (
+            time TEXT NOT NULL,
+            dia TEXT NOT NULL,
+            {', '.join(f'{c} {tipo} NOT NULL' for c, tipo in COLUNAS_KPI.items())},
+            PRIMARY KEY (time, dia)
+        ) WITHOUT ROWID
+    """)
+    _migrar_tabela_sem_time(conexao)
+    return conexao
+
+
+def _migrar_tabela_sem_time(conexao: sqlite3.Connection) -> None:
+    """Move o histórico de antes dos times (tabela `kpis_diarios`) para o time padrão."""
+    existe = conexao.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'kpis_diarios'").fetchone()
+    if not existe:
+        return
+    with conexao:
+        conexao.execute(
+            f"INSERT OR IGNORE INTO kpis_por_time (time, dia, {', '.join(COLUNAS_KPI)}) "
+            f"SELECT ?, dia, {', '.join(COLUNAS_KPI)} FROM kpis_diarios",
+            (TIME_PADRAO,)
+        )
+        conexao.execute("DROP TABLE IF EXISTS kpis_diarios")
+
+
+def montar_linha(estatisticas: dict, carga: dict) -> dict:
+    """Converte estatísticas e carga do time nas colunas do histórico."""
+    linha = {
+        'total': estatisticas['total'],
+        'concluidos': estatisticas['concluidos'],
+        'em_andamento': estatisticas['em_andamento'],
+        'atrasados': estatisticas['atrasados'],
+        'nao_iniciados': estatisticas['nao_iniciados'],
+        'peso_carga': carga['peso_total'],
+        'media_dias': estatisticas['media_dias'],
+        'eficiencia': estatisticas['eficiencia_media'],
+        'metodo_outros': 0
+    }
+    linha.update({coluna: 0 for coluna in COLUNAS_METODO.values()})
+    for metodo, quantidade in estatisticas['metodos'].items():
+        coluna = COLUNAS_METODO.get(metodo, 'metodo_outros')
+        linha[coluna] += quantidade
+    return linha
+
+
+def registrado(time: str, dia: date) -> bool:
+    """True se o dia já tem foto gravada para o time."""
+    if (time, dia) in _dias_gravados:
+        return True
+    with _lock, _transacao() as conexao:
+        existe = conexao.execute(
+            "SELECT 1 FROM kpis_por_time WHERE time = ? AND dia = ?", (time, dia.isoformat())
+        ).fetchone()
+    if existe:
+        _dias_gravados.add((time, dia))
+    return existe is not None
+
+
+def registrar(time: str, dia: date, linha: dict) -> bool:
+    """
+    Grava a foto do dia do time (ver `montar_linha`). Um dia já gravado não
+    é sobrescrito. Retorna True se a linha foi gravada agora.
+    """
+    with _lock, _transacao() as conexao:
+        cursor = conexao.execute(
+            f"INSERT OR IGNORE INTO kpis_por_time (time, dia, {', '.join(COLUNAS_KPI)}) "
+            f"VALUES (?, ?, {', '.join('?' for _ in COLUNAS_KPI)})",
+            (time, dia.isoformat(), *(linha[c] for c in COLUNAS_KPI))
+        )
+    _dias_gravados.add((time, dia))
+    return cursor.rowcount == 1
+
+
+def ler_intervalo(time: str, inicio: date, fim: date) -> list:
+    """Fotos do time gravadas entre `inicio` e `fim` (inclusive), em ordem de data."""
+    with _transacao() as conexao:
+        linhas = conexao.execute(
+            "SELECT * FROM kpis_por_time WHERE time = ? AND dia BETWEEN ? AND ? ORDER BY dia",
+            (time, inicio.isoformat(), fim.isoformat())
+        ).fetchall()
+    return [dict(l) for l in linhas]
@@ -0,0 +1,175 @@
+"""
+Histórico de alterações dos projetos (SQLite local, só acréscimo).
+
+Toda escrita de projeto (criar, salvar, atualizar, excluir) vira uma
+entrada com quem fez, quando e só os campos que mudaram, no formato
+compacto {campo: [antes, depois]}, ou {campo: [depois]} quando não há
+versão anterior (criação) ou ela não era conhecida. As entradas nunca são
+alteradas nem removidas; só passam para outro ID quando o projeto é
+gravado com um ID diferente do gerado (`renomear`).
+
+As entradas não são gravadas uma a uma: `registrar` só as acumula em
+memória, e uma thread grava o lote numa única transação quando ele chega a
+TAMANHO_LOTE entradas ou a cada INTERVALO_GRAVACAO segundos (e ao encerrar
+o processo). As leituras gravam o lote antes de consultar.
+
+A tabela tem índice por (projeto, seq), então a página do histórico de um
+projeto é uma varredura curta do índice, do mais recente para trás
+(paginação por cursor, sem OFFSET), sem ler o resto do log.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_HISTORICO = os.path.join(RAIZ_PROJETO, 'dados_locais', 'historico_projetos.sqlite3')
+
+TAMANHO_LOTE = 50        # entradas acumuladas que disparam a gravação
+INTERVALO_GRAVACAO = 2   # segundos no máximo entre a escrita e a gravação
+TAMANHO_PAGINA = 10      # entradas por página no detalhe do projeto
+
+_lock = threading.Lock()
+_acordar = threading.Condition(_lock)
+_lote = []              # entradas ainda não gravadas, em ordem
+_renomeados = {}        # ID antigo -> ID novo, para entradas que ainda cheguem com o antigo
+_gravador = None
+
+
+# ============== ARMAZENAMENTO ==============
+
+@contextmanager
+def _transacao():
+    """Conexão com commit ao final (rollback em erro), sempre fechada."""
+    conexao = _conectar()
+    try:
+        with conexao:
+            yield conexao
+    finally:
+        conexao.close()
+
+
+def _conectar() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(ARQUIVO_HISTORICO), exist_ok=True)
+    conexao = sqlite3.connect(ARQUIVO_HISTORICO, timeout=30)
+    conexao.row_factory = sqlite3.Row
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("""
+        CREATE TABLE IF NOT EXISTS alteracoes (
+            seq INTEGER PRIMARY KEY,
+            projeto TEXT NOT NULL,
+            em INTEGER NOT NULL,
+            autor TEXT,
+            operacao TEXT NOT NULL,
+            campos TEXT NOT NULL
+        )
+    """)
+    conexao.execute("CREATE INDEX IF NOT EXISTS alteracoes_projeto ON alteracoes (projeto, seq)")
+    return conexao
+
+
+def _compactar(campos: dict) -> str:
+    return json.dumps(campos, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def gravar_lote() -> int:
+    """Grava as entradas acumuladas numa única transação. Retorna quantas foram gravadas."""
+    global _lote
+    with _lock:
+        lote, _lote = _lote, []
+        if not lote:
+            return 0
+        try:
+            with _transacao() as conexao:
+                conexao.executemany(
+                    "INSERT INTO alteracoes (projeto, em, autor, operacao, campos) VALUES (?, ?, ?, ?, ?)",
+                    lote
+                )
+        except Exception:
+            # Devolve o lote para a próxima tentativa, na ordem original
+            _lote = lote + _lote
+            raise
+    return len(lote)
+
+
+def _gravar_para_sempre() -> None:
+    while True:
+        with _lock:
+            while not _lote:
+                _acordar.wait()
+            if len(_lote) < TAMANHO_LOTE:
+                _acordar.wait(INTERVALO_GRAVACAO)
+        try:
+            gravar_lote()
+        except Exception:
+            time.sleep(INTERVALO_GRAVACAO)
+
+
+def _garantir_gravador() -> None:
+    """Sobe a thread de gravação (uma por processo)."""
+    global _gravador
+    if _gravador is not None and _gravador.is_alive():
+        return
+    _gravador = threading.Thread(target=_gravar_para_sempre, name='historico-projetos', daemon=True)
+    _gravador.start()
+
+
+atexit.register(gravar_lote)
+
+
+# ============== API ==============
+
+def diferencas(antes: dict, depois: dict) -> dict:
+    """
+    {campo: [antes, depois]} dos campos de `depois` que mudaram.
+    Sem `antes` (versão anterior desconhecida), todos entram como [depois].
+    """
+    if antes is None:
+        return {campo: [valor] for campo, valor in depois.items()}
+    return {
+        campo: [antes.get(campo), valor] for campo, valor in depois.items()
+        if valor != antes.get(campo)
+    }
+
+
+def registrar(id_projeto: str, operacao: str, campos: dict, autor: str = None) -> None:
+    """Acrescenta uma entrada ao histórico do projeto (gravada no próximo lote)."""
+    with _lock:
+        id_projeto = _renomeados.get(id_projeto, id_projeto)
+        _lote.append((id_projeto, int(time.time()), autor, operacao, _compactar(campos)))
+        _garantir_gravador()
+        # O primeiro do lote inicia a contagem do intervalo; o lote cheio grava na hora
+        if len(_lote) == 1 or len(_lote) >= TAMANHO_LOTE:
+            _acordar.notify_all()
+
+
+def renomear(antigo: str, novo: str) -> None:
+    """Passa as entradas do projeto `antigo` (gravadas, no lote e as próximas) para o ID `novo`."""
+    with _lock:
+        _renomeados[antigo] = novo
+        _lote[:] = [(novo if e[0] == antigo else e[0],) + e[1:] for e in _lote]
+        with _transacao() as conexao:
+            conexao.execute("UPDATE alteracoes SET projeto = ? WHERE projeto = ?", (novo, antigo))
+
+
+def ler_pagina(id_projeto: str, antes_de: int = None, limite: int = TAMANHO_PAGINA) -> tuple:
+    """
+    Entradas do projeto, da mais recente para a mais antiga, com `seq`
+    menor que `antes_de` (None = do início). Retorna (entradas, cursor da
+    próxima página ou None se esta é a última).
+    """
+    gravar_lote()
+    with _transacao() as conexao:
+        linhas = conexao.execute(
+            "SELECT seq, em, autor, operacao, campos FROM alteracoes "
+            "WHERE projeto = ? AND seq < ? ORDER BY seq DESC LIMIT ?",
+            (id_projeto, antes_de if antes_de is not None else 2 ** 63 - 1, limite + 1)
+        ).fetchall()
+    entradas = [{**dict(l), 'campos': json.loads(l['campos'])} for l in linhas[:limite]]
+    proxima = entradas[-1]['seq'] if len(linhas) > limite else None
+    return entradas, proxima
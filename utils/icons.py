@@ -1,30 +1,94 @@
 import base64
+from functools import lru_cache
+import streamlit as st
+from utils import assets
 
-def get_svg(name: str, color: str = "#64ffda", size: int = 24) -> str:
+
+# Conteúdo interno de cada ícone (viewBox 0 0 24 24, traço em currentColor)
+ICONES = {
+    'clock': '<circle cx="12" cy="12" r="10"></circle><polyline points="12 6 12 12 16 14"></polyline>',
+
+    'check_circle': '<path d="M22 11.08V12a10 10 0 1 1-5.93-9.14"></path><polyline points="22 4 12 14.01 9 11.01"></polyline>',
+
+    'alert_triangle': '<path d="M10.29 3.86L1.82 18a2 2 0 0 0 1.71 3h16.94a2 2 0 0 0 1.71-3L13.71 3.86a2 2 0 0 0-3.42 0z"></path><line x1="12" y1="9" x2="12" y2="13"></line><line x1="12" y1="17" x2="12.01" y2="17"></line>',
+
+    'refresh_cw': '<polyline points="23 4 23 10 17 10"></polyline><polyline points="1 20 1 14 7 14"></polyline><path d="M3.51 9a9 9 0 0 1 14.85-3.36L23 10M1 14l4.64 4.36A9 9 0 0 0 20.49 15"></path>',
+
+    'zap': '<polygon points="13 2 3 14 12 14 11 22 21 10 12 10 13 2"></polygon>',
+
+    'users': '<path d="M17 21v-2a4 4 0 0 0-4-4H5a4 4 0 0 0-4 4v2"></path><circle cx="9" cy="7" r="4"></circle><path d="M23 21v-2a4 4 0 0 0-3-3.87"></path><path d="M16 3.13a4 4 0 0 1 0 7.75"></path>',
+
+    'activity': '<polyline points="22 12 18 12 15 21 9 3 6 12 2 12"></polyline>'
+}
+
+# Paleta do tema: cada ícone ganha uma variante por cor no sprite
+CORES_ICONES = ['#64ffda', '#8892b0', '#ffd93d', '#ff6b6b', '#38bdf8', '#a855f7']
+
+_ATRIBUTOS_TRACO = 'fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"'
+
+
+def _id_variante(name: str, color: str) -> str:
+    """Identificador da variante (ícone + cor) dentro do sprite."""
+    return f"{name}-{color.lstrip('#').lower()}"
+
+
+def gerar_sprite() -> str:
     """
-    Retorna uma tag HTML <img> com o SVG codificado em base64.
-    Isso evita problemas de renderização do Markdown.
+    Gera o sprite SVG com todos os ícones em todas as cores da paleta.
+    Cada variante tem um <view> próprio, então pode ser usada diretamente
+    em <img src="icones.svg#clock-8892b0">.
     """
-    
-    icons = {
-        'clock': f"""<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 24 24" fill="none" stroke="{color}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><circle cx="12" cy="12" r="10"></circle><polyline points="12 6 12 12 16 14"></polyline></svg>""",
-        
-        'check_circle': f"""<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 24 24" fill="none" stroke="{color}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M22 11.08V12a10 10 0 1 1-5.93-9.14"></path><polyline points="22 4 12 14.01 9 11.01"></polyline></svg>""",
-        
-        'alert_triangle': f"""<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 24 24" fill="none" stroke="{color}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M10.29 3.86L1.82 18a2 2 0 0 0 1.71 3h16.94a2 2 0 0 0 1.71-3L13.71 3.86a2 2 0 0 0-3.42 0z"></path><line x1="12" y1="9" x2="12" y2="13"></line><line x1="12" y1="17" x2="12.01" y2="17"></line></svg>""",
-        
-        'refresh_cw': f"""<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 24 24" fill="none" stroke="{color}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><polyline points="23 4 23 10 17 10"></polyline><polyline points="1 20 1 14 7 14"></polyline><path d="M3.51 9a9 9 0 0 1 14.85-3.36L23 10M1 14l4.64 4.36A9 9 0 0 0 20.49 15"></path></svg>""",
-        
-        'zap': f"""<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 24 24" fill="none" stroke="{color}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><polygon points="13 2 3 14 12 14 11 22 21 10 12 10 13 2"></polygon></svg>""",
-        
-        'users': f"""<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 24 24" fill="none" stroke="{color}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M17 21v-2a4 4 0 0 0-4-4H5a4 4 0 0 0-4 4v2"></path><circle cx="9" cy="7" r="4"></circle><path d="M23 21v-2a4 4 0 0 0-3-3.87"></path><path d="M16 3.13a4 4 0 0 1 0 7.75"></path></svg>""",
-        
-        'activity': f"""<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 24 24" fill="none" stroke="{color}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><polyline points="22 12 18 12 15 21 9 3 6 12 2 12"></polyline></svg>"""
-    }
-    
-    svg_str = icons.get(name, "")
-    if not svg_str:
-        return ""
-        
+    simbolos = []
+    variantes = []
+    y = 0
+
+    for name, conteudo in ICONES.items():
+        simbolos.append(f'<symbol id="i-{name}" viewBox="0 0 24 24" {_ATRIBUTOS_TRACO}>{conteudo}</symbol>')
+        for color in CORES_ICONES:
+            variantes.append(f'<view id="{_id_variante(name, color)}" viewBox="0 {y} 24 24"/>')
+            variantes.append(f'<use href="#i-{name}" xlink:href="#i-{name}" x="0" y="{y}" width="24" height="24" style="color: {color}"/>')
+            y += 24
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" viewBox="0 0 24 {y}">'
+        f'<defs>{"".join(simbolos)}</defs>{"".join(variantes)}</svg>'
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def url_sprite() -> str:
+    """Publica o sprite de ícones (uma vez por processo) e retorna sua URL."""
+    return assets.publicar('icones', 'svg', gerar_sprite().encode('utf-8'))
+
+
+@lru_cache(maxsize=None)
+def _svg_embutido(name: str, color: str, size: int) -> str:
+    """Tag <img> com o SVG em base64, para cores fora da paleta."""
+    svg_str = f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 24 24" {_ATRIBUTOS_TRACO.replace("currentColor", color)}>{ICONES[name]}</svg>'
     b64 = base64.b64encode(svg_str.encode('utf-8')).decode('utf-8')
     return f'<img src="data:image/svg+xml;base64,{b64}" style="width: {size}px; height: {size}px; vertical-align: middle;">'
+
+
+def get_svg(name: str, color: str = "#64ffda", size: int = 24) -> str:
+    """
+    Retorna uma tag HTML <img> que referencia o ícone no sprite estático.
+    Isso evita problemas de renderização do Markdown e não reenvia o SVG
+    a cada rerun. Cores fora da paleta usam o SVG embutido em base64.
+    """
+    if name not in ICONES:
+        return ""
+
+    if color.lower() not in CORES_ICONES:
+        return _svg_embutido(name, color, size)
+
+    return f'<img src="{url_sprite()}#{_id_variante(name, color)}" style="width: {size}px; height: {size}px; vertical-align: middle;">'
+
+
+def get_svg_embutido(name: str, color: str = "#64ffda", size: int = 24) -> str:
+    """
+    Como get_svg, mas sempre com o SVG em base64 na própria tag: para HTML
+    aberto fora do app (ex.: o relatório), onde a URL do sprite não existe.
+    """
+    if name not in ICONES:
+        return ""
+    return _svg_embutido(name, color, size)
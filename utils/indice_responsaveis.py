@@ -0,0 +1,79 @@
+"""
+Índice invertido responsável -> projetos.
+
+Cada projeto guarda em `responsaveis` a lista de usuários do time. Para
+saber o que uma pessoa está carregando sem varrer todos os projetos, o
+índice mapeia usuário -> ids dos projetos dele, junto com as linhas dos
+projetos. É montado uma vez por versão dos dados (`construir`) e, nas
+escritas, atualizado só no projeto alterado (`aplicar`).
+
+O índice é compartilhado entre sessões pelo cache e atualizado no lugar,
+sem copiar o resto (uma escrita custa o tamanho do projeto, não o do
+time). Por isso leituras e escritas passam pelo lock do próprio índice:
+fora deste módulo, só `projetos_de` e `pessoas` leem o conteúdo.
+"""
+
+import threading
+
+
+def construir(projetos: list) -> dict:
+    """Monta o índice {'projetos': {id: linha}, 'por_pessoa': {usuario: set(ids)}, 'lock'}."""
+    por_pessoa = {}
+    for projeto in projetos:
+        for usuario in projeto.get('responsaveis') or []:
+            por_pessoa.setdefault(usuario, set()).add(projeto['id'])
+    return {
+        'projetos': {p['id']: p for p in projetos},
+        'por_pessoa': por_pessoa,
+        'lock': threading.Lock()
+    }
+
+
+def linha(indice: dict, id_projeto: str):
+    """Linha do projeto no índice (None se não está nele)."""
+    with indice['lock']:
+        return indice['projetos'].get(id_projeto)
+
+
+def aplicar(indice: dict, id_projeto: str, linha) -> dict:
+    """
+    Substitui no lugar o projeto por `linha` (None = removido) e retorna o
+    mesmo índice. Só as pessoas que entraram ou saíram do projeto mudam.
+    """
+    with indice['lock']:
+        projetos, por_pessoa = indice['projetos'], indice['por_pessoa']
+        anterior = projetos.get(id_projeto)
+        if linha is anterior:
+            return indice
+
+        antes = set((anterior or {}).get('responsaveis') or [])
+        depois = set((linha or {}).get('responsaveis') or [])
+
+        if linha is None:
+            projetos.pop(id_projeto, None)
+        else:
+            projetos[id_projeto] = linha
+
+        for usuario in antes - depois:
+            ids = por_pessoa.get(usuario)
+            if ids is not None:
+                ids.discard(id_projeto)
+                if not ids:
+                    del por_pessoa[usuario]
+        for usuario in depois - antes:
+            por_pessoa.setdefault(usuario, set()).add(id_projeto)
+
+    return indice
+
+
+def projetos_de(indice: dict, usuario: str) -> list:
+    """Linhas dos projetos em que o usuário é responsável."""
+    with indice['lock']:
+        linhas = indice['projetos']
+        return [linhas[i] for i in indice['por_pessoa'].get(usuario, ())]
+
+
+def pessoas(indice: dict) -> list:
+    """Usuários com algum projeto no índice."""
+    with indice['lock']:
+        return list(indice['por_pessoa'])
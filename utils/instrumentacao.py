@@ -0,0 +1,283 @@
+"""
+Instrumentação das consultas ao backend.
+
+Cada rerun do app abre um coletor (`iniciar_rerun`) guardado numa
+ContextVar; as consultas feitas durante o rerun registram tabela, colunas,
+linhas retornadas e bytes do payload. As cargas do cache e o event loop
+da camada assíncrona recebem uma cópia do contexto, então as consultas
+disparadas por eles também entram na conta do rerun que as originou.
+
+Cada consulta também guarda a função do data_manager que a fez e o
+chamador de fora da camada de dados (a página ou seção), o que permite
+agrupar as idas ao backend por origem e impor orçamentos com `orcamento()`.
+
+As gravações entram à parte (`registrar_escrita`), no momento em que são
+feitas: só os campos alterados vão ao backend, então o coletor guarda
+quantos campos e bytes cada gravação enviou e quantas foram descartadas por
+não mudar nada.
+
+Com o perfil ligado (painel de desempenho dos administradores), o coletor
+também guarda spans: trechos medidos com `span()` ou funções decoradas com
+`medir()`. Cada span soma as consultas feitas enquanto estava aberto,
+inclusive as disparadas em outras threads a partir dele.
+
+Fragmentos com run_every continuam somando no coletor do último rerun
+completo, então spans, consultas e gravações guardam cada um no máximo
+MAX_REGISTROS_POR_RERUN registros; os seguintes são ignorados (os
+orçamentos abertos continuam recebendo todas as consultas).
+"""
+
+import contextvars
+import functools
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+
+MAX_REGISTROS_POR_RERUN = 500  # por lista do coletor (spans, consultas, escritas)
+
+_rerun_atual = contextvars.ContextVar('rerun_atual', default=None)
+_spans_abertos = contextvars.ContextVar('spans_abertos', default=())
+_origem = contextvars.ContextVar('origem', default=None)  # (chamador, função do data_manager)
+_orcamentos_abertos = contextvars.ContextVar('orcamentos_abertos', default=())  # listas de consultas
+
+
+class OrcamentoExcedido(AssertionError):
+    """Um trecho fez mais idas ao backend do que o orçamento permite."""
+
+
+def iniciar_rerun(perfil: bool = False) -> dict:
+    """Abre um novo coletor para o rerun atual e o retorna."""
+    coletor = {
+        'inicio': time.time(),
+        'inicio_perf': time.perf_counter(),
+        'consultas': [],
+        'escritas': [],
+        'perfil': perfil,
+        'spans': []
+    }
+    _rerun_atual.set(coletor)
+    _spans_abertos.set(())
+    _origem.set(None)
+    return coletor
+
+
+def rerun_atual():
+    """Retorna o coletor do rerun atual ou None se não houver."""
+    return _rerun_atual.get()
+
+
+def ativo() -> bool:
+    """Indica se há um coletor aberto (evita medir quando ninguém vai ler)."""
+    return _rerun_atual.get() is not None
+
+
+def tamanho_payload(dados) -> int:
+    """Tamanho aproximado em bytes do JSON trafegado."""
+    if dados is None:
+        return 0
+    return len(json.dumps(dados, default=str, ensure_ascii=False).encode('utf-8'))
+
+
+def registrar_consulta(tabela: str, operacao: str, colunas: str, dados, duracao: float) -> None:
+    """Registra uma consulta no coletor do rerun atual (se houver)."""
+    coletor = _rerun_atual.get()
+    if coletor is None:
+        return
+
+    origem = _origem.get()
+    consulta = {
+        'tabela': tabela,
+        'operacao': operacao,
+        'colunas': colunas,
+        'linhas': len(dados) if isinstance(dados, list) else 0,
+        'bytes': tamanho_payload(dados),
+        'duracao': duracao,
+        'chamador': origem[0] if origem else '?',
+        'funcao': origem[1] if origem else '?'
+    }
+    if len(coletor['consultas']) < MAX_REGISTROS_POR_RERUN:
+        coletor['consultas'].append(consulta)
+    for consultas in _orcamentos_abertos.get():
+        consultas.append(consulta)
+
+    for aberto in _spans_abertos.get():
+        aberto['consultas'] += 1
+        aberto['linhas'] += consulta['linhas']
+        aberto['bytes'] += consulta['bytes']
+
+
+def registrar_escrita(tabela: str, operacao: str, dados: dict) -> None:
+    """
+    Registra uma gravação no coletor do rerun atual (se houver): campos e
+    bytes do payload enviado. Sem campos, a gravação foi ignorada (nada mudou).
+    """
+    coletor = _rerun_atual.get()
+    if coletor is None:
+        return
+
+    escritas = coletor.setdefault('escritas', [])
+    if len(escritas) >= MAX_REGISTROS_POR_RERUN:
+        return
+
+    origem = _origem.get()
+    escritas.append({
+        'tabela': tabela,
+        'operacao': operacao,
+        'campos': len(dados),
+        'bytes': tamanho_payload(dados) if dados else 0,
+        'ignorada': not dados,
+        'chamador': origem[0] if origem else '?'
+    })
+
+
+# ============== SPANS ==============
+
+def perfil_ativo() -> bool:
+    """Indica se o rerun atual está coletando spans."""
+    coletor = _rerun_atual.get()
+    return bool(coletor and coletor['perfil'])
+
+
+@contextmanager
+def span(nome: str, categoria: str = 'secao'):
+    """
+    Mede o trecho dentro do `with` como um span do rerun atual.
+    Entrega o dicionário do span (ou None com o perfil desligado).
+    """
+    coletor = _rerun_atual.get()
+    if not coletor or not coletor['perfil'] or len(coletor['spans']) >= MAX_REGISTROS_POR_RERUN:
+        yield None
+        return
+
+    abertos = _spans_abertos.get()
+    registro = {
+        'id': len(coletor['spans']),
+        'pai': abertos[-1]['id'] if abertos else None,
+        'nivel': len(abertos),
+        'nome': nome,
+        'categoria': categoria,
+        'inicio': time.perf_counter() - coletor['inicio_perf'],
+        'duracao': 0.0,
+        'consultas': 0,
+        'linhas': 0,
+        'bytes': 0,
+        'retornadas': None
+    }
+    coletor['spans'].append(registro)
+    token = _spans_abertos.set(abertos + (registro,))
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro['duracao'] = time.perf_counter() - inicio
+        _spans_abertos.reset(token)
+
+
+def medir(categoria: str):
+    """
+    Decorador das funções da camada de dados e dos gráficos. Marca a origem
+    das consultas feitas dentro da chamada e, com o perfil ligado, mede a
+    chamada como um span: um primeiro argumento string (perfil, ID) entra no
+    nome e listas retornadas têm o tamanho anotado, o que mostra as linhas
+    servidas pelo cache.
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            coletor = _rerun_atual.get()
+            if coletor is None:
+                return funcao(*args, **kwargs)
+
+            # O chamador é fixado na primeira entrada na camada de dados;
+            # a função registrada é sempre a mais interna
+            atual = _origem.get()
+            if atual is None:
+                quadro = sys._getframe(1)
+                chamador = f"{quadro.f_globals.get('__name__', '?')}.{quadro.f_code.co_name}"
+            else:
+                chamador = atual[0]
+            token = _origem.set((chamador, funcao.__name__))
+            try:
+                if not coletor['perfil']:
+                    return funcao(*args, **kwargs)
+                return _medir_span(funcao, args, kwargs, categoria)
+            finally:
+                _origem.reset(token)
+        return medida
+    return decorador
+
+
+def _medir_span(funcao, args, kwargs, categoria: str):
+    """Executa a função decorada dentro de um span."""
+    nome = funcao.__name__
+    if args and isinstance(args[0], str):
+        nome = f"{nome}({args[0]!r})"
+
+    with span(nome, categoria) as registro:
+        resultado = funcao(*args, **kwargs)
+        if registro is not None and isinstance(resultado, list):
+            registro['retornadas'] = len(resultado)
+        return resultado
+
+
+def resumo_rerun(coletor: dict = None) -> dict:
+    """Totaliza consultas, linhas e bytes de um coletor, e as gravações feitas nele."""
+    coletor = coletor or _rerun_atual.get()
+    if not coletor:
+        return {'consultas': 0, 'linhas': 0, 'bytes': 0, 'escritas': 0, 'escritas_ignoradas': 0, 'bytes_enviados': 0}
+
+    consultas = coletor['consultas']
+    escritas = coletor.get('escritas', [])
+    return {
+        'consultas': len(consultas),
+        'linhas': sum(c['linhas'] for c in consultas),
+        'bytes': sum(c['bytes'] for c in consultas),
+        'escritas': sum(1 for e in escritas if not e['ignorada']),
+        'escritas_ignoradas': sum(1 for e in escritas if e['ignorada']),
+        'bytes_enviados': sum(e['bytes'] for e in escritas)
+    }
+
+
+# ============== IDAS AO BACKEND ==============
+
+def consultas_por_chamador(consultas: list) -> dict:
+    """Agrupa consultas por chamador e função: {(chamador, funcao): {consultas, linhas, bytes}}."""
+    grupos = {}
+    for c in consultas:
+        grupo = grupos.setdefault((c['chamador'], c['funcao']), {'consultas': 0, 'linhas': 0, 'bytes': 0})
+        grupo['consultas'] += 1
+        grupo['linhas'] += c['linhas']
+        grupo['bytes'] += c['bytes']
+    return grupos
+
+
+@contextmanager
+def orcamento(maximo: int, nome: str = 'trecho'):
+    """
+    Falha com OrcamentoExcedido se o trecho dentro do `with` fizer mais
+    de `maximo` idas ao backend. Sem rerun aberto (ex.: em testes), abre
+    um coletor só para o trecho. Entrega a lista de consultas do trecho.
+    """
+    coletor = _rerun_atual.get()
+    token = None
+    if coletor is None:
+        coletor = {'inicio': time.time(), 'inicio_perf': time.perf_counter(), 'consultas': [], 'perfil': False, 'spans': []}
+        token = _rerun_atual.set(coletor)
+
+    consultas = []
+    token_orcamento = _orcamentos_abertos.set(_orcamentos_abertos.get() + (consultas,))
+    try:
+        yield consultas
+    finally:
+        _orcamentos_abertos.reset(token_orcamento)
+        if token is not None:
+            _rerun_atual.reset(token)
+
+    if len(consultas) > maximo:
+        detalhes = '; '.join(
+            f"{chamador} -> {funcao}: {g['consultas']}"
+            for (chamador, funcao), g in consultas_por_chamador(consultas).items()
+        )
+        raise OrcamentoExcedido(f"{nome} fez {len(consultas)} consultas (orçamento: {maximo}). {detalhes}")
@@ -0,0 +1,247 @@
+"""
+Métricas operacionais do processo, no formato texto do Prometheus.
+
+Diferente de utils/instrumentacao.py (que mede um rerun para o painel de
+desempenho), aqui os números são acumulados desde o início do processo e
+valem para todas as sessões:
+
+- migratepro_render_segundos: tempo para desenhar cada página (histograma);
+- migratepro_backend_segundos: latência das consultas ao backend, por
+  tabela e operação (histograma);
+- migratepro_backend_erros_total: consultas que falharam, por tipo
+  (backend, cliente, prazo, disjuntor);
+- migratepro_cache_total: leituras do cache por resultado (acerto,
+  obsoleto, espera, ultimo_bom, falha) e por tipo de chave;
+- migratepro_erros_tratados_total: exceções capturadas e mostradas ao
+  usuário pela camada de dados, por função;
+- migratepro_disjuntor_aberto: 1 com o disjuntor do backend aberto.
+
+`iniciar()` sobe, uma vez por processo, um servidor HTTP numa thread
+que responde GET /metrics, e opcionalmente grava um retrato das métricas
+a cada `intervalo_arquivo` segundos num arquivo com rotação por tamanho.
+Configuração em `st.secrets["metricas"]` (porta 0 desliga o servidor;
+sem `arquivo`, nada é gravado):
+
+    [metricas]
+    endereco = "127.0.0.1"
+    porta = 9464
+    arquivo = "dados_locais/metricas.prom"
+    intervalo_arquivo = 60
+    tamanho_maximo_arquivo = 5_000_000
+    arquivos_mantidos = 3
+"""
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+import streamlit as st
+
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIG_PADRAO = {
+    'endereco': '127.0.0.1',
+    'porta': 9464,
+    'arquivo': None,
+    'intervalo_arquivo': 60,            # segundos entre retratos no arquivo
+    'tamanho_maximo_arquivo': 5_000_000,  # bytes antes de rodar o arquivo
+    'arquivos_mantidos': 3
+}
+
+# Limites dos histogramas, em segundos
+LIMITES_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Nome -> (tipo, descrição)
+METRICAS = {
+    'migratepro_render_segundos': ('histogram', 'Tempo para desenhar cada página'),
+    'migratepro_backend_segundos': ('histogram', 'Latência das consultas ao backend'),
+    'migratepro_backend_erros_total': ('counter', 'Consultas ao backend que falharam'),
+    'migratepro_cache_total': ('counter', 'Leituras do cache por resultado'),
+    'migratepro_erros_tratados_total': ('counter', 'Exceções capturadas e mostradas ao usuário pela camada de dados'),
+    'migratepro_disjuntor_aberto': ('gauge', 'Disjuntor do backend aberto (1) ou fechado (0)')
+}
+
+_lock = threading.Lock()
+_series = {}       # nome -> {rótulos (tupla ordenada): valor, ou {'baldes', 'soma', 'contagem'} nos histogramas}
+_medidores = {}    # nome -> função que devolve o valor atual (gauges)
+_iniciado = False
+
+
+# ============== REGISTRO ==============
+
+def _rotulos(rotulos: dict) -> tuple:
+    return tuple(sorted((chave, str(valor)) for chave, valor in rotulos.items()))
+
+
+def contar(nome: str, valor: float = 1, **rotulos) -> None:
+    """Soma `valor` ao contador `nome` com os rótulos dados."""
+    chave = _rotulos(rotulos)
+    with _lock:
+        series = _series.setdefault(nome, {})
+        series[chave] = series.get(chave, 0) + valor
+
+
+def observar(nome: str, valor: float, **rotulos) -> None:
+    """Registra uma observação (em segundos) no histograma `nome`."""
+    chave = _rotulos(rotulos)
+    with _lock:
+        series = _series.setdefault(nome, {})
+        serie = series.get(chave)
+        if serie is None:
+            serie = series[chave] = {'baldes': [0] * (len(LIMITES_SEGUNDOS) + 1), 'soma': 0.0, 'contagem': 0}
+        serie['baldes'][bisect_left(LIMITES_SEGUNDOS, valor)] += 1
+        serie['soma'] += valor
+        serie['contagem'] += 1
+
+
+@contextmanager
+def cronometro(nome: str, **rotulos):
+    """Mede o trecho dentro do `with` no histograma `nome` (inclusive se levantar exceção)."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        observar(nome, time.perf_counter() - inicio, **rotulos)
+
+
+def registrar_erro(funcao: str, erro: Exception) -> None:
+    """Conta uma exceção tratada, com a função que a capturou (`funcao`) como rótulo."""
+    contar('migratepro_erros_tratados_total', funcao=funcao, tipo=type(erro).__name__)
+
+
+def medidor(nome: str, funcao) -> None:
+    """Registra um gauge: `funcao()` é chamada a cada coleta e devolve o valor atual."""
+    with _lock:
+        _medidores[nome] = funcao
+
+
+# ============== FORMATO PROMETHEUS ==============
+
+def _escapar(valor: str) -> str:
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _formatar_rotulos(rotulos: tuple) -> str:
+    if not rotulos:
+        return ''
+    return '{' + ','.join(f'{chave}="{_escapar(valor)}"' for chave, valor in rotulos) + '}'
+
+
+def _formatar_numero(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+def texto_prometheus() -> str:
+    """Todas as métricas no formato de exposição texto do Prometheus (versão 0.0.4)."""
+    with _lock:
+        series = {nome: dict(valores) for nome, valores in _series.items()}
+        for nome, serie in series.items():
+            if METRICAS.get(nome, ('counter',))[0] == 'histogram':
+                series[nome] = {r: {**s, 'baldes': list(s['baldes'])} for r, s in serie.items()}
+        medidores = dict(_medidores)
+
+    for nome, funcao in medidores.items():
+        try:
+            series[nome] = {(): float(funcao())}
+        except Exception:
+            continue
+
+    linhas = []
+    for nome in sorted(series):
+        tipo, ajuda = METRICAS.get(nome, ('untyped', ''))
+        linhas.append(f"# HELP {nome} {ajuda}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+        for rotulos, valor in sorted(series[nome].items()):
+            if tipo != 'histogram':
+                linhas.append(f"{nome}{_formatar_rotulos(rotulos)} {_formatar_numero(valor)}")
+                continue
+            acumulado = 0
+            for limite, quantidade in zip(LIMITES_SEGUNDOS + ('+Inf',), valor['baldes']):
+                acumulado += quantidade
+                linhas.append(f"{nome}_bucket{_formatar_rotulos(rotulos + (('le', str(limite)),))} {acumulado}")
+            linhas.append(f"{nome}_sum{_formatar_rotulos(rotulos)} {_formatar_numero(valor['soma'])}")
+            linhas.append(f"{nome}_count{_formatar_rotulos(rotulos)} {valor['contagem']}")
+    return '\n'.join(linhas) + '\n'
+
+
+# ============== EXPORTAÇÃO ==============
+
+class _TratadorMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        corpo = texto_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def configuracao() -> dict:
+    """Configuração do exportador: CONFIG_PADRAO sobreposto por `st.secrets["metricas"]`."""
+    try:
+        return {**CONFIG_PADRAO, **dict(st.secrets["metricas"])}
+    except Exception:
+        return dict(CONFIG_PADRAO)
+
+
+def _iniciar_servidor(endereco: str, porta: int):
+    servidor = ThreadingHTTPServer((endereco, porta), _TratadorMetricas)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name='metricas-http', daemon=True).start()
+    return servidor
+
+
+def _gravar_periodicamente(caminho: str, intervalo: float, tamanho_maximo: int, mantidos: int) -> None:
+    if not os.path.isabs(caminho):
+        caminho = os.path.join(RAIZ_PROJETO, caminho)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+    registro = logging.getLogger('migratepro.metricas')
+    registro.propagate = False
+    registro.setLevel(logging.INFO)
+    manipulador = RotatingFileHandler(caminho, maxBytes=tamanho_maximo, backupCount=mantidos, encoding='utf-8')
+    manipulador.setFormatter(logging.Formatter('%(message)s'))
+    registro.addHandler(manipulador)
+
+    while True:
+        time.sleep(intervalo)
+        registro.info(f"# coleta {datetime.now().isoformat(timespec='seconds')}\n{texto_prometheus()}")
+
+
+def iniciar() -> None:
+    """
+    Sobe o servidor HTTP e a gravação em arquivo (uma vez por processo).
+    Uma porta ocupada não impede o app de rodar: o servidor só não sobe.
+    """
+    global _iniciado
+    with _lock:
+        if _iniciado:
+            return
+        _iniciado = True
+
+    config = configuracao()
+    if config['porta']:
+        try:
+            _iniciar_servidor(config['endereco'], int(config['porta']))
+        except OSError as e:
+            logging.getLogger(__name__).warning(f"Servidor de métricas não iniciado na porta {config['porta']}: {e}")
+
+    if config['arquivo']:
+        threading.Thread(
+            target=_gravar_periodicamente,
+            args=(config['arquivo'], config['intervalo_arquivo'], config['tamanho_maximo_arquivo'], config['arquivos_mantidos']),
+            name='metricas-arquivo',
+            daemon=True
+        ).start()
@@ -0,0 +1,109 @@
+"""
+Alterações pendentes de projetos, por sessão.
+
+Os dois formulários do detalhe de um projeto (informações e notas) não
+gravam direto: registram os campos alterados num buffer do projeto. O
+buffer é gravado de uma vez, como uma única atualização parcial, quando o
+usuário pede ("Salvar agora") ou quando passa DEBOUNCE_ESCRITA segundos
+sem novas alterações. O debounce vencido é conferido a cada rerun do app
+(e pelo indicador da fila na sidebar), não só com o detalhe aberto; trocar
+de página ou sair grava tudo o que estiver pendente.
+
+Os formulários enviam todos os campos; só ficam no buffer os que diferem
+da versão carregada do projeto. Um campo que volta ao valor original sai
+do buffer, e um salvar sem mudanças não deixa nada para gravar. O buffer
+guarda também a versão carregada, de onde saem os valores anteriores
+registrados no histórico de alterações, e uma chave de idempotência
+renovada a cada alteração: gravar duas vezes o mesmo buffer (o debounce e
+o botão, por exemplo) entra uma vez só na fila de escritas.
+"""
+
+import time
+import uuid
+import streamlit as st
+
+
+DEBOUNCE_ESCRITA = 5  # segundos sem novas alterações antes de gravar
+CHAVE_SESSAO = '_pendencias'
+
+
+def _buffers() -> dict:
+    return st.session_state.setdefault(CHAVE_SESSAO, {})
+
+
+def registrar(id_projeto: str, dados: dict, atual: dict) -> bool:
+    """
+    Junta às alterações pendentes do projeto os campos de `dados` que
+    diferem de `atual` (a versão carregada) e reinicia o debounce.
+    Retorna True se ficou algo pendente.
+    """
+    from utils.data_manager import calcular_alteracoes
+
+    buffer = _buffers().setdefault(id_projeto, {'dados': {}, 'antes': {}, 'alterado_em': 0.0})
+    alteracoes = calcular_alteracoes(atual, dados)
+    for campo in dados:
+        if campo in alteracoes:
+            buffer['dados'][campo] = alteracoes[campo]
+        else:
+            buffer['dados'].pop(campo, None)
+    # Versão carregada; a primeira vista de cada campo prevalece
+    buffer['antes'] = {**atual, **buffer['antes']}
+
+    if not buffer['dados']:
+        descartar(id_projeto)
+        return False
+    buffer['alterado_em'] = time.monotonic()
+    buffer['chave'] = uuid.uuid4().hex
+    return True
+
+
+def pendentes(id_projeto: str) -> dict:
+    """Campos ainda não gravados do projeto (vazio se não houver)."""
+    buffer = _buffers().get(id_projeto)
+    return dict(buffer['dados']) if buffer else {}
+
+
+def segundos_para_gravar(id_projeto: str) -> float:
+    """Quanto falta para o debounce vencer (0 se já venceu ou não há pendências)."""
+    buffer = _buffers().get(id_projeto)
+    if not buffer:
+        return 0.0
+    return max(0.0, DEBOUNCE_ESCRITA - (time.monotonic() - buffer['alterado_em']))
+
+
+def descartar(id_projeto: str) -> None:
+    """Esquece as alterações pendentes do projeto."""
+    _buffers().pop(id_projeto, None)
+
+
+def gravar_todos(vencidos: bool = False) -> list:
+    """
+    Grava os buffers da sessão (só os de debounce vencido, com `vencidos`).
+    Retorna os projetos gravados.
+    """
+    gravados = []
+    for id_projeto in list(_buffers()):
+        if vencidos and segundos_para_gravar(id_projeto) > 0:
+            continue
+        if gravar(id_projeto) is not None:
+            gravados.append(id_projeto)
+    return gravados
+
+
+def gravar(id_projeto: str):
+    """
+    Grava as alterações pendentes numa única atualização parcial.
+    Retorna os campos gravados, ou None se não havia nada ou a gravação falhou
+    (nesse caso o buffer é mantido para uma nova tentativa).
+    """
+    from utils.data_manager import atualizar_projeto
+
+    dados = pendentes(id_projeto)
+    if not dados:
+        return None
+
+    buffer = _buffers()[id_projeto]
+    gravado = atualizar_projeto(id_projeto, dados, atual=dict(buffer['antes']), chave=buffer['chave'])
+    if gravado is not None:
+        descartar(id_projeto)
+    return gravado
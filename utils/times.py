@@ -0,0 +1,68 @@
+"""
+Times de migração: cada projeto pertence a um time (coluna `time`).
+
+Cada time só enxerga os próprios projetos. As leituras filtram pela coluna
+no banco e o cache guarda os dados de cada time num escopo próprio
+(`escopo_projetos`), então uma escrita num time não invalida nem recarrega
+o dashboard dos outros. O modelo de capacidade também é por time: tamanho
+e pessoas por projeto vêm de `st.secrets["times"]`, e times sem
+configuração usam CONFIG_PADRAO:
+
+    [times."Time Norte"]
+    tamanho = 6
+    pessoas_por_projeto = 2
+
+No banco, a coluna e os índices usados pelas leituras:
+
+    ALTER TABLE projetos ADD COLUMN time TEXT NOT NULL DEFAULT 'Principal';
+    CREATE INDEX projetos_time_created_at ON projetos (time, created_at DESC);
+    CREATE INDEX projetos_time_id ON projetos (time, id);
+    ALTER TABLE usuarios ADD COLUMN time TEXT;
+
+O usuário trabalha no time da sua linha em `usuarios` (TIME_PADRAO se
+vazio); administradores podem trocar de time na barra lateral.
+"""
+
+import streamlit as st
+
+
+TIME_PADRAO = 'Principal'
+CONFIG_PADRAO = {'tamanho': 4, 'pessoas_por_projeto': 2}
+CHAVE_SESSAO = 'time'
+
+
+def _configurados() -> dict:
+    try:
+        return {nome: dict(config) for nome, config in st.secrets["times"].items()}
+    except Exception:
+        return {}
+
+
+def configuracao(time: str) -> dict:
+    """Tamanho do time e pessoas por projeto."""
+    return {**CONFIG_PADRAO, **_configurados().get(time, {})}
+
+
+def listar_times() -> list:
+    """Times conhecidos: os configurados e o padrão, em ordem alfabética."""
+    return sorted(set(_configurados()) | {TIME_PADRAO})
+
+
+def escopo_projetos(time: str) -> str:
+    """Escopo do cache com os projetos (e derivados) de um time."""
+    return f"projetos:{time}"
+
+
+def time_da_linha(linha: dict) -> str:
+    """Time de um projeto ou usuário (TIME_PADRAO se não informado)."""
+    return (linha or {}).get('time') or TIME_PADRAO
+
+
+def time_atual() -> str:
+    """Time da sessão: o escolhido na barra lateral ou o do usuário logado."""
+    return st.session_state.get(CHAVE_SESSAO) or time_da_linha(st.session_state.get('usuario'))
+
+
+def selecionar_time(time: str) -> None:
+    """Troca o time da sessão."""
+    st.session_state[CHAVE_SESSAO] = time